@@ -1,8 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+import asyncio
 import os
 import logging
-from typing import Dict, Any
+import time
+from typing import Dict, Any, List, Optional
+
+from serving import AgentExecutor, ExecutorSaturated
+from serving.cache import ResponseCache, keyword_intent, normalize_message
+from serving.singleflight import SingleFlight
+from serving.batch import BATCH_CONCURRENCY, BATCH_MAX_SIZE, fan_out, ndjson_results, retrying
+from serving.loader import AgentLoader
+from serving.ratelimit import RateLimited, TokenBucketLimiter
+from serving.metrics import CONTENT_TYPE, MetricsMiddleware, ServerMetrics
+from serving.streaming import SSE_HEADERS, ClosingStreamingResponse, sse_stream
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,64 +25,319 @@ app = FastAPI(title="FinSight AI Agent", version="1.0.0")
 class ChatRequest(BaseModel):
     message: str
     user_id: str = "default"
+    # Set to False for personalized answers that must never be served from
+    # or stored in the shared response cache
+    cache: bool = True
 
 class ChatResponse(BaseModel):
     response: str
     status: str = "success"
 
-# Load agent
-try:
-    # Try loading agents in order of preference
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest]
+    concurrency: Optional[int] = None
+
+# Load agent: tries the full delegator, then the simple agent, then the
+# rule-based fallback. AGENT_LOAD_MODE=lazy defers the heavy google.adk and
+# sub-agent imports to the first request, background loads them on a thread
+# after the server has bound; the loaded agent is cached for the process.
+agent_loader = AgentLoader()
+if agent_loader.mode == "eager":
+    agent_loader.load()
+
+# Blocking agent calls run on a bounded pool so one slow request does not
+# stall the event loop for every other connection. Per-user token buckets
+# stop one tenant from flooding it, and the pool's fair queue weights
+# waiting requests by each user's quota.
+executor = AgentExecutor.from_env()
+rate_limiter = TokenBucketLimiter.from_env()
+
+def _run_agent(message: str) -> str:
+    """Run the loaded agent synchronously (executed on the worker pool)"""
+    return str(agent_loader.load().agent.run(message))
+
+async def _loaded() -> AgentLoader:
+    """The loaded agent, importing it off the event loop on first use"""
+    if not agent_loader.loaded:
+        await asyncio.to_thread(agent_loader.load)
+    if not agent_loader.agent:
+        raise HTTPException(status_code=500, detail="Agent not loaded")
+    return agent_loader
+
+# Repeated questions are answered from cache instead of re-running the agent,
+# and identical questions arriving together share one agent run
+response_cache = ResponseCache.from_env()
+inflight = SingleFlight()
+AGENT_VERSION = os.getenv("AGENT_VERSION", app.version)
+
+# Prometheus metrics, labeled by route, loaded agent (delegator, simple,
+# fallback), detected intent and the sub-agent the delegator called
+metrics = ServerMetrics()
+app.add_middleware(
+    MetricsMiddleware, metrics=metrics, agent_label=lambda: agent_loader.kind or "none"
+)
+
+def _component_gauges():
+    executor_stats = executor.snapshot()
+    cache_stats = response_cache.snapshot()
+    coalescing = inflight.snapshot()
+    rate_limit = rate_limiter.snapshot()
+    gauges = [
+        ("finsight_executor_queue_depth", "Requests waiting for an agent worker.", executor_stats["queue_depth"]),
+        ("finsight_executor_running", "Agent calls currently on a worker.", executor_stats["running"]),
+        ("finsight_executor_rejected", "Requests rejected with 429 since start.", executor_stats["rejected"]),
+        ("finsight_executor_wait_seconds_p95", "95th percentile executor queue wait.", executor_stats["wait_seconds"]["p95"]),
+        ("finsight_cache_entries", "Responses held in the response cache.", cache_stats["entries"]),
+        ("finsight_cache_hits", "Response cache hits since start.", cache_stats["hits"]),
+        ("finsight_cache_misses", "Response cache misses since start.", cache_stats["misses"]),
+        ("finsight_coalesced_requests", "Requests served by another request's in-flight run.", coalescing["coalesced"]),
+        ("finsight_rate_limited_requests", "Requests rejected by per-user rate limits.", rate_limit["limited"]),
+        ("finsight_rate_limit_tracked_users", "Users with token-bucket state in memory.", rate_limit["tracked_users"]),
+    ]
+    runner = agent_loader.runner
+    if runner:
+        session_stats = runner.sessions.snapshot()
+        gauges += [
+            ("finsight_sessions", "Pooled ADK sessions.", session_stats["sessions"]),
+            ("finsight_session_bytes", "Estimated bytes held by pooled sessions.", session_stats["bytes"]),
+        ]
+    canned = agent_loader.canned
+    if canned:
+        canned_stats = canned.snapshot()
+        gauges += [
+            ("finsight_canned_served", "Canned answers served pre-encoded.", canned_stats["served"]),
+            ("finsight_canned_not_modified", "Canned answers revalidated with 304.", canned_stats["not_modified"]),
+        ]
+    return gauges
+
+metrics.registry.add_collector(_component_gauges)
+
+async def _run(message: str, user_id: str) -> str:
+    """Answer one message under the executor's admission control"""
+    runner = agent_loader.runner
+    agent = agent_loader.kind
+    intent = keyword_intent(normalize_message(message))
+    tool_calls = []
+    started = time.perf_counter()
+    in_flight = metrics.agent_in_flight.labels(agent=agent)
+    in_flight.inc()
+    outcome = "error"
     try:
-        from delegator.agent import root_agent
-        logger.info(f"Full agent {root_agent.name} loaded successfully")
-    except Exception as e:
-        logger.warning(f"Full agent failed, trying simple agent: {e}")
-        try:
-            from delegator.simple_agent import root_agent
-            logger.info(f"Simple agent {root_agent.name} loaded successfully")
-        except Exception as e2:
-            logger.warning(f"Simple agent failed, using fallback: {e2}")
-            from delegator.fallback_agent import root_agent
-            logger.info(f"Fallback agent {root_agent.name} loaded successfully")
-except Exception as e:
-    logger.error(f"Failed to load any agent: {e}")
-    root_agent = None
+        fairness = {"key": user_id, "weight": rate_limiter.weight(user_id)}
+        if runner:
+            response = await executor.submit_async(runner.run, message, user_id, tool_calls, **fairness)
+        else:
+            response = await executor.submit(_run_agent, message, **fairness)
+        outcome = "ok"
+        return response
+    except ExecutorSaturated:
+        outcome = "rejected"
+        raise
+    finally:
+        in_flight.dec()
+        sub_agent = tool_calls[0] if tool_calls else "none"
+        metrics.observe_agent_run(agent, intent, sub_agent, time.perf_counter() - started, outcome)
+
+async def _answer(message: str, user_id: str, use_cache: bool = True) -> str:
+    """Answer one message, going through the response cache when allowed"""
+    # A user with live session history gets context-dependent answers, so
+    # only context-free turns may share the cache or an in-flight run
+    runner = agent_loader.runner
+    shareable = use_cache and not (runner and runner.sessions.has_session(user_id))
+    if not shareable:
+        return await _run(message, user_id)
+
+    key = response_cache.key(message, agent_loader.name, AGENT_VERSION)
+    if response_cache.enabled:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+
+    async def run_and_store():
+        response = await _run(message, user_id)
+        response_cache.put(key, response)
+        return response
+
+    return await inflight.do(key, run_and_store)
+
+def _busy(e: ExecutorSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Server busy, please retry later",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+def _check_rate_limit(user_id: str):
+    try:
+        rate_limiter.check(user_id)
+    except RateLimited as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded, please retry later",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+@app.on_event("startup")
+def start_agent_loader():
+    if agent_loader.mode == "background":
+        agent_loader.start_background()
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    executor.shutdown(wait=False)
 
 @app.get("/")
 def health_check():
+    # Never triggers a load, so probes stay cheap during a lazy cold start
+    if agent_loader.agent:
+        agent = agent_loader.name
+    else:
+        agent = "not loaded" if agent_loader.loaded else "not loaded yet"
     return {
         "status": "healthy",
-        "agent": root_agent.name if root_agent else "not loaded",
+        "agent": agent,
         "message": "FinSight AI Agent is running"
     }
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    if not root_agent:
-        raise HTTPException(status_code=500, detail="Agent not loaded")
+async def chat(request: ChatRequest, http_request: Request):
+    loader = await _loaded()
+    _check_rate_limit(request.user_id)
+
+    canned_key = loader.canned and loader.agent.canned_key(request.message)
+    if canned_key:
+        # Static answers were pre-encoded at load time; no agent run, no JSON encoding
+        return loader.canned.respond(canned_key, http_request.headers)
     
     try:
-        # Process the message through the agent
-        response = root_agent.run(request.message)
-        return ChatResponse(response=str(response))
+        # Process the message through the agent; ADK agents keep a
+        # per-user session so follow-up turns see the earlier conversation
+        response = await _answer(request.message, request.user_id, use_cache=request.cache)
+        return ChatResponse(response=response)
+    except ExecutorSaturated as e:
+        raise _busy(e)
     except Exception as e:
         logger.error(f"Error processing request: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    started = time.perf_counter()
+    runner = (await _loaded()).runner
+    _check_rate_limit(request.user_id)
+    fairness = {"key": request.user_id, "weight": rate_limiter.weight(request.user_id)}
+    if runner:
+        try:
+            release = executor.release_once(await executor.acquire(**fairness))
+        except ExecutorSaturated as e:
+            raise _busy(e)
+
+        async def admitted_stream():
+            # Hold the executor slot until the whole stream has been sent
+            failed = True
+            try:
+                async for chunk in runner.stream(request.message, user_id=request.user_id):
+                    yield chunk
+                failed = False
+            finally:
+                release(failed=failed)
+
+        try:
+            # The response frees the slot too, in case the stream never starts
+            # (client gone before the first byte); whichever runs first wins
+            return ClosingStreamingResponse(
+                sse_stream(admitted_stream(), started=started),
+                on_close=lambda: release(failed=True),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
+        except BaseException:
+            release(failed=True)
+            raise
+    else:
+        # Rule-based agents answer in one piece; stream it as a single chunk
+        try:
+            response = await executor.submit(_run_agent, request.message, **fairness)
+        except ExecutorSaturated as e:
+            raise _busy(e)
+
+        async def single_chunk():
+            yield response
+
+        chunks = single_chunk()
+
+    return StreamingResponse(
+        sse_stream(chunks, started=started),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+@app.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    await _loaded()
+    if len(request.messages) > BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.messages)} > {BATCH_MAX_SIZE} messages",
+        )
+
+    async def answer(item: ChatRequest) -> str:
+        async def attempt():
+            rate_limiter.check(item.user_id)
+            return await _answer(item.message, item.user_id, use_cache=item.cache)
+
+        # Batch jobs are not latency sensitive: wait out the user's rate
+        # limit or a saturated executor, up to the item's deadline
+        return await retrying(attempt, (RateLimited, ExecutorSaturated))
+
+    limit = min(request.concurrency or BATCH_CONCURRENCY, executor.workers)
+    return StreamingResponse(
+        ndjson_results(fan_out(request.messages, answer, limit=limit)),
+        media_type="application/x-ndjson",
+    )
+
 @app.get("/agent-info")
-def agent_info():
+async def agent_info():
+    if not agent_loader.loaded:
+        await asyncio.to_thread(agent_loader.load)
+    root_agent = agent_loader.agent
     if not root_agent:
         return {"error": "Agent not loaded"}
     
+    # The pre-routing root agent has no model of its own; describe the
+    # delegator LLM it wraps
+    described = getattr(root_agent, 'delegator', root_agent)
     return {
         "name": root_agent.name,
         "description": root_agent.description,
-        "model": root_agent.model if hasattr(root_agent, 'model') else "unknown",
-        "tools": len(root_agent.tools) if hasattr(root_agent, 'tools') else 0
+        "model": described.model if hasattr(described, 'model') else "unknown",
+        "tools": len(described.tools) if hasattr(described, 'tools') else 0
+    }
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/stats")
+def stats():
+    return {
+        "executor": executor.snapshot(),
+        "rate_limit": rate_limiter.snapshot(),
+        "startup": agent_loader.report(),
+        "sessions": agent_loader.runner.sessions.snapshot() if agent_loader.runner else None,
+        "cache": response_cache.snapshot(),
+        "coalescing": inflight.snapshot(),
+        "canned": agent_loader.canned.snapshot() if agent_loader.canned else None,
     }
 
 if __name__ == "__main__":
-    import uvicorn
     port = int(os.getenv("PORT", 8080))
-    uvicorn.run("app:app", host="0.0.0.0", port=port)
+    if os.getenv("SERVING_MODE") == "prefork":
+        # Load before forking so every worker shares the agent copy-on-write.
+        # `python -m serving.prefork app:app` also keeps GC off while loading.
+        from serving.prefork import serve
+        agent_loader.load()
+        serve(app, host="0.0.0.0", port=port)
+    else:
+        import uvicorn
+        uvicorn.run("app:app", host="0.0.0.0", port=port)
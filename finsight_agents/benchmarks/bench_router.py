@@ -0,0 +1,59 @@
+"""
+Pre-router quality and cost on the labeled routing set
+
+    python benchmarks/bench_router.py
+    python benchmarks/bench_router.py --thresholds 0.5,0.6,0.7 --show-misses
+
+For each confidence threshold, ``PreRouter`` classifies every query in
+eval/data/routing.test.json. ``bypass`` is the share sent straight to a
+sub-agent, ``bypass acc`` the share of those that reached the labeled
+sub-agent, ``accuracy`` the share of all queries that took the labeled
+path (bypass or delegator). Every bypass skips the delegator's two model
+calls (choosing the sub-agent, then restating its answer); ``calls saved``
+is that per 100 queries. ``classify us`` is the local cost per query.
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delegator.router import ROUTER_MIN_CONFIDENCE, PreRouter, evaluate, load_cases  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--cases", default=None, help="labeled routing set (default: eval/data/routing.test.json)")
+    parser.add_argument("--thresholds", default=f"0.4,0.5,{ROUTER_MIN_CONFIDENCE:g},0.7,0.8",
+                        help="confidence thresholds to compare")
+    parser.add_argument("--show-misses", action="store_true", help="list misrouted and delegated queries")
+    args = parser.parse_args(argv)
+
+    cases = load_cases(args.cases) if args.cases else load_cases()
+    queries = [query for query, _ in cases]
+    print(f"{len(cases)} labeled queries, {sum(agent is not None for _, agent in cases)} with a sub-agent")
+    print(f"{'threshold':>9} {'bypass':>7} {'bypass acc':>11} {'accuracy':>9} {'misrouted':>10} "
+          f"{'calls saved':>12} {'classify us':>12}")
+    for threshold in sorted({float(t) for t in args.thresholds.split(",")}):
+        router = PreRouter(min_confidence=threshold)
+        report = evaluate(router, cases)
+        classify_us = min(timeit.repeat(lambda: [router.classify(q) for q in queries], number=20, repeat=5))
+        classify_us = classify_us / 20 / len(queries) * 1e6
+        print(f"{threshold:>9.2f} {report['bypass_rate']:>7.1%} {report['bypass_accuracy']:>11.1%} "
+              f"{report['accuracy']:>9.1%} {len(report['misrouted']):>10} "
+              f"{report['bypass_rate'] * 200:>12.0f} {classify_us:>12.1f}")
+
+    if args.show_misses:
+        router = PreRouter()
+        print(f"\nAt the default threshold ({router.min_confidence:g}):")
+        for query, expected in cases:
+            route = router.classify(query)
+            if route.agent != expected:
+                print(f"  {route.confidence:.2f} {route.agent or 'delegator':<22} "
+                      f"(expected {expected or 'delegator'}): {query}")
+
+
+if __name__ == "__main__":
+    main()
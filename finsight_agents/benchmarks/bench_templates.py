@@ -0,0 +1,86 @@
+"""
+Microbenchmark: per-section ``+=`` concatenation vs joined layouts
+
+    python benchmarks/bench_templates.py
+    python benchmarks/bench_templates.py --repeat 5000
+
+Every sample message is answered once by the local server's agent to
+record the sections and values its branch chose. ``concat`` then builds
+that response the way process_message did before templates: one f-string
+per section, appended with ``response += ...``. ``layout`` is
+``TemplateSet.render``, which fills the same sections as one joined
+template with a single ``format_map``. Both use the same sections, so the
+difference is only the string building; ``process_message`` is the whole call for scale
+(intent matching and entity extraction included).
+"""
+
+import argparse
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.INFO)
+from extra.local_server import FinSightAIAgent  # noqa: E402
+
+MESSAGES = [
+    ("loan", "I need a home loan for $300,000"),
+    ("investment", "How to invest $50,000 at age 30?"),
+    ("credit score", "My credit score is 620, how do I improve it?"),
+    ("budget", "Create a budget for $6,000 monthly income"),
+    ("general", "What is inflation?"),
+]
+
+
+def recorded_layout(agent, message):
+    """The ``(sections, values)`` process_message renders for ``message``"""
+    calls = []
+    render = agent.TEMPLATES.render
+
+    def record(sections, values=None):
+        calls.append((list(sections), values))
+        return render(sections, values)
+
+    agent.TEMPLATES.render = record
+    try:
+        agent.process_message(message)
+    finally:
+        del agent.TEMPLATES.render
+    return calls[0]
+
+
+def concat(templates, sections, values):
+    response = ""
+    for name in sections:
+        response += templates[name].render(values)
+    return response
+
+
+def bench(fn, repeat):
+    return min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args(argv)
+
+    agent = FinSightAIAgent()
+    templates = agent.TEMPLATES
+    print(f"{'branch':<14} {'sections':>8} {'chars':>6} {'concat us':>10} {'layout us':>10} "
+          f"{'speedup':>8} {'process_message us':>19}")
+    for name, message in MESSAGES:
+        sections, values = recorded_layout(agent, message)
+        assert concat(templates, sections, values) == templates.render(sections, values)
+        concat_us = bench(lambda: concat(templates, sections, values), args.repeat)
+        layout_us = bench(lambda: templates.render(sections, values), args.repeat)
+        total_us = bench(lambda: agent.process_message(message), args.repeat)
+        chars = len(templates.render(sections, values))
+        print(f"{name:<14} {len(sections):>8} {chars:>6} {concat_us:>10.2f} {layout_us:>10.2f} "
+              f"{concat_us / layout_us:>7.2f}x {total_us:>19.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Delegator prompt size and tool recall with and without tool pruning
+
+    python benchmarks/bench_tool_pruning.py
+    python benchmarks/bench_tool_pruning.py --top-k 1,2,3,4
+
+Every query in eval/data/routing.test.json gets the delegator's request as
+ADK builds it (instruction plus one declaration per sub-agent tool), then
+``ToolPruner`` trims it. ``tokens`` is the instruction and tool
+declarations only (the message and history are the same either way),
+counted with the Gemini local tokenizer when it is installed and
+estimated at 4 characters per token otherwise. ``recall`` is the share of
+queries labeled with a sub-agent whose sub-agent is still offered, i.e.
+the routing accuracy the model can reach at best (100% with the full
+list). ``delegated`` repeats the numbers for the queries the pre-router
+leaves to the delegator, which is the traffic the pruner actually sees.
+``select us`` is the local cost of ranking the tools for one query.
+No model is called; run the ADK eval for end-to-end answers.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore", category=UserWarning)
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+
+from delegator.agent import SERVICE_LINES, delegator, router  # noqa: E402
+from delegator.pruning import ToolPruner  # noqa: E402
+from delegator.router import load_cases  # noqa: E402
+
+
+def token_counter():
+    """(name, count(text)) using the Gemini tokenizer if available"""
+    try:
+        from google.genai.local_tokenizer import LocalTokenizer
+
+        tokenizer = LocalTokenizer(model_name="gemini-2.0-flash")
+        return "gemini", lambda text: tokenizer.count_tokens(text).total_tokens
+    except Exception:
+        return "chars/4", lambda text: len(text) / 4
+
+
+def full_request():
+    request = LlmRequest()
+    request.append_instructions([delegator.instruction])
+    request.append_tools(delegator.tools)
+    return request
+
+
+def prompt_text(request):
+    declarations = [
+        declaration.model_dump(exclude_none=True, mode="json")
+        for tool in request.config.tools or []
+        for declaration in tool.function_declarations or []
+    ]
+    return request.config.system_instruction + json.dumps(declarations)
+
+
+def measure(pruner, cases, base, count):
+    full_tokens = count(prompt_text(base))
+    tokens, kept, found, labeled = [], [], 0, 0
+    for query, expected in cases:
+        keep = pruner.select(query)
+        request = copy.deepcopy(base)
+        if keep is not None:
+            pruner.prune(request, keep)
+        tokens.append(count(prompt_text(request)))
+        kept.append(len(request.tools_dict))
+        if expected:
+            labeled += 1
+            found += expected in request.tools_dict
+    mean = sum(tokens) / len(tokens)
+    return {
+        "full": full_tokens,
+        "tokens": mean,
+        "saved": 1 - mean / full_tokens,
+        "tools": sum(kept) / len(kept),
+        "recall": found / labeled if labeled else 1.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--top-k", default="1,2,3,4,8", help="tools kept per request")
+    args = parser.parse_args(argv)
+
+    name, count = token_counter()
+    base = full_request()
+    cases = load_cases()
+    delegated = [(query, agent) for query, agent in cases if router.route(query) is None]
+    print(f"{len(cases)} labeled queries, {len(delegated)} left to the delegator by the pre-router; tokens: {name}")
+    print(f"{'top-k':>5} {'set':<10} {'tools':>6} {'tokens':>7} {'full':>6} {'saved':>7} {'recall':>7} "
+          f"{'select us':>9}")
+    for top_k in (int(k) for k in args.top_k.split(",")):
+        pruner = ToolPruner(SERVICE_LINES, top_k=top_k, router=router)
+        queries = [query for query, _ in cases]
+        select_us = min(timeit.repeat(lambda: [pruner.select(q) for q in queries], number=20, repeat=5))
+        select_us = select_us / 20 / len(queries) * 1e6
+        for label, subset in (("all", cases), ("delegated", delegated)):
+            result = measure(pruner, subset, base, count)
+            print(f"{top_k:>5} {label:<10} {result['tools']:>6.1f} {result['tokens']:>7.0f} {result['full']:>6.0f} "
+                  f"{result['saved']:>6.1%} {result['recall']:>6.1%} {select_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
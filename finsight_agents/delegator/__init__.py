@@ -1 +1,10 @@
-from . import agent
+import importlib
+
+
+def __getattr__(name):
+    # `adk web` looks up `delegator.agent`; import it on first access so that
+    # the lightweight modules in this package (e.g. fallback_agent) can be
+    # used without pulling in google.adk and every sub-agent
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,15 @@
-from google.adk.agents import Agent
+from google.adk.agents import Agent, BaseAgent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
 from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
 import logging
 
+from .fanout import FanOut, merge
+from .pruning import ToolPruner
+from .router import PreRouter
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -16,32 +24,43 @@ try:
     from .sub_agents.scam_detector.agent import scam_detector
     from .sub_agents.budget_planner.agent import budget_planner
     
-    # Create tools list
-    tools_list = [
-        AgentTool(loan_helper),
-        AgentTool(gov_scheme_suggestor),
-        AgentTool(credit_card_provider),
-        AgentTool(credit_score_improver),
-        AgentTool(tax_filing_helper),
-        AgentTool(investment_guide),
-        AgentTool(scam_detector),
-        AgentTool(budget_planner)
+    sub_agents = [
+        loan_helper,
+        gov_scheme_suggestor,
+        credit_card_provider,
+        credit_score_improver,
+        tax_filing_helper,
+        investment_guide,
+        scam_detector,
+        budget_planner,
     ]
+    # Create tools list
+    tools_list = [AgentTool(agent) for agent in sub_agents]
     logger.info("Successfully loaded all sub-agents")
     
 except Exception as e:
     logger.error(f"Error loading sub-agents: {e}")
+    sub_agents = []
     tools_list = []
 
 # Disable MCP for now to avoid connection issues
 MCP_AVAILABLE = False
 logger.info("MCP toolset disabled for stability - can be enabled later when MCP server is running")
 
-root_agent = Agent(
-    name="delegator",
-    model="gemini-2.0-flash",
-    description="FinSight AI Financial Advisor - A comprehensive financial assistance agent",
-    instruction="""
+# Service line of each sub-agent; ToolPruner drops the lines of the sub-agents
+# it leaves out of a request (see delegator.pruning)
+SERVICE_LINES = {
+    "loan_helper": "- **Loan Helper**: Assistance with personal loans, home loans, education loans, and loan comparisons",
+    "gov_scheme_suggestor": "- **Government Scheme Suggester**: Information about government financial schemes, subsidies, and benefits",
+    "credit_card_provider": "- **Credit Card Provider**: Credit card recommendations, comparisons, and application guidance",
+    "credit_score_improver": "- **Credit Score Improver**: Strategies to improve and maintain good credit scores",
+    "tax_filing_helper": "- **Tax Filing Helper**: Tax planning, filing assistance, and optimization strategies",
+    "investment_guide": "- **Investment Guide**: Investment advice, portfolio management, and market insights",
+    "scam_detector": "- **Scam Detector**: Identify and protect against financial scams and fraudulent schemes",
+    "budget_planner": "- **Budget Planner**: Personal budgeting, expense tracking, and financial planning",
+}
+
+INSTRUCTION = """
 You are FinSight AI, a sophisticated financial advisor and delegation agent. Your role is to help users with comprehensive financial guidance by leveraging specialized sub-agents and tools.
 
 **Your Core Responsibilities:**
@@ -51,14 +70,7 @@ You are FinSight AI, a sophisticated financial advisor and delegation agent. You
 4. **Provide comprehensive summaries** of the results in a clear, actionable format
 
 **Available Financial Services:**
-- **Loan Helper**: Assistance with personal loans, home loans, education loans, and loan comparisons
-- **Government Scheme Suggester**: Information about government financial schemes, subsidies, and benefits
-- **Credit Card Provider**: Credit card recommendations, comparisons, and application guidance
-- **Credit Score Improver**: Strategies to improve and maintain good credit scores
-- **Tax Filing Helper**: Tax planning, filing assistance, and optimization strategies
-- **Investment Guide**: Investment advice, portfolio management, and market insights
-- **Scam Detector**: Identify and protect against financial scams and fraudulent schemes
-- **Budget Planner**: Personal budgeting, expense tracking, and financial planning
+{services}
 
 **Your Approach:**
 1. **Listen carefully** to understand the user's financial situation and goals
@@ -74,6 +86,83 @@ You are FinSight AI, a sophisticated financial advisor and delegation agent. You
 - Always prioritize the user's financial well-being and security
 
 Remember: You're here to empower users to make informed financial decisions and improve their financial health through expert guidance and specialized tools.
-""",
+"""
+
+router = PreRouter()
+
+delegator = Agent(
+    name="delegator",
+    model="gemini-2.0-flash",
+    description="FinSight AI Financial Advisor - A comprehensive financial assistance agent",
+    instruction=INSTRUCTION.format(services="\n".join(SERVICE_LINES.values())),
+    before_model_callback=ToolPruner(SERVICE_LINES, router=router),
     tools=tools_list,
-)
\ No newline at end of file
+)
+
+
+class PreRoutedAgent(BaseAgent):
+    """
+    Sends clear-cut questions straight to their sub-agent
+
+    The local ``PreRouter`` picks the sub-agent when it is confident (see
+    delegator.router), saving the delegator's model call. Compound
+    questions spanning several sub-agents are fanned out to them
+    concurrently and their answers merged (see delegator.fanout); every
+    other question goes through the delegator as before. Each turn is
+    routed afresh.
+    """
+
+    delegator: BaseAgent
+    specialists: dict[str, BaseAgent]
+    router: PreRouter
+    fanout: FanOut
+
+    async def _run_async_impl(self, ctx):
+        message = "".join(part.text or "" for part in (ctx.user_content.parts if ctx.user_content else []))
+        route = self.router.classify(message)
+        if route.agent is None:
+            questions = [q for q in self.fanout.plan(message) if q.agent in self.specialists]
+            if len(questions) > 1:
+                result = await self.fanout.run(questions, lambda name, text: self._ask(ctx, name, text))
+                logger.debug(f"Fanned out to {', '.join(q.agent for q in questions)} in {result.elapsed:.2f}s")
+                yield Event(
+                    author=self.name,
+                    invocation_id=ctx.invocation_id,
+                    content=types.Content(role="model", parts=[types.Part(text=merge(result))]),
+                )
+                return
+        agent = self.specialists.get(route.agent, self.delegator)
+        logger.debug(f"Routed to {agent.name} ({route.intent}, confidence {route.confidence:.2f})")
+        async for event in agent.run_async(ctx):
+            yield event
+
+    async def _ask(self, ctx, name, text):
+        """Final answer of sub-agent ``name`` to ``text``, run in its own session like an AgentTool call"""
+        runner = Runner(app_name=ctx.app_name, agent=self.specialists[name], session_service=InMemorySessionService())
+        session = await runner.session_service.create_session(app_name=ctx.app_name, user_id=ctx.user_id)
+        parts = []
+        async for event in runner.run_async(
+            user_id=ctx.user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=text)]),
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                parts.extend(part.text for part in event.content.parts if part.text and not part.thought)
+        return "".join(parts)
+
+    def find_sub_agent(self, name):
+        # The delegator and sub-agents run unparented, so their events must
+        # not make the Runner resume them directly: the next turn starts here
+        if name == self.delegator.name or name in self.specialists:
+            return self
+        return super().find_sub_agent(name)
+
+
+root_agent = PreRoutedAgent(
+    name="finsight",
+    description=delegator.description,
+    delegator=delegator,
+    specialists={agent.name: agent for agent in sub_agents},
+    router=router,
+    fanout=FanOut(router=router),
+)
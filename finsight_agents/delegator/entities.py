@@ -0,0 +1,169 @@
+"""
+Single-pass extraction of the financial details in a user message
+
+One precompiled pattern finds amounts (with k/thousand/lakh/crore/million
+units and $/₹/Rs prefixes), age, income, credit score and a horizon in
+years in a single scan, instead of a dozen ``re.findall`` calls per
+message. Every gap between a cue word and its number is bounded and
+limited to non-digits, so no input can make the pattern backtrack more
+than a constant amount per position, and messages are truncated to
+``MAX_MESSAGE_CHARS`` before scanning. A period stated right next to the
+income ("80k a month", "monthly salary", "12 lpa") is kept with it as
+``income_period``, so other amounts' "per month" never rescales it.
+
+A number only counts as money with a currency symbol, a unit or at least
+``MIN_BARE_AMOUNT``, so "3 credit cards" or "I make 5 m" carry no amount.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Longest prefix of a message that is scanned for entities
+MAX_MESSAGE_CHARS = 4000
+
+# Smallest number taken as money without a currency symbol or unit
+MIN_BARE_AMOUNT = 1000
+
+UNIT_MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3,
+    "l": 1e5, "lac": 1e5, "lacs": 1e5, "lakh": 1e5, "lakhs": 1e5, "lpa": 1e5,
+    "cr": 1e7, "crore": 1e7, "crores": 1e7,
+    "m": 1e6, "mn": 1e6, "million": 1e6,
+}
+
+_NUMBER = r"\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d{1,12}(?:\.\d+)?"
+_CURRENCY = r"(?:rs\.?|inr|₹|\$)\s?"
+# "per month", "a year", "p.a." right after an income; "lpa" and "ctc" are yearly too
+_PERIOD = (r"(?:monthly|per month|a month|p\.?m\.?|/\s?month"
+           r"|annual(?:ly)?|yearly|per year|a year|per annum|p\.?a\.?|/\s?year)(?!\w)")
+# Word units may follow a space, single letters must be attached ("5l", "300k")
+_UNIT = r"(?:(?:\s{0,2}(?P<NAME>thousand|lakhs?|lacs?|lpa|crores?|million|mn)|(?P<NAME_short>k|l|cr|m))\b)"
+
+_ENTITY_PATTERN = re.compile(
+    "|".join([
+        # "i'm 30", "i am 30", "age 30", "aged 30"
+        r"(?<!\w)(?:i'm|i am|age|aged)\s{1,3}(?P<age>\d{1,3})\b(?!\s{0,2}(?:k|%|lakh|thousand))",
+        # "30 years old", "30 yrs old"
+        r"(?<![\d.,])(?P<age_years>\d{1,3})\s{0,3}(?:years?|yrs?)\s{0,3}old\b",
+        # "for 15 years", "10-year horizon", "in 5 yrs"
+        r"(?<![\d.,])(?P<years>\d{1,2})(?:\s{0,3}|-)(?:years?|yrs?)\b",
+        # "credit score is 720", "cibil: 780", "score of 650"
+        r"(?<!\w)(?:credit score|cibil(?: score)?|score)\b[^\d\n]{0,30}?(?P<score>\d{3})\b",
+        # "my 620 credit score", "780 cibil"
+        r"(?<![\d.,])(?P<score_before>\d{3})\s{1,3}(?:credit score|cibil)\b",
+        # "earn $5,000 a month", "monthly salary of 80k", "income is ₹1.2 lakh", "ctc 18 lpa"
+        r"(?<!\w)(?:(?P<income_period_before>monthly|annual|yearly)\s{1,3})?"
+        + r"(?P<income_cue>earn(?:s|ing)?|salary|income|ctc|make|making)\b(?:\s{1,3}(?:of|is|about|around))?\s{0,3}"
+        + r"(?P<income_currency>" + _CURRENCY + r")?"
+        + r"(?P<income>" + _NUMBER + r")(?![.,]?\d)" + _UNIT.replace("NAME", "income_unit") + r"?"
+        + r"(?:\s{0,3}(?P<income_period>" + _PERIOD + r"))?",
+        # "existing EMI of 15k", "paying emis of ₹12,000"
+        r"(?<!\w)(?:existing|current|ongoing|other|paying)\s{1,3}(?:loan\s{1,3})?emis?\b"
+        + r"(?:\s{1,3}(?:of|is|are|about|around))?\s{0,3}(?P<emi_currency>" + _CURRENCY + r")?"
+        + r"(?P<emi>" + _NUMBER + r")(?![.,]?\d)" + _UNIT.replace("NAME", "emi_unit") + r"?",
+        # "$300,000", "5 lakh", "₹50k", optionally followed by "(monthly) income|salary"
+        r"(?<![\w.,])(?P<amount_currency>" + _CURRENCY + r")?(?P<amount>" + _NUMBER + r")(?![.,]?\d)"
+        + _UNIT.replace("NAME", "amount_unit") + r"?"
+        + r"(?!\s{0,2}(?:%|percent\b|years?\b|yrs?\b|months?\b))"
+        + r"(?P<as_income>\s{0,3}(?:(?P<amount_period>monthly|annual|yearly|per month|per year)\s{1,3})?"
+        + r"(?:income|salary))?",
+    ])
+)
+
+
+
+@dataclass(frozen=True)
+class Entities:
+    """Financial details found in a message; ``None`` when absent"""
+
+    amount: Optional[float] = None
+    age: Optional[int] = None
+    income: Optional[float] = None
+    credit_score: Optional[int] = None
+    years: Optional[int] = None
+    # Monthly EMIs already being paid
+    existing_emi: Optional[float] = None
+    # "month" or "year" when stated next to the income
+    income_period: Optional[str] = None
+
+
+def _to_amount(number, unit, currency=None):
+    """Rupee (or dollar) value of ``number``, or None for a small bare number"""
+    value = float(number.replace(",", ""))
+    if unit:
+        return value * UNIT_MULTIPLIERS[unit]
+    if currency or value >= MIN_BARE_AMOUNT:
+        return value
+    return None
+
+
+def _period(*qualifiers):
+    """"month" or "year" from the first period word (or "lpa"/"ctc") given, else None"""
+    for qualifier in qualifiers:
+        if qualifier:
+            return "month" if "month" in qualifier or qualifier.replace(".", "") == "pm" else "year"
+    return None
+
+
+def extract_entities(message):
+    """Amount, age, income, credit score and horizon of ``message`` in one scan"""
+    text = message[:MAX_MESSAGE_CHARS].lower()
+    found = {}
+    for match in _ENTITY_PATTERN.finditer(text):
+        groups = match.groupdict()
+        if groups["age"] or groups["age_years"]:
+            age = int(groups["age"] or groups["age_years"])
+            if 10 <= age <= 120:
+                found.setdefault("age", age)
+        elif groups["years"]:
+            years = int(groups["years"])
+            if 1 <= years <= 60:
+                found.setdefault("years", years)
+        elif groups["score"] or groups["score_before"]:
+            score = int(groups["score"] or groups["score_before"])
+            # CIBIL runs 300-900, FICO 300-850
+            if 300 <= score <= 900:
+                found.setdefault("credit_score", score)
+        elif groups["emi"]:
+            unit = groups["emi_unit"] or groups["emi_unit_short"]
+            value = _to_amount(groups["emi"], unit, groups["emi_currency"])
+            if value is not None:
+                found.setdefault("existing_emi", value)
+        elif groups["income"]:
+            unit = groups["income_unit"] or groups["income_unit_short"]
+            value = _to_amount(groups["income"], unit, groups["income_currency"])
+            if value is not None and "income" not in found:
+                found["income"] = value
+                found["income_period"] = _period(
+                    groups["income_period"], groups["income_period_before"], unit if unit == "lpa" else None,
+                    "ctc" if groups["income_cue"] == "ctc" else None,
+                )
+        elif groups["amount"]:
+            unit = groups["amount_unit"] or groups["amount_unit_short"]
+            value = _to_amount(groups["amount"], unit, groups["amount_currency"])
+            if value is None:
+                continue
+            # "12 lpa" is a salary even without the word
+            if (groups["as_income"] or unit == "lpa") and "income" not in found:
+                found["income"] = value
+                found["income_period"] = _period(groups["amount_period"], unit if unit == "lpa" else None)
+            elif not groups["as_income"] and unit != "lpa":
+                found.setdefault("amount", value)
+    return Entities(**found)
+
+
+def annual_income(message):
+    """The income in ``message`` per year, or None; incomes stated per month are multiplied by 12"""
+    entities = extract_entities(message)
+    if entities.income and entities.income_period == "month":
+        return entities.income * 12
+    return entities.income
+
+
+def monthly_income(message):
+    """The income in ``message`` per month, or None; incomes stated per year are divided by 12"""
+    entities = extract_entities(message)
+    if entities.income and entities.income_period == "year":
+        return entities.income / 12
+    return entities.income
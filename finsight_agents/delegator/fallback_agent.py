@@ -3,21 +3,37 @@ Minimal FinSight AI agent for cloud deployment
 This version works without external dependencies on sub-agents
 """
 
-class SimpleFinSightAgent:
-    def __init__(self):
-        self.name = "finsight-ai-simple"
-        self.description = "FinSight AI Financial Advisor - Simplified cloud version"
-        
-    def run(self, message):
-        """
-        Process user message and return financial advice
-        """
-        # Convert message to lowercase for easier processing
-        msg_lower = message.lower()
-        
-        # Greeting responses
-        if any(word in msg_lower for word in ['hello', 'hi', 'hey', 'greet']):
-            return """
+from .entities import annual_income, extract_entities, monthly_income
+from .intents import IntentMatcher
+from .tools.cashflow import cashflow_table, project_cashflow
+from .tools.goals import required_sip, sip_future_value, total_invested
+from .tools.tax import LATEST_YEAR, regime_comparison_table
+
+# (intent, keywords); the best-scoring intent picks the answer and earlier
+# rows win ties
+INTENT_KEYWORDS = [
+    ("greeting", ['hello', 'hi', 'hey', 'greet']),
+    ("loan", ['loan', 'mortgage', 'borrow', 'lending']),
+    ("investment", ['invest', 'investment', 'portfolio', 'mutual fund', 'stock', 'sip']),
+    ("tax", ['tax', 'filing', 'itr', 'deduction', '80c']),
+    ("credit_score", ['credit score', 'cibil', 'credit report', 'improve credit']),
+    ("budget", ['budget', 'save', 'savings', 'expense', 'planning']),
+    ("scam", ['scam', 'fraud', 'suspicious', 'lottery', 'prize']),
+    ("government_scheme", ['government scheme', 'subsidy', 'pmay', 'mudra', 'startup']),
+    ("credit_card", ['credit card', 'card', 'cashback', 'rewards']),
+]
+
+INTENT_MATCHER = IntentMatcher(INTENT_KEYWORDS)
+
+# ₹5,000/month for 20 years at 12%, flat and stepped up 10% a year
+SIP_EXAMPLE = sip_future_value(5000, 12, 20, [0, 10])
+SIP_EXAMPLE_INVESTED = total_invested(5000, 20, [0, 10])
+
+# Answers that do not depend on the message, so servers can pre-encode them
+# once (see serving.canned); tax questions stating a salary, goals and
+# budgets stating an income are computed
+CANNED_RESPONSES = {
+    "greeting": """
 Hello! Welcome to FinSight AI! 👋
 
 I'm your comprehensive financial advisor, here to help you with:
@@ -31,11 +47,8 @@ I'm your comprehensive financial advisor, here to help you with:
 • 💹 Budget planning and expense tracking
 
 What specific financial topic would you like help with today?
-"""
-
-        # Loan-related queries
-        if any(word in msg_lower for word in ['loan', 'mortgage', 'borrow', 'lending']):
-            return """
+""",
+    "loan": """
 🏠 **Loan Guidance - FinSight AI**
 
 For your loan inquiry, here's comprehensive guidance:
@@ -65,11 +78,8 @@ For your loan inquiry, here's comprehensive guidance:
 4. Get pre-approval before house hunting
 
 Would you like specific advice for any particular type of loan?
-"""
-
-        # Investment-related queries
-        if any(word in msg_lower for word in ['invest', 'investment', 'portfolio', 'mutual fund', 'stock', 'sip']):
-            return """
+""",
+    "investment": f"""
 📈 **Investment Guidance - FinSight AI**
 
 Smart investment strategy based on your query:
@@ -108,12 +118,15 @@ Smart investment strategy based on your query:
 3. Increase investment by 10% annually
 4. Keep 6-month emergency fund separate
 
-What's your age and investment amount you're considering?
-"""
+**What ₹5,000/month Becomes in 20 Years (12% return):**
+• Flat SIP: ₹{SIP_EXAMPLE[0]:,.0f} (you invest ₹{SIP_EXAMPLE_INVESTED[0]:,.0f})
+• Stepped up 10% every year: ₹{SIP_EXAMPLE[1]:,.0f} (you invest ₹{SIP_EXAMPLE_INVESTED[1]:,.0f})
 
-        # Tax-related queries
-        if any(word in msg_lower for word in ['tax', 'filing', 'itr', 'deduction', '80c']):
-            return """
+Tell me a goal and a timeline (e.g. "₹50 lakh in 10 years") for the SIP it needs.
+
+What's your age and investment amount you're considering?
+""",
+    "tax": """
 📋 **Tax Filing Assistance - FinSight AI**
 
 Tax optimization guidance for you:
@@ -153,11 +166,8 @@ Tax optimization guidance for you:
 • Medical bills, donation receipts
 
 Need help with specific tax situation or deductions?
-"""
-
-        # Credit score related queries
-        if any(word in msg_lower for word in ['credit score', 'cibil', 'credit report', 'improve credit']):
-            return """
+""",
+    "credit_score": """
 📊 **Credit Score Improvement - FinSight AI**
 
 Your guide to building excellent credit:
@@ -202,11 +212,8 @@ Your guide to building excellent credit:
 • CIBIL, Experian, Equifax, CRIF
 
 Current score range you're working with? I can provide specific guidance!
-"""
-
-        # Budget and planning queries
-        if any(word in msg_lower for word in ['budget', 'save', 'savings', 'expense', 'planning']):
-            return """
+""",
+    "budget": """
 💹 **Budget Planning - FinSight AI**
 
 Smart budgeting strategy for financial success:
@@ -250,11 +257,8 @@ Smart budgeting strategy for financial success:
 Build ₹50,000-100,000 emergency fund before aggressive investing.
 
 What's your monthly income range? I can help create a personalized budget!
-"""
-
-        # Scam detection queries
-        if any(word in msg_lower for word in ['scam', 'fraud', 'suspicious', 'lottery', 'prize']):
-            return """
+""",
+    "scam": """
 🛡️ **Scam Detection Alert - FinSight AI**
 
 **🚨 Common Financial Scams to Avoid:**
@@ -301,11 +305,8 @@ What's your monthly income range? I can help create a personalized budget!
 5. Warn friends and family
 
 Stay safe! When in doubt, always verify independently.
-"""
-
-        # Government schemes queries
-        if any(word in msg_lower for word in ['government scheme', 'subsidy', 'pmay', 'mudra', 'startup']):
-            return """
+""",
+    "government_scheme": """
 🏛️ **Government Financial Schemes - FinSight AI**
 
 Popular schemes you might be eligible for:
@@ -348,11 +349,8 @@ Popular schemes you might be eligible for:
 • pmay-urban.gov.in
 
 Which specific scheme interests you most?
-"""
-
-        # Credit card queries
-        if any(word in msg_lower for word in ['credit card', 'card', 'cashback', 'rewards']):
-            return """
+""",
+    "credit_card": """
 💳 **Credit Card Guidance - FinSight AI**
 
 Smart credit card selection advice:
@@ -404,11 +402,8 @@ Smart credit card selection advice:
 ❌ Overspending for rewards
 
 What's your monthly income and primary use case for the card?
-"""
-
-        # General financial advice
-        else:
-            return """
+""",
+    "general": """
 💰 **FinSight AI - Your Financial Guide**
 
 I can help you with comprehensive financial guidance in these areas:
@@ -445,7 +440,132 @@ Simply ask me about any financial topic like:
 • "Improve my credit score"
 
 What specific financial guidance do you need today? 🤔
+""",
+}
+
+
+def tax_estimate(salary):
+    """Old vs new regime answer for a tax question that states a salary"""
+    return f"""
+📋 **Income Tax Estimate ({LATEST_YEAR})**
+
+{regime_comparison_table([salary])}
+
+• Includes the standard deduction, section 87A rebate, surcharge and 4% cess
+• The new regime is the default; the old one only pays off if your 80C, 80D, home loan interest and NPS deductions exceed the break-even amount
+• Figures assume the amount is your gross annual salary
+
+Ask about specific deductions or how to file your ITR for more help.
+"""
+
+
+def goal_estimate(target, years):
+    """Monthly SIP needed to reach ``target`` in ``years`` at a few return rates"""
+    returns = [10, 12, 14]
+    # Rows are return rates, columns flat vs 10% step-up
+    sips = required_sip(target, [[r] for r in returns], years, [0, 10])
+    rows = "\n".join(
+        f"| {rate}% | ₹{flat:,.0f} | ₹{stepped:,.0f} |" for rate, (flat, stepped) in zip(returns, sips)
+    )
+    return f"""
+🎯 **Goal Plan - FinSight AI**
+
+To build **₹{target:,.0f}** in **{years} years**, start a monthly SIP of:
+
+| Expected return | Flat SIP | SIP stepped up 10% a year |
+|---|---|---|
+{rows}
+
+• Equity mutual funds have historically returned 10-14% over long periods; returns are not guaranteed
+• A step-up SIP starts lower and grows with your income
+• At 6% inflation, something costing ₹{target:,.0f} today costs ₹{target * 1.06 ** years:,.0f} in {years} years
+
+Share your age and risk appetite for fund suggestions.
 """
 
+
+def budget_estimate(income, years=10):
+    """50/30/20 split of a monthly ``income`` projected month by month over ``years``"""
+    needs, wants, savings = income * 0.5, income * 0.3, income * 0.2
+    # Raises of 8% a year against 6% inflation; the SIP grows with pay
+    timeline = project_cashflow(income, needs + wants, monthly_sip=savings, months=years * 12,
+                                inflation=6, annual_raise=8, sip_step_up=8)
+    deficit = timeline.first_deficit_month
+    if deficit:
+        outlook = f"Costs outgrow your pay by month {deficit}; trim wants before then"
+    else:
+        outlook = f"By year {years} you hold ₹{timeline.net_worth[-1]:,.0f}, ₹{timeline.investments[-1]:,.0f} of it invested"
+    return f"""
+💹 **Budget Plan - FinSight AI**
+
+For a monthly income of **₹{income:,.0f}**:
+
+• **Needs (50%):** ₹{needs:,.0f}
+• **Wants (30%):** ₹{wants:,.0f}
+• **Savings (20%):** ₹{savings:,.0f} as a SIP at 12%
+
+**Where this budget takes you** (8% yearly raises, 6% inflation, SIP raised with your pay):
+
+{cashflow_table(timeline, years=sorted({1, 3, 5, years}))}
+
+• {outlook}
+• Build an emergency fund of ₹{income * 6:,.0f} (6 months of income) before investing aggressively
+
+Share your EMIs and goals for a more precise plan.
+"""
+
+
+class SimpleFinSightAgent:
+    CANNED_RESPONSES = CANNED_RESPONSES
+
+    def __init__(self):
+        self.name = "finsight-ai-simple"
+        self.description = "FinSight AI Financial Advisor - Simplified cloud version"
+
+    def intent(self, message):
+        """Intent whose answer fits ``message``"""
+        # A tax question that states a salary gets the estimate even when it
+        # also mentions other topics ("I invest 5000 in a SIP, how much tax?")
+        if "tax" in INTENT_MATCHER.scan(message) and annual_income(message):
+            return "tax"
+        return INTENT_MATCHER.best(message)
+
+    def canned_key(self, message):
+        """Key of the canned answer for ``message``, or None if the answer is computed"""
+        intent = self.intent(message)
+        if intent == "tax" and annual_income(message):
+            return None
+        if intent == "investment" and self._goal(message):
+            return None
+        if intent == "budget" and monthly_income(message):
+            return None
+        return intent
+
+    def run(self, message):
+        """
+        Process user message and return financial advice
+        """
+        intent = self.intent(message)
+        if intent == "tax":
+            salary = annual_income(message)
+            if salary:
+                return tax_estimate(salary)
+        elif intent == "investment":
+            goal = self._goal(message)
+            if goal:
+                return goal_estimate(*goal)
+        elif intent == "budget":
+            income = monthly_income(message)
+            if income:
+                return budget_estimate(income, min(extract_entities(message).years or 10, 30))
+        return self.CANNED_RESPONSES[intent]
+
+    def _goal(self, message):
+        """``(target, years)`` when ``message`` states both, else None"""
+        entities = extract_entities(message)
+        if entities.amount and entities.years:
+            return entities.amount, entities.years
+        return None
+
 # Create the simple agent instance
 root_agent = SimpleFinSightAgent()
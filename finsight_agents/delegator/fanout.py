@@ -0,0 +1,141 @@
+"""
+Concurrent fan-out of compound questions to several sub-agents
+
+"I want a home loan, and will it hurt my credit score and my tax?" touches
+three sub-agents. Through the delegator they answer one ``AgentTool`` call
+after another, so their latencies add up. ``FanOut.plan`` splits such a
+question into clauses at conjunctions and punctuation, scores each clause
+with the pre-router's keyword model (see delegator.router) and groups the
+clauses by sub-agent. When two or more sub-agents are involved,
+``FanOut.run`` asks them all at once with asyncio and waits up to
+``deadline`` seconds. Sub-agents still running then are cancelled and
+their part of the answer says so instead of holding up the rest.
+
+``merge`` joins the answers in the order the question asked them, no
+matter which finished first, under one heading per topic, so the same
+answers always give the same response and no extra model call is needed.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import NamedTuple
+
+from .router import PreRouter
+
+logger = logging.getLogger(__name__)
+
+# Most sub-agents one question fans out to (0 disables fan-out)
+FANOUT_MAX_AGENTS = int(os.getenv("FANOUT_MAX_AGENTS", 3))
+# Seconds to wait for the sub-agents before answering without the stragglers
+FANOUT_DEADLINE_SECONDS = float(os.getenv("FANOUT_DEADLINE_SECONDS", 20))
+
+# Clause boundaries; "or" is left alone because "A or B" asks for one comparison
+_CLAUSE_BREAK = re.compile(r"[?!;]+|,|\.(?!\d)|\b(?:and|also|plus|as well as)\b", re.IGNORECASE)
+
+
+class SubQuestion(NamedTuple):
+    """The part of a compound question one sub-agent answers"""
+
+    agent: str
+    intent: str
+    text: str
+
+
+class FanOutResult(NamedTuple):
+    """Answers by sub-agent and the sub-agents that missed the deadline or failed"""
+
+    questions: list
+    answers: dict
+    timed_out: list
+    failed: list
+    elapsed: float
+
+
+def _clauses(message):
+    return [clause.strip() for clause in _CLAUSE_BREAK.split(message) if clause and clause.strip()]
+
+
+def _title(intent):
+    return intent.replace("_", " ").title()
+
+
+class FanOut:
+    """Splits compound questions and asks their sub-agents concurrently"""
+
+    def __init__(self, router=None, max_agents=None, deadline=None):
+        self.router = router or PreRouter()
+        self.max_agents = FANOUT_MAX_AGENTS if max_agents is None else max_agents
+        self.deadline = FANOUT_DEADLINE_SECONDS if deadline is None else deadline
+
+    def plan(self, message):
+        """Sub-questions of ``message`` in the order asked, or [] if it is not compound"""
+        if self.max_agents < 2:
+            return []
+        intents = {agent: intent for intent, agent in self.router.agents.items()}
+        grouped = {}
+        for clause in _clauses(message):
+            ranked = self.router.ranked_agents(clause)
+            if ranked:
+                grouped.setdefault(ranked[0], []).append(clause)
+        agents = list(grouped)[:self.max_agents]
+        if len(agents) < 2:
+            return []
+        return [
+            SubQuestion(
+                agent,
+                intents[agent],
+                f"{'; '.join(grouped[agent])}\n\n"
+                f"(This is part of the question \"{message}\"; answer only this part.)",
+            )
+            for agent in agents
+        ]
+
+    async def run(self, questions, ask):
+        """
+        Ask every sub-question concurrently through ``ask(agent, text)``
+
+        Answers that arrive after ``deadline`` seconds are dropped and their
+        sub-agents cancelled; a sub-agent that raises is reported as failed.
+        If the turn itself is cancelled, so are all its sub-agents.
+        """
+        started = time.perf_counter()
+        tasks = [asyncio.ensure_future(ask(q.agent, q.text)) for q in questions]
+        pending = set(tasks)
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=self.deadline)
+        finally:
+            # Stop stragglers spending model calls nobody will read
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+        answers, timed_out, failed = {}, [], []
+        for question, task in zip(questions, tasks):
+            if task in pending:
+                timed_out.append(question.agent)
+            elif task.exception() is not None:
+                logger.warning(f"Fan-out to {question.agent} failed: {task.exception()}")
+                failed.append(question.agent)
+            else:
+                answers[question.agent] = task.result()
+        if timed_out:
+            logger.info(f"Fan-out dropped {', '.join(timed_out)} after {self.deadline:g}s")
+        return FanOutResult(questions, answers, timed_out, failed, time.perf_counter() - started)
+
+
+def merge(result):
+    """One response from a ``FanOutResult``: a section per sub-question, in question order"""
+    sections = []
+    for question in result.questions:
+        title = _title(question.intent)
+        if question.agent in result.answers:
+            body = result.answers[question.agent].strip()
+        elif question.agent in result.timed_out:
+            body = f"_The {title.lower()} answer took too long; ask about it on its own for the details._"
+        else:
+            body = f"_The {title.lower()} answer is unavailable right now; please ask about it again._"
+        sections.append(f"**{title}**\n\n{body}")
+    return "\n\n".join(sections)
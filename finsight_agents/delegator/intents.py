@@ -0,0 +1,92 @@
+"""
+Single-pass keyword intent matching for the rule-based agents
+
+``IntentMatcher`` compiles an ``[(intent, keywords), ...]`` table into one
+keyword trie and emits it as a single regular expression, so a message is
+scanned once by the C regex engine no matter how many intents and keywords
+there are (the trie shape means each word start is rejected or extended
+one character at a time, like an Aho-Corasick goto function). Matches must
+start on a word boundary and end on one, except that keywords of three
+letters may take a plural ``s`` or ``es`` and longer keywords may be the
+stem of a longer word: "invest" matches "investing", "hi" does not match
+"this". Where keywords start at the same word the longest one wins.
+
+Every matched intent gets a score: the number of distinct keywords it
+matched, each weighted by its word count so phrases ("credit card") count
+for more than single words ("card"). Ties go to the intent listed first in
+the table, which keeps the old first-branch-wins order for simple messages.
+"""
+
+import re
+
+_PLURAL_SUFFIXES = ("s", "es")
+
+
+def _end_of_word(keyword):
+    """Pattern a keyword's match must end with"""
+    if len(keyword) >= 4:
+        return ""
+    if len(keyword) == 3:
+        return r"(?:s|es)?(?!\w)"
+    return r"(?!\w)"
+
+
+def _compile(keywords):
+    """Trie of ``keywords`` as one regex; longer continuations are tried first"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = keyword
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append(_end_of_word(node[""]))
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return re.compile(r"(?<!\w)" + emit(trie)) if trie else None
+
+
+class IntentMatcher:
+    """Compiled multi-keyword matcher over an intent table"""
+
+    def __init__(self, table):
+        self.intents = [intent for intent, _ in table]
+        self._priority = {intent: i for i, intent in enumerate(self.intents)}
+
+        # Matched text -> (keyword, intent, weight); plural forms of three
+        # letter keywords map back to the keyword they extend
+        self._keywords = {}
+        for intent, words in table:
+            for word in words:
+                keyword = word.lower()
+                self._keywords.setdefault(keyword, (keyword, intent, len(keyword.split())))
+        for keyword, entry in list(self._keywords.items()):
+            if len(keyword) == 3:
+                for suffix in _PLURAL_SUFFIXES:
+                    self._keywords.setdefault(keyword + suffix, entry)
+        self._pattern = _compile([k for k, entry in self._keywords.items() if k == entry[0]])
+
+    def scan(self, text):
+        """Map each intent found in ``text`` to its score"""
+        if self._pattern is None:
+            return {}
+        found = {self._keywords[match.group()] for match in self._pattern.finditer(text.lower())}
+        scores = {}
+        for _, intent, weight in found:
+            scores[intent] = scores.get(intent, 0) + weight
+        return scores
+
+    def match(self, text):
+        """Every matched ``(intent, score)``, best first"""
+        scores = self.scan(text)
+        return sorted(scores.items(), key=lambda item: (-item[1], self._priority[item[0]]))
+
+    def best(self, text, default="general"):
+        """The highest-scoring intent of ``text``, or ``default`` if none matched"""
+        matches = self.match(text)
+        return matches[0][0] if matches else default
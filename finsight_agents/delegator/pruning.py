@@ -0,0 +1,65 @@
+"""
+Per-request tool pruning for the delegator
+
+The delegator's model sees every ``AgentTool`` and the description of every
+financial service in its instruction on each call, although most questions
+concern one or two of them. ``ToolPruner`` is a ``before_model_callback``
+that ranks the sub-agents by the pre-router's keyword scores (see
+delegator.router) and leaves only the ``top_k`` most relevant tools, and
+their lines in the instruction, in the request. Messages that match no
+sub-agent keep the full tool list, since the scorer cannot tell which one
+the model may need. ``DELEGATOR_TOOL_TOP_K=0`` turns pruning off.
+
+benchmarks/bench_tool_pruning.py measures the token savings and how often
+the labeled sub-agent survives pruning.
+"""
+
+import os
+
+from .router import PreRouter
+
+# Sub-agents left in a pruned request (0 keeps them all)
+TOOL_TOP_K = int(os.getenv("DELEGATOR_TOOL_TOP_K", 3))
+
+
+class ToolPruner:
+    """``before_model_callback`` that keeps only the most relevant sub-agent tools"""
+
+    def __init__(self, service_lines, top_k=None, router=None):
+        # Sub-agent name -> its line in the instruction
+        self.service_lines = dict(service_lines)
+        self.top_k = TOOL_TOP_K if top_k is None else top_k
+        self.router = router or PreRouter()
+
+    def select(self, message):
+        """Sub-agents to expose for ``message``, most relevant first, or None for all of them"""
+        if self.top_k <= 0:
+            return None
+        ranked = [agent for agent in self.router.ranked_agents(message) if agent in self.service_lines]
+        return ranked[:self.top_k] or None
+
+    def trim_instruction(self, instruction, keep):
+        """``instruction`` without the service lines of sub-agents not in ``keep``"""
+        for agent, line in self.service_lines.items():
+            if agent not in keep:
+                instruction = instruction.replace(line + "\n", "")
+        return instruction
+
+    def prune(self, llm_request, keep):
+        """Drop every sub-agent tool not in ``keep`` from ``llm_request`` in place"""
+        dropped = set(self.service_lines) - set(keep)
+        llm_request.tools_dict = {name: tool for name, tool in llm_request.tools_dict.items() if name not in dropped}
+        for tool in llm_request.config.tools or []:
+            if tool.function_declarations:
+                tool.function_declarations = [d for d in tool.function_declarations if d.name not in dropped]
+        if isinstance(llm_request.config.system_instruction, str):
+            llm_request.config.system_instruction = self.trim_instruction(llm_request.config.system_instruction, keep)
+
+    def __call__(self, callback_context, llm_request):
+        content = callback_context.user_content
+        message = "".join(part.text or "" for part in (content.parts if content and content.parts else []))
+        keep = self.select(message)
+        if keep is not None:
+            self.prune(llm_request, keep)
+        # None lets the (pruned) request go to the model
+        return None
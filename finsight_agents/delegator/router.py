@@ -0,0 +1,147 @@
+"""
+Local pre-router in front of the delegator LLM
+
+Every question to the delegator costs one model call just to pick the
+sub-agent (``AgentTool``) to hand it to, then another for the sub-agent
+itself. ``PreRouter`` makes that first choice locally when the answer is
+clear-cut: it scores the message against the rule-based agents' keyword
+table (``fallback_agent.INTENT_KEYWORDS``) extended with the vocabulary in
+``ROUTER_KEYWORDS``, using the same single-pass ``IntentMatcher``, and turns
+the scores into a confidence:
+
+    confidence = best score / (sum of all scores + ROUTER_PRIOR)
+
+so a lone keyword is trusted less than several agreeing ones, and a
+message that also matches other intents ("a loan to pay my taxes") is
+trusted less than one that matches only one. At or above
+``ROUTER_MIN_CONFIDENCE`` the message goes straight to the intent's
+sub-agent; anything else (and greetings or general questions, which have
+no sub-agent) still goes through the delegator.
+
+``evaluate`` reports the bypass rate and accuracy against a labeled set
+(``eval/data/routing.test.json``; see benchmarks/bench_router.py).
+"""
+
+import json
+import os
+from typing import NamedTuple, Optional
+
+from .fallback_agent import INTENT_KEYWORDS
+from .intents import IntentMatcher
+
+# Sub-agent that answers each intent
+INTENT_AGENTS = {
+    "loan": "loan_helper",
+    "investment": "investment_guide",
+    "tax": "tax_filing_helper",
+    "credit_score": "credit_score_improver",
+    "budget": "budget_planner",
+    "scam": "scam_detector",
+    "government_scheme": "gov_scheme_suggestor",
+    "credit_card": "credit_card_provider",
+}
+
+# Terms the sub-agents handle that the rule-based table lacks
+ROUTER_KEYWORDS = [
+    ("loan", ['emi', 'home loan', 'personal loan', 'education loan', 'car loan', 'interest rate', 'prepay',
+              'foreclose', 'refinance', 'lender']),
+    ("investment", ['mutual funds', 'elss', 'ppf', 'nps', 'equity', 'shares', 'index fund', 'retirement',
+                    'fixed deposit', 'gold', 'corpus']),
+    ("tax", ['income tax', 'old regime', 'new regime', 'hra', 'tds', 'form 16', 'refund', 'slab', 'capital gains']),
+    ("credit_score", ['credit history', 'credit utilization', 'credit rating', 'experian', 'equifax']),
+    ("budget", ['spend', 'spending', 'emergency fund', 'monthly expenses', 'salary', '50/30/20', 'save money']),
+    ("scam", ['otp', 'phishing', 'fake', 'kyc', 'upi fraud', 'ponzi', 'hacked', 'cheated']),
+    ("government_scheme", ['scheme', 'yojana', 'pm kisan', 'scholarship', 'sukanya', 'atal pension',
+                           'government', 'pmjdy']),
+    ("credit_card", ['annual fee', 'lounge', 'reward points', 'credit limit']),
+]
+
+# Confidence needed to skip the delegator (above 1 never skips it)
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", 0.6))
+
+# Keyword weight every message is assumed to carry for no intent in particular
+ROUTER_PRIOR = 0.5
+
+ROUTING_TEST_SET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "eval", "data", "routing.test.json")
+
+
+class Route(NamedTuple):
+    """Where a message goes; ``agent`` is None for the delegator"""
+
+    intent: str
+    agent: Optional[str]
+    confidence: float
+
+
+def _merge(*tables):
+    """One intent table from several, in first-seen intent order"""
+    merged = {}
+    for table in tables:
+        for intent, keywords in table:
+            merged.setdefault(intent, []).extend(keywords)
+    return list(merged.items())
+
+
+class PreRouter:
+    """Keyword scoring model that picks a sub-agent when it is confident"""
+
+    def __init__(self, table=None, agents=INTENT_AGENTS, min_confidence=None, prior=ROUTER_PRIOR):
+        self.matcher = IntentMatcher(table or _merge(INTENT_KEYWORDS, ROUTER_KEYWORDS))
+        self.agents = dict(agents)
+        self.min_confidence = ROUTER_MIN_CONFIDENCE if min_confidence is None else min_confidence
+        self.prior = prior
+
+    def classify(self, message):
+        """Best intent of ``message``, its confidence and the sub-agent to send it to"""
+        matches = self.matcher.match(message)
+        if not matches:
+            return Route("general", None, 0.0)
+        intent, score = matches[0]
+        confidence = score / (sum(score for _, score in matches) + self.prior)
+        agent = self.agents.get(intent) if confidence >= self.min_confidence else None
+        return Route(intent, agent, confidence)
+
+    def ranked_agents(self, message):
+        """Sub-agents of every intent ``message`` matches, best first"""
+        return [self.agents[intent] for intent, _ in self.matcher.match(message) if intent in self.agents]
+
+    def route(self, message):
+        """Name of the sub-agent that should answer ``message``, or None for the delegator"""
+        return self.classify(message).agent
+
+
+def load_cases(path=ROUTING_TEST_SET):
+    """``[(query, expected agent or None), ...]`` from a labeled routing set"""
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)["cases"]
+    return [(case["query"], case["agent"]) for case in cases]
+
+
+def evaluate(router, cases):
+    """
+    Bypass rate and accuracy of ``router`` on labeled ``(query, agent)`` cases
+
+    ``agent`` is None where only the delegator should answer. Returns a dict
+    with ``bypass_rate`` (share sent straight to a sub-agent),
+    ``bypass_accuracy`` (share of those sent to the right one),
+    ``accuracy`` (share of all cases that took the labeled path, so leaving
+    a clear-cut query to the delegator counts as a miss) and the
+    ``misrouted`` cases, which a wrong bypass sends to the wrong sub-agent.
+    """
+    routed = correct = 0
+    misrouted = []
+    for query, expected in cases:
+        agent = router.route(query)
+        correct += agent == expected
+        if agent:
+            routed += 1
+            if agent != expected:
+                misrouted.append((query, expected, agent))
+    return {
+        "cases": len(cases),
+        "bypass_rate": routed / len(cases) if cases else 0.0,
+        "bypass_accuracy": (routed - len(misrouted)) / routed if routed else 1.0,
+        "accuracy": correct / len(cases) if cases else 1.0,
+        "misrouted": misrouted,
+    }
@@ -1,5 +1,94 @@
+from typing import Optional
+
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+
+from ..web_search.agent import web_search
+from ...tools.cashflow import project_cashflow
+
+
+def project_budget(
+    monthly_income: float,
+    monthly_expenses: float,
+    emi_amounts: Optional[list[float]] = None,
+    emi_months_left: Optional[list[int]] = None,
+    monthly_sip: float = 0,
+    goal_names: Optional[list[str]] = None,
+    goal_costs: Optional[list[float]] = None,
+    goal_years: Optional[list[float]] = None,
+    years: int = 10,
+    inflation: float = 6,
+    annual_raise: float = 5,
+    sip_step_up: float = 0,
+    savings: float = 0,
+    investments: float = 0,
+) -> dict:
+    """Projects the user's cash, investments and net worth month by month over the coming years.
+
+    Income grows with a yearly raise, expenses with inflation, EMIs stop when
+    their tenure ends, SIPs grow at 12% a year and goals are paid from the
+    investments when they fall due.
+
+    Args:
+        monthly_income: Take-home monthly income in rupees.
+        monthly_expenses: Monthly living expenses (rent, food, bills, lifestyle), excluding EMIs and SIPs.
+        emi_amounts: Monthly EMI of each running loan.
+        emi_months_left: Months left on each loan, same order as emi_amounts.
+        monthly_sip: Amount invested every month through SIPs.
+        goal_names: Names of savings goals, e.g. ["Bike", "House down payment"].
+        goal_costs: Cost of each goal at today's prices, same order as goal_names.
+        goal_years: Years from now each goal is due, same order as goal_names.
+        years: Years to project, up to 30.
+        inflation: Yearly increase in expenses and goal costs, in percent.
+        annual_raise: Yearly salary increase, in percent.
+        sip_step_up: Yearly increase of the SIP amount, in percent.
+        savings: Cash the user has saved today.
+        investments: Value of the user's investments today.
+
+    Returns:
+        Year-end income, surplus, cash, investments and net worth, the first
+        month cash runs out (if it does) and whether each goal is funded.
+    """
+    emi_amounts, emi_months_left = emi_amounts or [], emi_months_left or []
+    goal_names, goal_costs, goal_years = goal_names or [], goal_costs or [], goal_years or []
+    if len(goal_names) != len(goal_costs) or len(goal_costs) != len(goal_years):
+        return {"status": "error", "message": "Every goal needs a name, cost and number of years"}
+    goal_months = [max(1, round(y * 12)) for y in goal_years]
+    try:
+        timeline = project_cashflow(
+            monthly_income, monthly_expenses, emi_amounts, emi_months_left, monthly_sip,
+            goal_costs, goal_months, months=min(max(int(years), 1), 30) * 12, inflation=inflation,
+            annual_raise=annual_raise, sip_step_up=sip_step_up, cash=savings, investments=investments,
+        )
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    year_end = slice(11, None, 12)
+    deficit = timeline.first_deficit_month
+    return {
+        "status": "success",
+        "year_end": [
+            {
+                "year": year,
+                "monthly_income": round(float(income)),
+                "monthly_surplus": round(float(surplus)),
+                "cash": round(float(cash)),
+                "investments": round(float(invested)),
+                "net_worth": round(float(worth)),
+            }
+            for year, (income, surplus, cash, invested, worth) in enumerate(zip(
+                timeline.income[year_end], timeline.surplus[year_end], timeline.cash[year_end],
+                timeline.investments[year_end], timeline.net_worth[year_end],
+            ), start=1)
+        ],
+        "cash_runs_out": f"month {deficit}" if deficit else "never",
+        # A goal is funded when the investments stay non-negative through its month
+        "goals_funded": {
+            name: "after the projection" if month > timeline.months
+            else "yes" if (timeline.investments[:month] >= 0).all() else "no"
+            for name, month in zip(goal_names, goal_months)
+        },
+    }
+
 
 budget_planner = Agent(
 name="budget_planner",
@@ -20,9 +109,11 @@ Savings goal or timeline (optional)
 
 If they respond, personalize the budget using that info.
 
+When they share income and expenses (and any EMIs, SIPs or goals), use the project_budget tool to show how their cash and investments grow year by year, when money runs short and which goals are funded. Quote its numbers instead of calculating yourself.
+
 If they don't, provide a basic 50/30/20 rule budget as a fallback.
 
-Use google_search to find up-to-date budgeting techniques suitable for Gen Z in India.
+Use the web_search tool to find up-to-date budgeting techniques suitable for Gen Z in India.
 
 Trusted sources:
 
@@ -48,5 +139,5 @@ Source: https://www.nerdwallet.com/article/finance/what-is-the-50-30-20-budget-r
 
 If the user asks about anything else, delegate to the manager agent.
 """,
-tools=[google_search]
+tools=[AgentTool(agent=web_search), project_budget]
 )
\ No newline at end of file
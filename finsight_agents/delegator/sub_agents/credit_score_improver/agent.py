@@ -1,7 +1,10 @@
 
 from datetime import datetime
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+
+from ..web_search.agent import web_search
+from ...tools.debt import plan_debt_repayment
 
 
 credit_score_improver = Agent(
@@ -11,9 +14,10 @@ credit_score_improver = Agent(
     instruction="""
     You help users understand how to improve their credit score (CIBIL or otherwise) all wrt INDIAN users and providers.
 
-    1. Use the google_search tool to find expert-backed tips.
+    1. Use the web_search tool to find expert-backed tips.
     2. Provide practical advice such as paying dues on time, reducing credit utilization, etc.
     3. Warn about harmful practices like taking multiple unsecured loans.
+    4. When the user lists debts (cards, loans) and what they can pay monthly, use the plan_debt_repayment tool and explain the cheapest strategy, its debt-free date and interest saved instead of just saying "pay more than the minimum".
 
     Suggested trusted sources:
     - https://www.cibil.com/
@@ -24,5 +28,5 @@ credit_score_improver = Agent(
     Example response:
     "To improve your credit score, maintain a credit utilization below 30% and avoid late payments. Source: https://www.cibil.com/"
     """,
-    tools=[google_search]
+    tools=[AgentTool(agent=web_search), plan_debt_repayment]
 )
\ No newline at end of file
@@ -1,5 +1,65 @@
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+
+from ..web_search.agent import web_search
+from ...tools.goals import plan_goals, sip_future_value, total_invested
+
+
+def plan_investment_goals(
+    goal_names: list[str],
+    target_amounts: list[float],
+    years: list[int],
+    expected_return: float = 12.0,
+    annual_step_up: float = 10.0,
+    inflation: float = 6.0,
+) -> dict:
+    """Computes the monthly SIP needed for each of the user's financial goals.
+
+    Targets are costs at today's prices; each is inflated over its own horizon
+    before solving. The SIP is raised by annual_step_up percent every year.
+
+    Args:
+        goal_names: Name of each goal, e.g. ["House down payment", "Retirement"].
+        target_amounts: Cost of each goal in today's rupees, same order as goal_names.
+        years: Years until each goal, same order as goal_names.
+        expected_return: Expected annual return in percent.
+        annual_step_up: Yearly increase of the SIP amount in percent (0 for a flat SIP).
+        inflation: Yearly inflation in percent used to grow the targets.
+
+    Returns:
+        Future cost, starting monthly SIP, total invested per goal and the total monthly SIP.
+    """
+    if not (len(goal_names) == len(target_amounts) == len(years)):
+        return {"status": "error", "message": "goal_names, target_amounts and years must have the same length"}
+    plan = plan_goals(target_amounts, years, expected_return, annual_step_up, inflation)
+    goals = [
+        {
+            "goal": name,
+            "years": int(years[i]),
+            "future_cost": round(float(plan["future_cost"][i])),
+            "monthly_sip": round(float(plan["monthly_sip"][i])),
+            "total_invested": round(float(plan["total_invested"][i])),
+        }
+        for i, name in enumerate(goal_names)
+    ]
+    return {"status": "success", "goals": goals, "total_monthly_sip": round(float(plan["total_monthly_sip"]))}
+
+
+def project_sip(monthly_amount: float, years: int, expected_return: float = 12.0, annual_step_up: float = 0.0) -> dict:
+    """Computes what a monthly SIP grows to, optionally stepped up every year.
+
+    Args:
+        monthly_amount: Starting monthly SIP in rupees.
+        years: Number of years the SIP runs.
+        expected_return: Expected annual return in percent.
+        annual_step_up: Yearly increase of the SIP amount in percent.
+
+    Returns:
+        Final corpus, total invested and the gains.
+    """
+    corpus = float(sip_future_value(monthly_amount, expected_return, years, annual_step_up))
+    invested = float(total_invested(monthly_amount, years, annual_step_up))
+    return {"status": "success", "corpus": round(corpus), "total_invested": round(invested), "gains": round(corpus - invested)}
 
 investment_guide = Agent(
 name="investment_guide",
@@ -24,7 +84,9 @@ If not, share general beginner-friendly investment options and clearly note that
 
 When preparing suggestions:
 
-Use the google_search tool to find current investment options.
+For goals ("₹50 lakh for a house in 10 years") use the plan_investment_goals tool, passing every goal the user mentions in one call, and quote the monthly SIP it returns. For "what will my SIP become" questions use the project_sip tool. Do not estimate these numbers yourself.
+
+Use the web_search tool to find current investment options.
 
 Explain what makes the option suitable for their profile.
 
@@ -48,5 +110,5 @@ Source: https://groww.in/mutual-funds/axis-bluechip-fund"
 
 If the user asks about anything else, delegate to the manager agent.
 """,
-tools=[google_search]
+tools=[AgentTool(agent=web_search), plan_investment_goals, project_sip]
 )
\ No newline at end of file
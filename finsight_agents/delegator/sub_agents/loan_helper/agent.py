@@ -1,5 +1,55 @@
+from typing import Optional
+
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+
+from ..web_search.agent import web_search
+from ...tools.debt import plan_debt_repayment
+from ...tools.loan import affordability_grid, emi
+
+
+def loan_affordability(
+    monthly_income: float,
+    existing_emis: float = 0,
+    dti_cap_percent: float = 40,
+    interest_rates: Optional[list[float]] = None,
+    tenures_years: Optional[list[int]] = None,
+    requested_amount: float = 0,
+) -> dict:
+    """Computes the largest loan a user can get for each interest rate and tenure.
+
+    Lenders cap all EMIs together (existing plus the new loan) at a share of
+    the monthly income; the maximum principal follows from the EMI formula.
+
+    Args:
+        monthly_income: Net monthly income in rupees.
+        existing_emis: EMIs the user already pays every month.
+        dti_cap_percent: Share of income all EMIs may take, usually 40-50.
+        interest_rates: Annual interest rates in percent to compare (default 8.5, 9.5, 11).
+        tenures_years: Loan tenures in years to compare (default 5, 10, 20, 30).
+        requested_amount: Loan amount the user asked for, if any, to check against the limits.
+
+    Returns:
+        Affordable EMI, maximum principal per rate and tenure, and the EMI of the requested amount.
+    """
+    rates = interest_rates or [8.5, 9.5, 11]
+    tenures = tenures_years or [5, 10, 20, 30]
+    grid = affordability_grid([monthly_income], rates, tenures, existing_emis, dti_cap_percent)
+    result = {
+        "status": "success",
+        "affordable_emi": round(float(grid["affordable_emi"][0, 0, 0])),
+        "max_principal": {
+            f"{rate:g}%": {f"{tenure:g} years": round(float(grid["max_principal"][0, i, j])) for j, tenure in enumerate(tenures)}
+            for i, rate in enumerate(rates)
+        },
+    }
+    if requested_amount:
+        emis = emi(requested_amount, [[r] for r in rates], tenures)
+        result["requested_amount_emi"] = {
+            f"{rate:g}%": {f"{tenure:g} years": round(float(emis[i, j])) for j, tenure in enumerate(tenures)}
+            for i, rate in enumerate(rates)
+        }
+    return result
 
 
 loan_helper = Agent(
@@ -9,7 +59,9 @@ loan_helper = Agent(
     instruction="""
     You assist users in finding and comparing different types of loans like personal, education, or home loans wrt INDIAN users and providers.
 
-    1. Use the google_search tool to find interest rates, loan amounts, tenure, and eligibility.
+    1. Use the web_search tool to find interest rates, loan amounts, tenure, and eligibility.
+    When the user shares their income, use the loan_affordability tool (with the rates you found, if any) to tell them how much they can borrow and whether a requested amount fits. Quote its numbers instead of calculating yourself.
+    When the user has several loans or cards to pay off or asks about prepaying, use the plan_debt_repayment tool to compare avalanche, snowball and their own order.
     2. Compare and present options based on user preference (e.g., low interest, longer tenure).
     3. Mention any government-backed or low-interest loan schemes.
 
@@ -22,5 +74,5 @@ loan_helper = Agent(
     Example response:
     "SBI offers education loans up to ₹20 lakhs at 9.55 percent interest. Source: https://www.sbi.co.in/"
     """,
-    tools=[google_search]
+    tools=[AgentTool(agent=web_search), loan_affordability, plan_debt_repayment]
 )
\ No newline at end of file
@@ -1,6 +1,57 @@
 
 from google.adk.agents import Agent
-from google.adk.tools import google_search
+from google.adk.tools.agent_tool import AgentTool
+
+from ..web_search.agent import web_search
+from ...tools.tax import LATEST_YEAR, REGIMES, compare_regimes, income_tax
+
+
+def compare_tax_regimes(
+    annual_income: float,
+    age: int = 30,
+    section_80c: float = 0,
+    section_80d: float = 0,
+    section_80d_parents: float = 0,
+    home_loan_interest_24b: float = 0,
+    nps_80ccd_1b: float = 0,
+    assessment_year: str = LATEST_YEAR,
+) -> dict:
+    """Computes Indian income tax on a gross annual salary under the old and new regimes.
+
+    Deductions (80C, 80D, 24(b) home loan interest, 80CCD(1B) NPS) only apply
+    to the old regime and are capped at their legal limits. The standard
+    deduction, 87A rebate, surcharge and 4% cess are applied automatically.
+
+    Args:
+        annual_income: Gross annual salary in rupees.
+        age: Age of the taxpayer (60+ and 80+ get higher old-regime exemptions).
+        section_80c: Amount invested under section 80C (PPF, ELSS, EPF, ...).
+        section_80d: Health insurance premium for self and family.
+        section_80d_parents: Health insurance premium paid for parents.
+        home_loan_interest_24b: Interest paid on a self-occupied home loan.
+        nps_80ccd_1b: Own NPS contribution under section 80CCD(1B).
+        assessment_year: One of AY2024-25, AY2025-26, AY2026-27.
+
+    Returns:
+        Liability and breakdown under each regime and the cheaper regime.
+    """
+    if assessment_year not in REGIMES:
+        return {"status": "error", "message": f"Supported years: {', '.join(REGIMES)}"}
+    deductions = {
+        "80c": section_80c,
+        "80d": section_80d,
+        "80d_parents": section_80d_parents,
+        "24b": home_loan_interest_24b,
+        "80ccd_1b": nps_80ccd_1b,
+    }
+    result = {"status": "success", "assessment_year": assessment_year}
+    for regime in ("old", "new"):
+        breakdown = income_tax(annual_income, regime, assessment_year, age, deductions)
+        result[f"{regime}_regime"] = {name: round(float(value)) for name, value in breakdown.items()}
+    comparison = compare_regimes(annual_income, assessment_year, age, deductions)
+    result["better_regime"] = str(comparison["better"])
+    result["saving"] = round(float(comparison["saving"]))
+    return result
 
 
 tax_filing_helper = Agent(
@@ -11,9 +62,10 @@ tax_filing_helper = Agent(
 You are a helpful tax assistant who guides users on filing income tax returns in India. You assist with topics like ITR forms, deductions, deadlines, documentation, and where/how to file.
 
 When asked about tax filing:
-1. Use the google_search tool to fetch updated and reliable tax-related information.
-2. Summarize key points such as form type, due dates, documentation, and steps to file online.
-3. Prioritize official and reputable sources.
+1. For "how much tax will I pay" or "old vs new regime" questions, use the compare_tax_regimes tool with the user's salary, age and deductions. Report its numbers exactly instead of searching for them.
+2. Use the web_search tool to fetch updated and reliable tax-related information.
+3. Summarize key points such as form type, due dates, documentation, and steps to file online.
+4. Prioritize official and reputable sources.
 
 Suggested trusted sources:
 - https://www.incometax.gov.in/
@@ -31,5 +83,5 @@ Source: https://www.incometax.gov.in/"
 If the user asks about anything else, 
 you should delegate the task to the manager agent.
 """,
-    tools=[google_search]
+    tools=[AgentTool(agent=web_search), compare_tax_regimes]
 )
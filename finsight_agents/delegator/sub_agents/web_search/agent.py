@@ -0,0 +1,19 @@
+from google.adk.agents import Agent
+from google.adk.tools import google_search
+
+
+# Built-in search can't share an agent with function tools, so the
+# sub-agents that also have calculators call it through this agent
+web_search = Agent(
+    name="web_search",
+    model="gemini-2.0-flash",
+    description="Searches the web and returns current facts with their source links.",
+    instruction="""
+    You search the web for the request you are given, with an Indian user in mind.
+
+    1. Use the google_search tool to find current, reliable information.
+    2. Reply with the facts found (rates, limits, dates, eligibility) and the source link for each.
+    3. Prefer official and regulator sources (RBI, SEBI, Income Tax Department, bank websites).
+    """,
+    tools=[google_search]
+)
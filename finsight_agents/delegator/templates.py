@@ -0,0 +1,65 @@
+"""
+Precompiled response templates for the rule-based agents
+
+A ``Template`` is a response skeleton using ``str.format`` syntax
+(``{loan_amount:,}``), parsed once to check its slots and rendered with the
+bound ``format_map`` of its source, so filling it is a single C-level
+string build. ``TemplateSet.render`` takes the sections a branch chose and,
+the first time it sees that sequence, joins their sources into one such
+template, so every later response of that shape is built in one pass
+instead of growing a string with ``+=`` per section. The branch code only
+decides which sections apply and computes the values that go into them.
+"""
+
+from string import Formatter
+
+
+def _slots(name, source):
+    """Slot names of ``source``, in order; only plain names are allowed"""
+    slots = []
+    for _, field, spec, _ in Formatter().parse(source):
+        if field is None:
+            continue
+        if not field.isidentifier():
+            raise ValueError(f"Template {name!r}: slots must be plain names, got {{{field}}}")
+        if spec and any(char in spec for char in "{}"):
+            raise ValueError(f"Template {name!r}: unsupported format spec for {{{field}}}: {spec!r}")
+        slots.append(field)
+    return tuple(dict.fromkeys(slots))
+
+
+class Template:
+    """A response skeleton rendered with one ``str.format_map`` call"""
+
+    __slots__ = ("name", "source", "slots", "_render")
+
+    def __init__(self, source, name="template"):
+        self.name = name
+        self.source = source
+        self.slots = _slots(name, source)
+        self._render = source.format_map
+
+    def render(self, values):
+        """The template filled from the ``values`` mapping"""
+        return self._render(values)
+
+
+class TemplateSet:
+    """Named templates rendered as compiled sequences of sections"""
+
+    def __init__(self, sources):
+        self.templates = {name: Template(source, name) for name, source in sources.items()}
+        # Section sequence -> one compiled template covering all of it
+        self._layouts = {}
+
+    def __getitem__(self, name):
+        return self.templates[name]
+
+    def render(self, sections, values=None):
+        """Render ``sections`` (template names) in order as one string"""
+        sections = tuple(sections)
+        layout = self._layouts.get(sections)
+        if layout is None:
+            source = "".join(self.templates[name].source for name in sections)
+            layout = self._layouts[sections] = Template(source, "+".join(sections))._render
+        return layout(values or {})
@@ -0,0 +1,7 @@
+"""
+Deterministic financial calculators shared by the agents and servers
+
+Each module is plain NumPy so the rule-based servers can use it directly,
+batch jobs can evaluate whole grids in one call, and the ADK sub-agents
+can expose thin wrappers as function tools.
+"""
@@ -0,0 +1,134 @@
+"""
+Vectorized month-by-month cashflow projection
+
+``project_cashflow`` lays a household's money out over a horizon of months:
+income grows with a yearly raise, living expenses grow with inflation,
+EMIs run until their remaining tenure ends, SIPs step up once a year and
+goals (priced in today's money) are paid from the investments when they
+fall due. Every series is built directly from the month index, and the
+cash and investment balances come from cumulative sums, so there is no
+Python loop over months; a 30-year (360 month) projection takes well under
+a millisecond.
+
+The result is a ``Timeline`` of one array per series, one entry per month.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+MONTHS = 360
+
+
+@dataclass(frozen=True)
+class Timeline:
+    """Monthly cashflow series; entry ``m`` is month ``m + 1``"""
+
+    income: np.ndarray
+    expenses: np.ndarray
+    emis: np.ndarray
+    sips: np.ndarray
+    # Goal costs paid from the investments, inflated to the month they fall due
+    goals: np.ndarray
+    # Income left after expenses, EMIs and SIPs
+    surplus: np.ndarray
+    # Balances at the end of each month
+    cash: np.ndarray
+    investments: np.ndarray
+
+    @property
+    def months(self):
+        return len(self.income)
+
+    @property
+    def net_worth(self):
+        return self.cash + self.investments
+
+    @property
+    def first_deficit_month(self):
+        """First month (1-based) the cash balance goes negative, or None"""
+        negative = np.flatnonzero(self.cash < 0)
+        return int(negative[0]) + 1 if len(negative) else None
+
+    @property
+    def first_goal_shortfall_month(self):
+        """First month (1-based) a goal needs more than the investments hold, or None"""
+        short = np.flatnonzero(self.investments < 0)
+        return int(short[0]) + 1 if len(short) else None
+
+
+def _by_month(amounts, months, horizon):
+    """Total of ``amounts`` falling due in each month (``months`` are 1-based)"""
+    months = np.asarray(months, dtype=int) - 1
+    amounts = np.asarray(amounts, dtype=float)
+    inside = (months >= 0) & (months < horizon)
+    return np.bincount(months[inside], weights=amounts[inside], minlength=horizon)
+
+
+def project_cashflow(monthly_income, monthly_expenses, emi_amounts=(), emi_months=(), monthly_sip=0.0,
+                     goal_costs=(), goal_months=(), months=MONTHS, inflation=6.0, annual_raise=5.0,
+                     sip_step_up=0.0, expected_return=12.0, cash=0.0, investments=0.0):
+    """
+    Project cash and investment balances month by month
+
+    ``monthly_expenses`` are living costs at today's prices (EMIs and SIPs
+    excluded). Each EMI in ``emi_amounts`` is paid for its ``emi_months``
+    remaining months. ``monthly_sip`` is invested at the start of every
+    month at ``expected_return`` (percent a year, compounded monthly) and
+    raised by ``sip_step_up`` percent a year. Each goal's cost in today's
+    money is inflated to ``goal_months`` (1-based) and paid from the
+    investments; an unfunded goal shows as negative investments. Surplus
+    income accumulates as cash without interest.
+    """
+    if len(emi_amounts) != len(emi_months) or len(goal_costs) != len(goal_months):
+        raise ValueError("Every EMI needs its remaining months and every goal its month")
+    month = np.arange(months)
+    year = month // 12
+    income = monthly_income * np.power(1.0 + annual_raise / 100.0, year)
+    expenses = monthly_expenses * np.power(1.0 + inflation / 100.0, year)
+    # Each EMI stops once its remaining months run out
+    emis = (np.asarray(emi_amounts, dtype=float)[:, None] * (month < np.asarray(emi_months)[:, None])).sum(axis=0)
+    sips = monthly_sip * np.power(1.0 + sip_step_up / 100.0, year)
+    goal_months = np.asarray(goal_months, dtype=int)
+    goals = _by_month(
+        np.asarray(goal_costs, dtype=float) * np.power(1.0 + inflation / 100.0, (goal_months - 1) / 12.0),
+        goal_months, months,
+    )
+    surplus = income - expenses - emis - sips
+
+    # Money added at the start of month k is worth growth ** (m - k + 1) at
+    # the end of month m, so the balance is a discounted cumulative sum
+    growth = 1.0 + expected_return / 1200.0
+    compounded = np.power(growth, month + 1)
+    balance = compounded * (investments + np.cumsum((sips - goals) / np.power(growth, month)))
+    return Timeline(
+        income=income,
+        expenses=expenses,
+        emis=emis,
+        sips=sips,
+        goals=goals,
+        surplus=surplus,
+        cash=cash + np.cumsum(surplus),
+        investments=balance,
+    )
+
+
+def _money(value, currency):
+    # Round first so a tiny negative such as -1e-12 prints as ₹0, not -₹0
+    value = int(round(value))
+    return f"-{currency}{-value:,}" if value < 0 else f"{currency}{value:,}"
+
+
+def cashflow_table(timeline, years=(1, 3, 5, 10, 20, 30), currency="₹"):
+    """Markdown snapshot of a ``Timeline`` at the end of selected years"""
+    lines = [
+        "| Year | Monthly income | Monthly surplus | Cash saved | Investments | Net worth |",
+        "|---|---|---|---|---|---|",
+    ]
+    for year in years:
+        m = year * 12 - 1
+        if m >= timeline.months:
+            break
+        row = (timeline.income[m], timeline.surplus[m], timeline.cash[m], timeline.investments[m], timeline.net_worth[m])
+        lines.append(f"| {year} | " + " | ".join(_money(value, currency) for value in row) + " |")
+    return "\n".join(lines)
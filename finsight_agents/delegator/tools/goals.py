@@ -0,0 +1,91 @@
+"""
+Vectorized SIP and goal-planning math
+
+SIPs are invested at the start of every month and the expected annual
+return is compounded monthly (``rate / 12``), the convention Indian SIP
+calculators use. A step-up SIP raises the monthly amount once a year by
+``step_up`` percent. Its future value has a closed form: every year's
+twelve instalments grow like a plain SIP to the end of that year, and the
+years form a geometric series, so no function loops over months. All
+arguments broadcast, so many goals (or many users) are solved in one call.
+"""
+
+import numpy as np
+
+
+def _rates(annual_return, years):
+    monthly = np.asarray(annual_return, dtype=float) / 1200.0
+    years = np.rint(np.asarray(years, dtype=float))
+    return monthly, years
+
+
+def _annuity_due(monthly, months):
+    """Value after ``months`` of 1 invested at the start of every month"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = (np.power(1.0 + monthly, months) - 1.0) / monthly * (1.0 + monthly)
+    return np.where(monthly == 0, months, value)
+
+
+def _step_up_factor(monthly, years, step_up):
+    """Future value of a step-up SIP that starts at 1 per month"""
+    growth = np.asarray(step_up, dtype=float) / 100.0 + 1.0
+    # Growth of money over one year, and of one year's instalments to its end
+    year = np.power(1.0 + monthly, 12.0)
+    first_year = _annuity_due(monthly, 12.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = (np.power(year, years) - np.power(growth, years)) / (year - growth)
+    # year == growth makes every term equal
+    equal = np.isclose(year, growth)
+    series = np.where(equal, years * np.power(year, np.maximum(years - 1.0, 0.0)), series)
+    return first_year * series
+
+
+def sip_future_value(monthly_amount, annual_return, years, step_up=0.0):
+    """Corpus after ``years`` of a SIP raised by ``step_up`` percent every year"""
+    monthly, years = _rates(annual_return, years)
+    return np.asarray(monthly_amount, dtype=float) * _step_up_factor(monthly, years, step_up)
+
+
+def total_invested(monthly_amount, years, step_up=0.0):
+    """Sum of all instalments of a step-up SIP"""
+    years = np.rint(np.asarray(years, dtype=float))
+    growth = np.asarray(step_up, dtype=float) / 100.0 + 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        series = (np.power(growth, years) - 1.0) / (growth - 1.0)
+    series = np.where(growth == 1.0, years, series)
+    return np.asarray(monthly_amount, dtype=float) * 12.0 * series
+
+
+def required_sip(target, annual_return, years, step_up=0.0, current_savings=0.0):
+    """
+    Starting monthly SIP that reaches ``target`` in ``years``
+
+    ``current_savings`` are invested now as a lump sum at the same return;
+    goals they already cover need no SIP (0).
+    """
+    monthly, years = _rates(annual_return, years)
+    grown = np.asarray(current_savings, dtype=float) * np.power(1.0 + monthly, years * 12.0)
+    shortfall = np.maximum(np.asarray(target, dtype=float) - grown, 0.0)
+    return shortfall / _step_up_factor(monthly, years, step_up)
+
+
+def plan_goals(targets, years, annual_return=12.0, step_up=10.0, inflation=6.0, current_savings=0.0):
+    """
+    Monthly SIP needed for each goal, in today's money
+
+    ``targets`` are costs at today's prices; each is inflated over its own
+    horizon before solving. Returns a dict of arrays: ``future_cost``,
+    ``monthly_sip`` (first-year amount), ``total_invested`` and ``gains``,
+    plus ``total_monthly_sip`` summed over the last axis (the goals).
+    """
+    years = np.rint(np.asarray(years, dtype=float))
+    future_cost = np.asarray(targets, dtype=float) * np.power(1.0 + np.asarray(inflation, dtype=float) / 100.0, years)
+    sip = required_sip(future_cost, annual_return, years, step_up, current_savings)
+    invested = total_invested(sip, years, step_up)
+    return {
+        "future_cost": future_cost,
+        "monthly_sip": sip,
+        "total_invested": invested,
+        "gains": future_cost - invested - np.asarray(current_savings, dtype=float),
+        "total_monthly_sip": sip.sum(axis=-1),
+    }
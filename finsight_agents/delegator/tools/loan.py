@@ -0,0 +1,144 @@
+"""
+Vectorized EMI and amortization engine
+
+Every function broadcasts its arguments with NumPy, so one call prices a
+single loan, a batch of applicants (equal-length arrays) or a whole
+principals x rates x tenures grid (see ``emi_grid``). The affordability
+solver inverts the EMI formula the same way, from an income and an EMI
+cap to the largest principal. Rates are annual percentages and tenures
+are in years; payments and incomes are monthly.
+"""
+
+import numpy as np
+
+
+def _monthly(annual_rate, years):
+    rate = np.asarray(annual_rate, dtype=float) / 1200.0
+    months = np.rint(np.asarray(years, dtype=float) * 12)
+    return rate, months
+
+
+def emi(principal, annual_rate, years):
+    """Monthly instalment; broadcasts over all three arguments"""
+    principal = np.asarray(principal, dtype=float)
+    rate, months = _monthly(annual_rate, years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.power(1.0 + rate, months)
+        amortized = principal * rate * growth / (growth - 1.0)
+    # Interest-free loans divide the principal evenly
+    return np.where(rate == 0, principal / months, amortized)
+
+
+def emi_grid(principals, rates, tenures):
+    """
+    EMI, total payment and total interest for every combination
+
+    Returns a dict of arrays shaped ``(len(principals), len(rates),
+    len(tenures))``.
+    """
+    principals = np.asarray(principals, dtype=float)[:, None, None]
+    rates = np.asarray(rates, dtype=float)[None, :, None]
+    tenures = np.asarray(tenures, dtype=float)[None, None, :]
+    instalment = emi(principals, rates, tenures)
+    total = instalment * np.rint(tenures * 12)
+    return {"emi": instalment, "total_payment": total, "total_interest": total - principals}
+
+
+def amortization(principal, annual_rate, years):
+    """
+    Month-by-month schedule in closed form, without a Python loop
+
+    Returns a dict of arrays shaped ``broadcast_shape + (max_months,)``:
+    ``payment``, ``interest``, ``principal`` and the ``balance`` after each
+    payment. Months beyond a loan's own tenure are zero, so loans with
+    different tenures can share one schedule array.
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate, months = _monthly(annual_rate, years)
+    principal, rate, months = np.broadcast_arrays(principal, rate, months)
+    instalment = emi(principal, rate * 1200.0, months / 12.0)[..., None]
+
+    k = np.arange(1, int(months.max()) + 1, dtype=float)
+    p, r, n = principal[..., None], rate[..., None], months[..., None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_n = np.power(1.0 + r, n)
+        remaining = p * (growth_n - np.power(1.0 + r, k)) / (growth_n - 1.0)
+    balance = np.where(r == 0, p * (1.0 - k / n), remaining)
+    active = k <= n
+    balance = np.where(active, np.maximum(balance, 0.0), 0.0)
+    opening = np.concatenate([p, balance[..., :-1]], axis=-1)
+    interest = np.where(active, opening * r, 0.0)
+    payment = np.where(active, instalment, 0.0)
+    return {
+        "payment": payment,
+        "interest": interest,
+        "principal": payment - interest,
+        "balance": balance,
+    }
+
+
+def total_interest(principal, annual_rate, years):
+    """Interest paid over the life of the loan; broadcasts like ``emi``"""
+    _, months = _monthly(annual_rate, years)
+    return emi(principal, annual_rate, years) * months - np.asarray(principal, dtype=float)
+
+
+def comparison_table(principal, rates, tenures, currency="₹"):
+    """Markdown table of EMI (and total interest) for one principal"""
+    grid = emi_grid([principal], rates, tenures)
+    header = "| Rate | " + " | ".join(f"{t:g} yrs" for t in tenures) + " |"
+    lines = [header, "|" + "---|" * (len(tenures) + 1)]
+    for i, rate in enumerate(rates):
+        cells = [
+            f"{currency}{grid['emi'][0, i, j]:,.0f} (interest {currency}{grid['total_interest'][0, i, j]:,.0f})"
+            for j in range(len(tenures))
+        ]
+        lines.append(f"| {rate:g}% | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def max_principal(monthly_income, annual_rate, years, existing_emi=0.0, dti_cap=40.0):
+    """
+    Largest loan whose EMI keeps all EMIs within ``dti_cap`` percent of income
+
+    Lenders cap total EMIs (existing plus the new one) at a share of the
+    monthly income; the principal follows from inverting the EMI formula.
+    Broadcasts over all arguments; 0 when existing EMIs already use the cap.
+    """
+    affordable = np.maximum(
+        np.asarray(monthly_income, dtype=float) * np.asarray(dti_cap, dtype=float) / 100.0
+        - np.asarray(existing_emi, dtype=float),
+        0.0,
+    )
+    rate, months = _monthly(annual_rate, years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity = (1.0 - np.power(1.0 + rate, -months)) / rate
+    return affordable * np.where(rate == 0, months, annuity)
+
+
+def affordability_grid(monthly_incomes, rates, tenures, existing_emi=0.0, dti_cap=40.0):
+    """
+    Affordable EMI and maximum principal for every combination
+
+    Returns a dict of arrays shaped ``(len(monthly_incomes), len(rates),
+    len(tenures))``; ``existing_emi`` and ``dti_cap`` broadcast per income.
+    """
+    incomes = np.asarray(monthly_incomes, dtype=float)[:, None, None]
+    existing = np.broadcast_to(np.asarray(existing_emi, dtype=float), incomes.shape[:1])[:, None, None]
+    cap = np.broadcast_to(np.asarray(dti_cap, dtype=float), incomes.shape[:1])[:, None, None]
+    rates = np.asarray(rates, dtype=float)[None, :, None]
+    tenures = np.asarray(tenures, dtype=float)[None, None, :]
+    principal = max_principal(incomes, rates, tenures, existing, cap)
+    affordable = np.maximum(incomes * cap / 100.0 - existing, 0.0)
+    return {"affordable_emi": np.broadcast_to(affordable, principal.shape), "max_principal": principal}
+
+
+def affordability_table(monthly_income, rates, tenures, existing_emi=0.0, dti_cap=40.0, currency="₹"):
+    """Markdown table of the maximum principal for one income"""
+    grid = affordability_grid([monthly_income], rates, tenures, existing_emi, dti_cap)
+    header = "| Rate | " + " | ".join(f"{t:g} yrs" for t in tenures) + " |"
+    lines = [header, "|" + "---|" * (len(tenures) + 1)]
+    for i, rate in enumerate(rates):
+        cells = [f"{currency}{grid['max_principal'][0, i, j]:,.0f}" for j in range(len(tenures))]
+        lines.append(f"| {rate:g}% | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
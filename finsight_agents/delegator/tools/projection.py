@@ -0,0 +1,113 @@
+"""
+Vectorized Monte Carlo projection of an equity/debt portfolio
+
+``project`` simulates yearly returns for many paths at once: correlated
+normal draws per asset are turned into lognormal annual returns, the
+portfolio is rebalanced to its equity share every year, and each path's
+value (with optional yearly contributions) is computed from the running
+growth products without a Python loop over years. Paths are simulated in
+chunks until ``paths`` are done or ``budget_ms`` runs out, so the call can
+run inline in /chat with a bounded cost; the result says how many paths
+made it in.
+
+Draws come from a seeded generator, so the same question gets the same
+answer whenever all its paths fit in the budget; under load a projection
+may use fewer paths and its percentiles move slightly.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+# Simulated paths per projection and the wall-clock budget for simulating them
+PROJECTION_PATHS = int(os.getenv("PROJECTION_PATHS", 5000))
+PROJECTION_BUDGET_MS = float(os.getenv("PROJECTION_BUDGET_MS", 20))
+
+# Paths simulated between budget checks
+CHUNK_PATHS = 1000
+
+# Long-run annual return assumptions in percent: (mean, volatility)
+EQUITY = (12.0, 18.0)
+DEBT = (7.0, 4.0)
+CORRELATION = 0.1
+
+
+@dataclass(frozen=True)
+class Projection:
+    """Percentile outcomes of a simulated portfolio"""
+
+    amount: float
+    years: int
+    equity_share: float
+    p10: float
+    p50: float
+    p90: float
+    # Share of paths ending below the money put in
+    loss_probability: float
+    paths: int
+    elapsed_ms: float
+
+
+def _log_params(mean, volatility):
+    """Lognormal (mu, sigma) whose annual return has ``mean`` and ``volatility`` (percent)"""
+    m, s = 1.0 + mean / 100.0, volatility / 100.0
+    sigma2 = np.log1p((s / m) ** 2)
+    return np.log(m) - sigma2 / 2.0, np.sqrt(sigma2)
+
+
+def simulate(rng, paths, years, equity_share):
+    """Yearly portfolio growth factors, shaped ``(paths, years)``"""
+    (equity_mu, equity_sigma), (debt_mu, debt_sigma) = _log_params(*EQUITY), _log_params(*DEBT)
+    shocks = rng.standard_normal((2, paths, years))
+    # Debt shocks correlated with the equity shocks at CORRELATION
+    debt_shocks = CORRELATION * shocks[0] + np.sqrt(1.0 - CORRELATION ** 2) * shocks[1]
+    equity_growth = np.exp(equity_mu + equity_sigma * shocks[0])
+    debt_growth = np.exp(debt_mu + debt_sigma * debt_shocks)
+    return equity_share * equity_growth + (1.0 - equity_share) * debt_growth
+
+
+def terminal_values(growth, amount, contribution=0.0):
+    """
+    Value at the end of the horizon for each path
+
+    ``amount`` is invested at the start and ``contribution`` is added at
+    the start of every year, so each deposit grows by the product of the
+    years left after it.
+    """
+    remaining = np.cumprod(growth[:, ::-1], axis=1)[:, ::-1]
+    return amount * remaining[:, 0] + contribution * remaining.sum(axis=1)
+
+
+def project(amount, years, equity_share, contribution=0.0, paths=None, budget_ms=None, seed=0):
+    """P10/P50/P90 value of ``amount`` after ``years`` at the given equity share"""
+    paths = PROJECTION_PATHS if paths is None else paths
+    budget_ms = PROJECTION_BUDGET_MS if budget_ms is None else budget_ms
+    years = max(1, int(round(years)))
+    rng = np.random.default_rng(seed)
+
+    started = time.perf_counter()
+    values = []
+    done = 0
+    while done < paths:
+        chunk = min(CHUNK_PATHS, paths - done)
+        values.append(terminal_values(simulate(rng, chunk, years, equity_share), amount, contribution))
+        done += chunk
+        # Always finish the first chunk, then stop once the budget is spent
+        if (time.perf_counter() - started) * 1000.0 >= budget_ms:
+            break
+    values = np.concatenate(values)
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    invested = amount + contribution * years
+    return Projection(
+        amount=float(amount),
+        years=years,
+        equity_share=float(equity_share),
+        p10=float(p10),
+        p50=float(p50),
+        p90=float(p90),
+        loss_probability=float(np.mean(values < invested)),
+        paths=done,
+        elapsed_ms=(time.perf_counter() - started) * 1000.0,
+    )
@@ -0,0 +1,276 @@
+"""
+Vectorized Indian income-tax engine (individuals, old vs new regime)
+
+Slab schedules, standard deductions, the section 87A rebate, surcharge
+bands and the 4% health and education cess are tabulated per assessment
+year in ``REGIMES``. Each slab schedule precomputes the tax due at every
+slab floor, so the tax on any income is one ``searchsorted`` plus a
+multiply-add. Every function broadcasts over its income (and age and
+deduction) arguments, so a whole payroll file is evaluated in one call.
+
+Incomes are gross annual salaries in rupees. The standard deduction is
+applied in both regimes; the old regime also allows the capped Chapter
+VI-A and house-property deductions in ``DEDUCTION_LIMITS``. Marginal
+relief is applied both where income just crosses the rebate limit (new
+regime) and where it crosses a surcharge threshold.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+CESS_RATE = 0.04
+
+
+class Slabs:
+    """Progressive slab schedule with the tax due at each slab floor precomputed"""
+
+    def __init__(self, slabs):
+        # ``slabs`` is ((floor, rate percent), ...) in increasing floor order
+        self.floors = np.array([floor for floor, _ in slabs], dtype=float)
+        self.rates = np.array([rate for _, rate in slabs], dtype=float) / 100.0
+        self.base = np.concatenate([[0.0], np.cumsum(np.diff(self.floors) * self.rates[:-1])])
+
+    def tax(self, taxable):
+        taxable = np.maximum(np.asarray(taxable, dtype=float), 0.0)
+        i = np.searchsorted(self.floors, taxable, side="right") - 1
+        return self.base[i] + (taxable - self.floors[i]) * self.rates[i]
+
+
+@dataclass(frozen=True)
+class Regime:
+    """One regime's rules for one assessment year"""
+
+    # Slabs for (below 60, 60 to 79, 80 and above)
+    slabs: tuple
+    standard_deduction: float
+    # Section 87A: full rebate of tax up to ``rebate`` when taxable income <= ``rebate_limit``
+    rebate_limit: float
+    rebate: float
+    # Tax just above the rebate limit is capped at the income above it
+    rebate_relief: bool
+    # ((threshold, rate percent), ...) on taxable income
+    surcharge: tuple
+    allows_deductions: bool
+
+
+_OLD_SLABS = (
+    Slabs(((0, 0), (250000, 5), (500000, 20), (1000000, 30))),
+    Slabs(((0, 0), (300000, 5), (500000, 20), (1000000, 30))),
+    Slabs(((0, 0), (500000, 20), (1000000, 30))),
+)
+_OLD_SURCHARGE = ((5000000, 10), (10000000, 15), (20000000, 25), (50000000, 37))
+# The new regime caps surcharge at 25%
+_NEW_SURCHARGE = ((5000000, 10), (10000000, 15), (20000000, 25))
+
+_OLD_REGIME = Regime(
+    slabs=_OLD_SLABS,
+    standard_deduction=50000,
+    rebate_limit=500000,
+    rebate=12500,
+    rebate_relief=False,
+    surcharge=_OLD_SURCHARGE,
+    allows_deductions=True,
+)
+
+
+def _same_for_all_ages(slabs):
+    slabs = Slabs(slabs)
+    return (slabs, slabs, slabs)
+
+
+REGIMES = {
+    # FY 2023-24
+    "AY2024-25": {
+        "old": _OLD_REGIME,
+        "new": Regime(
+            slabs=_same_for_all_ages(((0, 0), (300000, 5), (600000, 10), (900000, 15), (1200000, 20), (1500000, 30))),
+            standard_deduction=50000,
+            rebate_limit=700000,
+            rebate=25000,
+            rebate_relief=True,
+            surcharge=_NEW_SURCHARGE,
+            allows_deductions=False,
+        ),
+    },
+    # FY 2024-25
+    "AY2025-26": {
+        "old": _OLD_REGIME,
+        "new": Regime(
+            slabs=_same_for_all_ages(((0, 0), (300000, 5), (700000, 10), (1000000, 15), (1200000, 20), (1500000, 30))),
+            standard_deduction=75000,
+            rebate_limit=700000,
+            rebate=25000,
+            rebate_relief=True,
+            surcharge=_NEW_SURCHARGE,
+            allows_deductions=False,
+        ),
+    },
+    # FY 2025-26
+    "AY2026-27": {
+        "old": _OLD_REGIME,
+        "new": Regime(
+            slabs=_same_for_all_ages((
+                (0, 0), (400000, 5), (800000, 10), (1200000, 15), (1600000, 20), (2000000, 25), (2400000, 30),
+            )),
+            standard_deduction=75000,
+            rebate_limit=1200000,
+            rebate=60000,
+            rebate_relief=True,
+            surcharge=_NEW_SURCHARGE,
+            allows_deductions=False,
+        ),
+    },
+}
+
+LATEST_YEAR = "AY2026-27"
+
+# Old-regime deduction caps; 80D doubles for senior citizens
+DEDUCTION_LIMITS = {
+    "80c": 150000,
+    "80ccd_1b": 50000,
+    "80d": 25000,
+    "80d_parents": 25000,
+    "24b": 200000,
+}
+SENIOR_80D_LIMIT = 50000
+
+
+def _regime(year, regime):
+    try:
+        return REGIMES[year][regime]
+    except KeyError:
+        raise ValueError(
+            f"No tax table for {regime!r} regime in {year!r}; years: {', '.join(REGIMES)}"
+        ) from None
+
+
+def allowed_deductions(deductions, age=30, parents_senior=False):
+    """Total old-regime deductions after applying each section's cap"""
+    deductions = deductions or {}
+    unknown = set(deductions) - set(DEDUCTION_LIMITS)
+    if unknown:
+        raise ValueError(f"Unknown deductions: {', '.join(sorted(unknown))}")
+    age = np.asarray(age, dtype=float)
+    total = 0.0
+    for section, claimed in deductions.items():
+        limit = DEDUCTION_LIMITS[section]
+        if section == "80d":
+            limit = np.where(age >= 60, SENIOR_80D_LIMIT, limit)
+        elif section == "80d_parents" and parents_senior:
+            limit = SENIOR_80D_LIMIT
+        total = total + np.clip(np.asarray(claimed, dtype=float), 0.0, limit)
+    return total
+
+
+def _slab_tax(rules, taxable, age):
+    below_60, senior, super_senior = rules.slabs
+    if below_60 is senior is super_senior:
+        return below_60.tax(taxable)
+    return np.where(age >= 80, super_senior.tax(taxable), np.where(age >= 60, senior.tax(taxable), below_60.tax(taxable)))
+
+
+def income_tax(income, regime="new", year=LATEST_YEAR, age=30, deductions=None, parents_senior=False):
+    """
+    Tax on gross salary ``income`` under one regime
+
+    Returns a dict of arrays broadcast over the arguments:
+    ``taxable_income``, ``tax`` (slab tax), ``rebate``, ``surcharge``,
+    ``cess`` and ``total`` (the liability).
+    """
+    rules = _regime(year, regime)
+    income = np.asarray(income, dtype=float)
+    age = np.asarray(age, dtype=float)
+    taxable = income - rules.standard_deduction
+    if rules.allows_deductions:
+        taxable = taxable - allowed_deductions(deductions, age, parents_senior)
+    taxable = np.maximum(taxable, 0.0)
+
+    tax = _slab_tax(rules, taxable, age)
+    within_limit = taxable <= rules.rebate_limit
+    rebate = np.where(within_limit, np.minimum(tax, rules.rebate), 0.0)
+    if rules.rebate_relief:
+        # Tax may not exceed the income above the rebate limit
+        rebate = np.where(within_limit, rebate, np.maximum(tax - (taxable - rules.rebate_limit), 0.0))
+    after_rebate = tax - rebate
+
+    thresholds = np.array([0.0] + [t for t, _ in rules.surcharge])
+    rates = np.array([0.0] + [r for _, r in rules.surcharge]) / 100.0
+    # Surcharge applies once taxable income exceeds a threshold
+    band = np.maximum(np.searchsorted(thresholds, taxable, side="left") - 1, 0)
+    with_surcharge = after_rebate * (1.0 + rates[band])
+    # Marginal relief: crossing a threshold may cost no more than the income above it
+    at_threshold = _slab_tax(rules, thresholds[band], age) * (1.0 + rates[np.maximum(band - 1, 0)])
+    capped = np.where(band > 0, np.minimum(with_surcharge, at_threshold + taxable - thresholds[band]), with_surcharge)
+    surcharge = capped - after_rebate
+
+    cess = capped * CESS_RATE
+    return {
+        "taxable_income": taxable,
+        "tax": tax,
+        "rebate": rebate,
+        "surcharge": surcharge,
+        "cess": cess,
+        "total": capped + cess,
+    }
+
+
+def compare_regimes(income, year=LATEST_YEAR, age=30, deductions=None, parents_senior=False):
+    """
+    Liability under both regimes and which one is cheaper
+
+    ``deductions`` only apply to the old regime. Returns a dict of arrays:
+    ``old``, ``new``, ``better`` ("old" or "new"; ties go to the new
+    regime, the default) and ``saving`` under the better regime.
+    """
+    old = income_tax(income, "old", year, age, deductions, parents_senior)["total"]
+    new = income_tax(income, "new", year, age)["total"]
+    return {
+        "old": old,
+        "new": new,
+        "better": np.where(old < new, "old", "new"),
+        "saving": np.abs(old - new),
+    }
+
+
+def max_deductions(age=30, parents_senior=False):
+    """Most old-regime deductions anyone of ``age`` can claim, every section at its cap"""
+    return allowed_deductions({section: np.inf for section in DEDUCTION_LIMITS}, age, parents_senior)
+
+
+def breakeven_deductions(income, year=LATEST_YEAR, age=30, parents_senior=False, step=1000):
+    """
+    Old-regime deductions at which the old regime stops costing more
+
+    Searches every multiple of ``step`` up to ``max_deductions`` for each
+    age at once. NaN where even the most a taxpayer of that age can claim
+    leaves the new regime cheaper.
+    """
+    income = np.asarray(income, dtype=float)
+    age = np.asarray(age, dtype=float)
+    ceiling = max_deductions(age, parents_senior)
+    grid = np.arange(0.0, np.max(ceiling) + step, step)
+    new = income_tax(income, "new", year, age)["total"][..., None]
+    old = income_tax(income[..., None] - grid, "old", year, age[..., None])["total"]
+    cheaper = (old <= new) & (grid <= np.asarray(ceiling)[..., None])
+    found = cheaper.any(axis=-1)
+    return np.where(found, grid[np.argmax(cheaper, axis=-1)], np.nan)
+
+
+def regime_comparison_table(incomes, year=LATEST_YEAR, age=30, deductions=None, parents_senior=False,
+                            currency="₹"):
+    """Markdown table of old vs new regime liability for each income"""
+    incomes = np.atleast_1d(np.asarray(incomes, dtype=float))
+    comparison = compare_regimes(incomes, year, age, deductions, parents_senior)
+    breakeven = breakeven_deductions(incomes, year, age, parents_senior)
+    lines = [
+        "| Salary | New regime | Old regime (no deductions) | Better | Old regime breaks even at |",
+        "|---|---|---|---|---|",
+    ]
+    for i, income in enumerate(incomes):
+        even = "never" if np.isnan(breakeven[i]) else f"{currency}{breakeven[i]:,.0f} of deductions"
+        lines.append(
+            f"| {currency}{income:,.0f} | {currency}{comparison['new'][i]:,.0f} | {currency}{comparison['old'][i]:,.0f} "
+            f"| {comparison['better'][i]} (saves {currency}{comparison['saving'][i]:,.0f}) | {even} |"
+        )
+    return "\n".join(lines)
@@ -1,9 +1,26 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, WebSocket
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+import asyncio
 import os
 import logging
-import re
+import time
+from typing import List, Optional
+
+from delegator.entities import extract_entities, monthly_income
+from delegator.intents import IntentMatcher
+from delegator.templates import TemplateSet
+from delegator.tools.cashflow import cashflow_table, project_cashflow
+from delegator.tools.goals import sip_future_value
+from delegator.tools.loan import affordability_table, comparison_table, emi, max_principal
+from delegator.tools.projection import project
+from serving.batch import (
+    BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY, BATCH_MAX_SIZE, fan_out, ndjson_results,
+)
+from serving.canned import CannedResponses
+from serving.metrics import CONTENT_TYPE, MetricsMiddleware, ServerMetrics
+from serving.websocket import serve_chat_socket
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,115 +45,46 @@ class ChatResponse(BaseModel):
     response: str
     status: str = "success"
 
+class BatchChatRequest(BaseModel):
+    messages: List[ChatRequest]
+    concurrency: Optional[int] = None
+
 # Simple FinSight AI Agent Implementation
 class FinSightAIAgent:
     def __init__(self):
         self.name = "finsight-ai-local"
         self.description = "FinSight AI Financial Advisor - Local Development Server"
     
-    def _extract_amount(self, message):
-        """Extract monetary amount from message"""
-        # Look for patterns like $300,000 or 300000 or 300k
-        patterns = [
-            r'\$?([\d,]+(?:\.\d{2})?)',  # $300,000 or 300,000
-            r'(\d+)k',  # 300k
-            r'(\d+)\s*thousand',  # 300 thousand
-            r'(\d+)\s*million',  # 3 million
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, message.lower())
-            if matches:
-                amount_str = matches[0].replace(',', '')
-                try:
-                    amount = float(amount_str)
-                    if 'k' in message.lower():
-                        amount *= 1000
-                    elif 'million' in message.lower():
-                        amount *= 1000000
-                    return amount
-                except:
-                    continue
-        return None
-    
-    def _extract_age(self, message):
-        """Extract age from message"""
-        patterns = [
-            r"i'm (\d+)",
-            r"i am (\d+)",
-            r"(\d+) years old",
-            r"age (\d+)",
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, message.lower())
-            if matches:
-                try:
-                    return int(matches[0])
-                except:
-                    continue
-        return None
-    
-    def _extract_income(self, message):
-        """Extract income from message"""
-        patterns = [
-            r'earn \$?([\d,]+)',
-            r'salary \$?([\d,]+)',
-            r'income \$?([\d,]+)',
-            r'make \$?([\d,]+)',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, message.lower())
-            if matches:
-                try:
-                    return float(matches[0].replace(',', ''))
-                except:
-                    continue
-        return None
-    
-    def _extract_credit_score(self, message):
-        """Extract credit score from message"""
-        patterns = [
-            r'credit score.*?(\d{3})',
-            r'cibil.*?(\d{3})',
-            r'score.*?(\d{3})',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, message.lower())
-            if matches:
-                try:
-                    score = int(matches[0])
-                    if 300 <= score <= 850:  # Valid credit score range
-                        return score
-                except:
-                    continue
-        return None
-    
-    def _calculate_emi(self, principal, annual_rate, years):
-        """Calculate EMI for given principal, rate and tenure"""
-        monthly_rate = annual_rate / (12 * 100)
-        months = years * 12
-        if monthly_rate == 0:
-            return principal / months
-        
-        emi = principal * monthly_rate * (1 + monthly_rate)**months / ((1 + monthly_rate)**months - 1)
-        return emi
-        
-    def process_message(self, message):
-        """Process user message and return financial advice"""
-        msg_lower = message.lower()
-        
-        # Extract key financial details from message
-        loan_amount = self._extract_amount(message)
-        age = self._extract_age(message)
-        income = self._extract_income(message)
-        credit_score = self._extract_credit_score(message)
-        
-        # Greeting responses
-        if any(word in msg_lower for word in ['hello', 'hi', 'hey', 'greet', 'start', 'looking for', 'help me']):
-            return f"""
+    # (rates %, tenures in years) compared in the loan advisory per loan type
+    LOAN_SCENARIOS = {
+        "home": ([8.5, 9.0, 9.5], [10, 20, 30]),
+        "personal": ([11, 15, 20], [1, 3, 5, 7]),
+        "education": ([9, 12, 15], [5, 10, 15]),
+        "general": ([11, 15, 20], [1, 3, 5]),
+    }
+
+    # Most of the monthly income lenders let all EMIs together take, in percent
+    DTI_CAP = 40
+
+    # Yearly pay raise and cost inflation the budget projection assumes, in percent
+    BUDGET_RAISE = 8
+    BUDGET_INFLATION = 6
+
+    # (intent, keywords); the best-scoring intent picks the branch of
+    # process_message and earlier rows win ties
+    INTENT_KEYWORDS = [
+        ("greeting", ['hello', 'hi', 'hey', 'greet']),
+        ("loan", ['loan', 'mortgage', 'borrow', 'lending', 'emi']),
+        ("investment", ['invest', 'investment', 'mutual fund', 'sip', 'stock', 'portfolio', 'wealth building']),
+        ("credit_score", ['credit score', 'cibil', 'credit report', 'improve credit']),
+        ("budget", ['budget', 'save', 'savings', 'expense', 'planning', 'money management']),
+    ]
+    INTENT_MATCHER = IntentMatcher(INTENT_KEYWORDS)
+
+    # Answers that do not depend on the message, keyed by intent, so the
+    # server can pre-encode them once (see serving.canned)
+    CANNED_RESPONSES = {
+        "greeting": """
 🌟 **Welcome to FinSight AI Local Server!** 🌟
 
 Your comprehensive financial advisor is running locally! I specialize in:
@@ -157,30 +105,22 @@ Your comprehensive financial advisor is running locally! I specialize in:
 • "Create a budget for $6,000 monthly income"
 
 What financial guidance can I provide you today? 😊
-"""
+""",
+    }
 
-        # Loan-related queries
-        elif any(word in msg_lower for word in ['loan', 'mortgage', 'borrow', 'lending', 'emi']):
-            loan_type = "home" if "home" in msg_lower else "personal" if "personal" in msg_lower else "education" if "education" in msg_lower else "general"
-            
-            response = f"""
-🏠 **FinSight AI - {loan_type.title()} Loan Advisory** 🏠
+    # Response skeletons compiled once; process_message picks the sections
+    # that apply and fills them (see delegator.templates)
+    TEMPLATES = TemplateSet({
+        "loan_header": """
+🏠 **FinSight AI - {loan_type} Loan Advisory** 🏠
 
 **Your Loan Request Analysis:**
-"""
-            
-            if loan_amount:
-                response += f"• **Requested Amount:** ${loan_amount:,}\n"
-                if loan_amount >= 200000:
-                    response += f"• **Assessment:** Large loan - excellent credit score (750+) recommended\n"
-                elif loan_amount >= 50000:
-                    response += f"• **Assessment:** Moderate loan - good credit score (700+) sufficient\n"
-                else:
-                    response += f"• **Assessment:** Small loan - fair credit score (650+) acceptable\n"
-            
-            response += f"""
+""",
+        "loan_amount": "• **Requested Amount:** ${loan_amount:,}\n",
+        "loan_assessment": "• **Assessment:** {assessment}\n",
+        "loan_rates": """
 
-**Current {loan_type.title()} Loan Rates & Options:**
+**Current {loan_type} Loan Rates & Options:**
 
 **🏠 Home Loans:**
 • Interest: 8.5% - 9.5% per annum
@@ -199,18 +139,34 @@ What financial guidance can I provide you today? 😊
 • Tenure: Up to 15 years
 • Collateral-free up to $75,000
 • Moratorium during study period
-"""
-
-            if loan_amount:
-                monthly_emi = self._calculate_emi(loan_amount, 8.5, 20) if loan_type == "home" else self._calculate_emi(loan_amount, 15, 5)
-                response += f"""
+""",
+        "loan_emi": """
 
 **💰 EMI Calculation for ${loan_amount:,}:**
 • Estimated Monthly EMI: ${monthly_emi:,.2f}
-• Recommended Monthly Income: ${monthly_emi * 3:,.2f}+
-"""
-
-            response += """
+• Recommended Monthly Income: ${recommended_income:,.2f}+
+
+**📊 EMI by Rate and Tenure:**
+{comparison}
+""",
+        "loan_affordability": """
+
+**🧮 How Much Can You Borrow?**
+• **Monthly Income:** ${monthly_income:,.0f}
+• **Existing EMIs:** ${existing_emi:,.0f}
+• **Room for a New EMI:** ${affordable_emi:,.0f} (all EMIs within {dti_cap}% of income)
+• **Maximum Loan at {rate:g}% for {tenure} Years:** ${max_principal:,.0f}
+
+**📐 Maximum Loan by Rate and Tenure:**
+{affordability}
+""",
+        "loan_fits": """
+✅ Your requested ${loan_amount:,.0f} fits within this limit.
+""",
+        "loan_exceeds": """
+⚠️ Your requested ${loan_amount:,.0f} is above this limit - consider a longer tenure, a larger down payment or a co-applicant.
+""",
+        "loan_tips": """
 
 **💡 Pro Tips for Better Approval:**
 • Maintain credit score above 750
@@ -223,77 +179,54 @@ What financial guidance can I provide you today? 😊
 2. Compare rates from 3-4 lenders
 3. Get pre-approved before finalizing
 4. Negotiate processing fees
-"""
-            return response
-
-        # Investment queries
-        elif any(word in msg_lower for word in ['invest', 'investment', 'mutual fund', 'sip', 'stock', 'portfolio', 'wealth building']):
-            investment_amount = loan_amount if loan_amount else 10000  # Default if no amount specified
-            
-            response = f"""
+""",
+        "investment_header": """
 📈 **FinSight AI - Investment Strategy for ${investment_amount:,}** 📈
 
 **Your Investment Profile Analysis:**
-"""
-            
-            if age:
-                if age < 30:
-                    risk_profile = "Aggressive (80% Equity, 20% Debt)"
-                    time_horizon = "30+ years for retirement"
-                elif age < 40:
-                    risk_profile = "Moderate-Aggressive (70% Equity, 30% Debt)"
-                    time_horizon = "20+ years for retirement"
-                elif age < 50:
-                    risk_profile = "Moderate (60% Equity, 40% Debt)"
-                    time_horizon = "15+ years for retirement"
-                else:
-                    risk_profile = "Conservative (40% Equity, 60% Debt)"
-                    time_horizon = "10+ years for retirement"
-                
-                response += f"• **Age:** {age} years\n"
-                response += f"• **Recommended Risk Profile:** {risk_profile}\n"
-                response += f"• **Investment Horizon:** {time_horizon}\n"
-            
-            if investment_amount >= 100000:
-                response += f"• **Investment Category:** High-value portfolio\n"
-                response += f"• **Diversification:** 5-7 different funds recommended\n"
-            elif investment_amount >= 25000:
-                response += f"• **Investment Category:** Moderate portfolio\n"
-                response += f"• **Diversification:** 3-4 different funds recommended\n"
-            else:
-                response += f"• **Investment Category:** Starter portfolio\n"
-                response += f"• **Diversification:** 2-3 different funds recommended\n"
-
-            response += f"""
+""",
+        "investment_age": """• **Age:** {age} years
+• **Recommended Risk Profile:** {risk_profile}
+• **Investment Horizon:** {time_horizon}
+""",
+        "investment_category": """• **Investment Category:** {category}
+• **Diversification:** {funds} different funds recommended
+""",
+        "investment_allocation": """
 
 **💰 Strategic Allocation for ${investment_amount:,}:**
 
 **🏆 Recommended Fund Mix:**
-"""
-
-            if age and age < 35:
-                response += f"""
-• **Large Cap Funds:** ${int(investment_amount * 0.4):,} (40%) - Stable growth
-• **Mid/Small Cap:** ${int(investment_amount * 0.3):,} (30%) - High growth potential  
-• **International Funds:** ${int(investment_amount * 0.2):,} (20%) - Global exposure
-• **Debt Funds:** ${int(investment_amount * 0.1):,} (10%) - Stability
-"""
-            else:
-                response += f"""
-• **Large Cap Funds:** ${int(investment_amount * 0.5):,} (50%) - Stable growth
-• **Mid Cap Funds:** ${int(investment_amount * 0.2):,} (20%) - Moderate growth
-• **Debt Funds:** ${int(investment_amount * 0.2):,} (20%) - Stability
-• **ELSS (Tax Saving):** ${int(investment_amount * 0.1):,} (10%) - Tax benefits
-"""
-
-            monthly_sip = investment_amount / 12
-            response += f"""
+""",
+        "investment_mix_growth": """
+• **Large Cap Funds:** ${large_cap:,} (40%) - Stable growth
+• **Mid/Small Cap:** ${mid_small_cap:,} (30%) - High growth potential  
+• **International Funds:** ${international:,} (20%) - Global exposure
+• **Debt Funds:** ${debt:,} (10%) - Stability
+""",
+        "investment_mix_balanced": """
+• **Large Cap Funds:** ${large_cap:,} (50%) - Stable growth
+• **Mid Cap Funds:** ${mid_cap:,} (20%) - Moderate growth
+• **Debt Funds:** ${debt:,} (20%) - Stability
+• **ELSS (Tax Saving):** ${elss:,} (10%) - Tax benefits
+""",
+        "investment_projection": """
+
+**🎲 Monte Carlo Projection ({years} years, {paths:,} simulated market paths):**
+• **Equity / Debt Mix:** {equity_share:.0%} / {debt_share:.0%}
+• **Pessimistic (P10):** ${p10:,.0f}
+• **Median (P50):** ${p50:,.0f}
+• **Optimistic (P90):** ${p90:,.0f}
+• **Chance of Ending Below ${investment_amount:,.0f}:** {loss_probability:.0%}
+""",
+        "investment_sip": """
 
 **📅 SIP Strategy:**
 • **Monthly SIP Amount:** ${monthly_sip:,.2f}
 • **Expected Annual Return:** 12-15%
-• **10-Year Projected Value:** ${investment_amount * 3.2:,.2f}
-• **20-Year Projected Value:** ${investment_amount * 9.6:,.2f}
+• **10-Year Projected Value:** ${projected_10y:,.2f}
+• **20-Year Projected Value:** ${projected_20y:,.2f}
+• **20-Year Value with 10% Step-up:** ${projected_20y_step_up:,.2f}
 
 **🚀 Investment Action Plan:**
 1. **Emergency Fund First:** 6 months expenses
@@ -301,37 +234,17 @@ What financial guidance can I provide you today? 😊
 3. **Step-up SIP:** Increase by 10% annually
 4. **Stay Invested:** Don't panic in market dips
 5. **Annual Review:** Rebalance portfolio
-"""
-            return response
-
-        # Credit Score queries
-        elif any(word in msg_lower for word in ['credit score', 'cibil', 'credit report', 'improve credit']):
-            response = f"""
+""",
+        "credit_header": """
 📊 **FinSight AI - Credit Score Improvement** 📊
-"""
-
-            if credit_score:
-                if credit_score >= 750:
-                    assessment = "Excellent! You're in the top tier."
-                    action = "Maintain current habits and consider premium credit cards."
-                elif credit_score >= 700:
-                    assessment = "Good score! You qualify for most loans."
-                    action = "Fine-tune to reach 750+ for best rates."
-                elif credit_score >= 650:
-                    assessment = "Fair score. Room for improvement."
-                    action = "Focus on payment history and utilization."
-                else:
-                    assessment = "Needs significant improvement."
-                    action = "Urgent attention required on all factors."
-                
-                response += f"""
+""",
+        "credit_analysis": """
 **Your Credit Score Analysis:**
 • **Current Score:** {credit_score}
 • **Assessment:** {assessment}
 • **Action Plan:** {action}
-"""
-
-            response += f"""
+""",
+        "credit_guide": """
 
 **🎯 Credit Score Ranges:**
 • **750-850:** Excellent (Best rates & terms)
@@ -358,19 +271,15 @@ What financial guidance can I provide you today? 😊
 ✅ Diversify credit types (cards + loans)
 ✅ Keep utilization below 10%
 ✅ Regular monitoring & maintenance
-"""
-
-            if credit_score and credit_score < 700:
-                months_to_improve = max(3, (750 - credit_score) // 20)
-                response += f"""
+""",
+        "credit_timeline": """
 
 **📈 Your Improvement Timeline:**
 • **Target Score:** 750+
 • **Estimated Time:** {months_to_improve} months
 • **Monthly Progress:** +15-25 points (with consistent effort)
-"""
-
-            response += """
+""",
+        "credit_monitoring": """
 
 **🆓 Free Credit Monitoring:**
 • Annual Credit Report (official site)
@@ -378,32 +287,21 @@ What financial guidance can I provide you today? 😊
 • Banking apps with credit tracking
 
 Start improving today for better financial opportunities!
-"""
-            return response
-
-        # Budget Planning
-        elif any(word in msg_lower for word in ['budget', 'save', 'savings', 'expense', 'planning', 'money management']):
-            response = f"""
+""",
+        "budget_header": """
 💹 **FinSight AI - Smart Budget Planning** 💹
-"""
-
-            if income:
-                response += f"""
+""",
+        "budget_income": """
 **Your Income Analysis:**
 • **Monthly Income:** ${income:,}
 • **Recommended Budget Breakdown:**
-"""
-                needs = income * 0.50
-                wants = income * 0.30
-                savings = income * 0.20
-                
-                response += f"""
+""",
+        "budget_split": """
   - **Needs (50%):** ${needs:,.2f}
   - **Wants (30%):** ${wants:,.2f}  
   - **Savings (20%):** ${savings:,.2f}
-"""
-
-            response += f"""
+""",
+        "budget_guide": """
 
 **🎯 The 50-30-20 Rule:**
 • **50% Needs:** Rent, groceries, utilities, EMIs
@@ -443,19 +341,24 @@ Start improving today for better financial opportunities!
 • Cancel unused subscriptions
 • Buy generic brands
 • Plan bulk purchases
-"""
-
-            if income:
-                emergency_fund = income * 6
-                response += f"""
+""",
+        "budget_goals": """
 
 **🎯 Your Financial Goals:**
 • **Emergency Fund Target:** ${emergency_fund:,} (6 months expenses)
 • **Monthly Investment:** ${savings:,.2f}
-• **Annual Investment:** ${savings * 12:,.2f}
-"""
+• **Annual Investment:** ${annual_savings:,.2f}
+""",
+        "budget_cashflow": """
+
+**📈 Your Next {years} Years on This Budget:**
+Assuming {annual_raise}% yearly raises, {inflation}% inflation and the 20% savings invested as a SIP at 12% that grows with your pay:
+
+{table}
 
-            response += """
+• {outlook}
+""",
+        "budget_tools": """
 
 **📱 Budget Tracking Tools:**
 • Mint, YNAB, Personal Capital
@@ -463,12 +366,8 @@ Start improving today for better financial opportunities!
 • Simple Excel/Google Sheets
 
 Start budgeting today for financial freedom tomorrow!
-"""
-            return response
-
-        # Default response for general queries
-        else:
-            return f"""
+""",
+        "general": """
 🤖 **FinSight AI - Local Server Response** 🤖
 
 I noticed you asked: "{message}"
@@ -493,12 +392,262 @@ I noticed you asked: "{message}"
 **📍 Local Server Status:** ✅ Running on http://localhost:8000
 
 What specific financial topic would you like detailed guidance on? 💡
-"""
+""",
+    })
+
+    def intent(self, message):
+        """Intent whose branch answers ``message``"""
+        return self.INTENT_MATCHER.best(message)
+
+    def canned_key(self, message):
+        """Key of the canned answer for ``message``, or None if the answer is personalized"""
+        intent = self.intent(message)
+        return intent if intent in self.CANNED_RESPONSES else None
+
+    def process_message(self, message):
+        """Process user message and return financial advice"""
+        msg_lower = message.lower()
+        intent = self.intent(message)
+        if intent in self.CANNED_RESPONSES:
+            return self.CANNED_RESPONSES[intent]
+        
+        # Extract key financial details from message
+        entities = extract_entities(message)
+        loan_amount = entities.amount
+        age = entities.age
+        income = entities.income
+        credit_score = entities.credit_score
+        
+        # Loan-related queries
+        if intent == "loan":
+            loan_type = "home" if "home" in msg_lower else "personal" if "personal" in msg_lower else "education" if "education" in msg_lower else "general"
+            values = {"loan_type": loan_type.title(), "loan_amount": loan_amount}
+            sections = ["loan_header"]
+            
+            if loan_amount:
+                sections.append("loan_amount")
+                if loan_amount >= 200000:
+                    values["assessment"] = "Large loan - excellent credit score (750+) recommended"
+                elif loan_amount >= 50000:
+                    values["assessment"] = "Moderate loan - good credit score (700+) sufficient"
+                else:
+                    values["assessment"] = "Small loan - fair credit score (650+) acceptable"
+                sections.append("loan_assessment")
+            
+            sections.append("loan_rates")
+            # Rate and tenure behind the EMI estimate and the affordability verdict
+            rate, tenure = (8.5, 20) if loan_type == "home" else (15, 5)
+            rates, tenures = self.LOAN_SCENARIOS[loan_type]
+
+            if loan_amount:
+                monthly_emi = emi(loan_amount, rate, tenure)
+                values["monthly_emi"] = monthly_emi
+                values["recommended_income"] = monthly_emi * 3
+                values["comparison"] = comparison_table(loan_amount, rates, tenures, currency="$")
+                sections.append("loan_emi")
+
+            # With an income, solve for the largest loan the EMI cap allows
+            monthly = monthly_income(message)
+            if monthly:
+                existing_emi = entities.existing_emi or 0
+                limit = max_principal(monthly, rate, tenure, existing_emi, self.DTI_CAP)
+                values.update(
+                    monthly_income=monthly,
+                    existing_emi=existing_emi,
+                    dti_cap=self.DTI_CAP,
+                    affordable_emi=max(monthly * self.DTI_CAP / 100 - existing_emi, 0),
+                    rate=rate,
+                    tenure=tenure,
+                    max_principal=limit,
+                    affordability=affordability_table(
+                        monthly, rates, tenures, existing_emi, self.DTI_CAP, currency="$"
+                    ),
+                )
+                sections.append("loan_affordability")
+                if loan_amount:
+                    sections.append("loan_fits" if loan_amount <= limit else "loan_exceeds")
+
+            sections.append("loan_tips")
+            return self.TEMPLATES.render(sections, values)
+
+        # Investment queries
+        elif intent == "investment":
+            investment_amount = loan_amount if loan_amount else 10000  # Default if no amount specified
+            values = {"investment_amount": investment_amount}
+            sections = ["investment_header"]
+            horizon_years = 10
+            
+            if age:
+                if age < 30:
+                    risk_profile = "Aggressive (80% Equity, 20% Debt)"
+                    time_horizon = "30+ years for retirement"
+                    horizon_years = 30
+                elif age < 40:
+                    risk_profile = "Moderate-Aggressive (70% Equity, 30% Debt)"
+                    time_horizon = "20+ years for retirement"
+                    horizon_years = 20
+                elif age < 50:
+                    risk_profile = "Moderate (60% Equity, 40% Debt)"
+                    time_horizon = "15+ years for retirement"
+                    horizon_years = 15
+                else:
+                    risk_profile = "Conservative (40% Equity, 60% Debt)"
+                    time_horizon = "10+ years for retirement"
+                    horizon_years = 10
+                
+                values.update(age=age, risk_profile=risk_profile, time_horizon=time_horizon)
+                sections.append("investment_age")
+            
+            if investment_amount >= 100000:
+                values.update(category="High-value portfolio", funds="5-7")
+            elif investment_amount >= 25000:
+                values.update(category="Moderate portfolio", funds="3-4")
+            else:
+                values.update(category="Starter portfolio", funds="2-3")
+            sections += ["investment_category", "investment_allocation"]
+
+            if age and age < 35:
+                values.update(
+                    large_cap=int(investment_amount * 0.4),
+                    mid_small_cap=int(investment_amount * 0.3),
+                    international=int(investment_amount * 0.2),
+                    debt=int(investment_amount * 0.1),
+                )
+                sections.append("investment_mix_growth")
+                equity_share = 0.9
+            else:
+                values.update(
+                    large_cap=int(investment_amount * 0.5),
+                    mid_cap=int(investment_amount * 0.2),
+                    debt=int(investment_amount * 0.2),
+                    elss=int(investment_amount * 0.1),
+                )
+                sections.append("investment_mix_balanced")
+                equity_share = 0.8
+
+            # Simulated outcomes of the recommended mix over the asked (or retirement) horizon
+            projection = project(investment_amount, entities.years or horizon_years, equity_share)
+            values.update(
+                years=projection.years,
+                paths=projection.paths,
+                equity_share=equity_share,
+                debt_share=1 - equity_share,
+                p10=projection.p10,
+                p50=projection.p50,
+                p90=projection.p90,
+                loss_probability=projection.loss_probability,
+            )
+            sections.append("investment_projection")
+
+            # SIP corpus at the 12% low end of the expected return, flat and stepped up
+            monthly_sip = investment_amount / 12
+            projected = sip_future_value(monthly_sip, 12, [10, 20, 20], [0, 0, 10])
+            values.update(
+                monthly_sip=monthly_sip,
+                projected_10y=projected[0],
+                projected_20y=projected[1],
+                projected_20y_step_up=projected[2],
+            )
+            sections.append("investment_sip")
+            return self.TEMPLATES.render(sections, values)
+
+        # Credit Score queries
+        elif intent == "credit_score":
+            values = {"credit_score": credit_score}
+            sections = ["credit_header"]
+
+            if credit_score:
+                if credit_score >= 750:
+                    assessment = "Excellent! You're in the top tier."
+                    action = "Maintain current habits and consider premium credit cards."
+                elif credit_score >= 700:
+                    assessment = "Good score! You qualify for most loans."
+                    action = "Fine-tune to reach 750+ for best rates."
+                elif credit_score >= 650:
+                    assessment = "Fair score. Room for improvement."
+                    action = "Focus on payment history and utilization."
+                else:
+                    assessment = "Needs significant improvement."
+                    action = "Urgent attention required on all factors."
+                
+                values.update(assessment=assessment, action=action)
+                sections.append("credit_analysis")
+
+            sections.append("credit_guide")
+
+            if credit_score and credit_score < 700:
+                values["months_to_improve"] = max(3, (750 - credit_score) // 20)
+                sections.append("credit_timeline")
+
+            sections.append("credit_monitoring")
+            return self.TEMPLATES.render(sections, values)
+
+        # Budget Planning
+        elif intent == "budget":
+            values = {"income": income}
+            sections = ["budget_header"]
+
+            if income:
+                values.update(needs=income * 0.50, wants=income * 0.30, savings=income * 0.20)
+                sections += ["budget_income", "budget_split"]
+
+            sections.append("budget_guide")
+
+            if income:
+                values.update(emergency_fund=income * 6, annual_savings=values["savings"] * 12)
+                sections.append("budget_goals")
+
+                # Month-by-month run of this split over the asked (or a 10-year) horizon
+                years = min(entities.years or 10, 30)
+                timeline = project_cashflow(
+                    income, values["needs"] + values["wants"], monthly_sip=values["savings"], months=years * 12,
+                    inflation=self.BUDGET_INFLATION, annual_raise=self.BUDGET_RAISE, sip_step_up=self.BUDGET_RAISE,
+                )
+                deficit = timeline.first_deficit_month
+                if deficit:
+                    outlook = f"Costs outgrow your pay by month {deficit}; trim wants before then to stay on track"
+                else:
+                    outlook = (f"Raises outpace inflation, leaving ${timeline.cash[-1]:,.0f} of unspent income "
+                               f"on top of ${timeline.investments[-1]:,.0f} invested by year {years}")
+                values.update(
+                    years=years,
+                    annual_raise=self.BUDGET_RAISE,
+                    inflation=self.BUDGET_INFLATION,
+                    table=cashflow_table(timeline, years=sorted({1, 3, 5, years}), currency="$"),
+                    outlook=outlook,
+                )
+                sections.append("budget_cashflow")
+
+            sections.append("budget_tools")
+            return self.TEMPLATES.render(sections, values)
+
+        # Default response for general queries
+        else:
+            return self.TEMPLATES.render(["general"], {"message": message})
 
 # Initialize the agent
 financial_agent = FinSightAIAgent()
 logger.info(f"FinSight AI Local Agent initialized: {financial_agent.name}")
 
+# Static answers pre-encoded once for /chat
+canned_responses = CannedResponses.for_agent(financial_agent)
+
+# Prometheus metrics for /metrics
+metrics = ServerMetrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics, agent_label=lambda: "local")
+
+def process_message(message: str) -> str:
+    """Run the agent and record its latency by detected intent"""
+    intent = financial_agent.intent(message)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = financial_agent.process_message(message)
+        outcome = "ok"
+        return response
+    finally:
+        metrics.observe_agent_run("local", intent, "none", time.perf_counter() - started, outcome)
+
 @app.get("/")
 def health_check():
     return {
@@ -509,15 +658,47 @@ def health_check():
     }
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
+    canned_key = financial_agent.canned_key(request.message)
+    if canned_key:
+        return canned_responses.respond(canned_key, http_request.headers)
+
     try:
-        # Process the message through the agent
-        response = financial_agent.process_message(request.message)
+        # Process the message off the event loop, as /chat/batch does
+        response = await asyncio.to_thread(process_message, request.message)
         return ChatResponse(response=response)
     except Exception as e:
         logger.error(f"Error processing request: {e}")
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
+@app.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest):
+    if len(request.messages) > BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.messages)} > {BATCH_MAX_SIZE} messages",
+        )
+
+    async def answer(item: ChatRequest) -> str:
+        return await asyncio.to_thread(process_message, item.message)
+
+    limit = min(request.concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    return StreamingResponse(
+        ndjson_results(fan_out(request.messages, answer, limit=limit)),
+        media_type="application/x-ndjson",
+    )
+
+@app.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket):
+    async def answer(message: str) -> str:
+        return await asyncio.to_thread(process_message, message)
+
+    await serve_chat_socket(websocket, answer, metrics=metrics)
+
+@app.get("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
 @app.get("/agent-info")
 def agent_info():
     return {
@@ -545,6 +726,9 @@ if __name__ == "__main__":
     print("   - GET  /           - Health check")
     print("   - GET  /agent-info - Agent information")
     print("   - POST /chat       - Chat with agent")
+    print("   - POST /chat/batch - Answer many messages, streamed as NDJSON")
+    print("   - WS   /ws/chat    - Chat over one WebSocket per conversation")
+    print("   - GET  /metrics    - Prometheus metrics")
     print("💡 Use this URL in your frontend to connect!")
     
-    uvicorn.run("local_server:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("extra.local_server:app", host="0.0.0.0", port=8000, reload=True)
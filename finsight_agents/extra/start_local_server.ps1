@@ -5,6 +5,9 @@ Write-Host "🚀 FinSight AI Local Development Server" -ForegroundColor Green
 Write-Host "=======================================" -ForegroundColor Green
 Write-Host ""
 
+# Run from the project root so delegator\ and serving\ are importable
+Set-Location (Split-Path -Parent $PSScriptRoot)
+
 # Check if Python is installed
 try {
     $pythonVersion = python --version 2>&1
@@ -16,7 +19,7 @@ try {
 
 # Install dependencies
 Write-Host "📦 Installing dependencies..." -ForegroundColor Yellow
-pip install -r local_requirements.txt
+pip install -r extra\local_requirements.txt
 
 if ($LASTEXITCODE -eq 0) {
     Write-Host "✅ Dependencies installed successfully!" -ForegroundColor Green
@@ -41,4 +44,4 @@ Write-Host "🛑 Press Ctrl+C to stop the server" -ForegroundColor Red
 Write-Host ""
 
 # Start the server
-python local_server.py
+python -m extra.local_server
@@ -2,6 +2,9 @@
 echo Starting FinSight AI Local Server...
 echo.
 
+REM Run from the project root so delegator\ and serving\ are importable
+cd /d "%~dp0.."
+
 REM Check if Python is installed
 python --version >nul 2>&1
 if errorlevel 1 (
@@ -15,7 +18,7 @@ REM Check if requirements are installed
 pip show fastapi >nul 2>&1
 if errorlevel 1 (
     echo Installing dependencies...
-    pip install -r requirements_local.txt
+    pip install -r extra\requirements_local.txt
     if errorlevel 1 (
         echo Error: Failed to install dependencies
         pause
@@ -26,13 +29,13 @@ if errorlevel 1 (
 echo.
 echo 🚀 Starting FinSight AI Local Development Server...
 echo 📍 Server URL: http://localhost:8000
-echo 📋 Demo Page: frontend_demo.html
+echo 📋 Demo Page: extra\frontend_demo.html
 echo.
 echo Press Ctrl+C to stop the server
 echo.
 
 REM Start the server
-python local_server.py
+python -m extra.local_server
 
 echo.
 echo Server stopped.
@@ -3,6 +3,10 @@
 echo "Starting FinSight AI Local Server..."
 echo
 
+# The server imports the shared delegator/ and serving/ packages, so it
+# runs as a module from the project root
+cd "$(dirname "$0")/.."
+
 # Check if Python is installed
 if ! command -v python3 &> /dev/null; then
     echo "Error: Python 3 is not installed"
@@ -20,7 +24,7 @@ fi
 # Check if requirements are installed
 if ! pip3 show fastapi &> /dev/null; then
     echo "Installing dependencies..."
-    pip3 install -r requirements_local.txt
+    pip3 install -r extra/requirements_local.txt
     if [ $? -ne 0 ]; then
         echo "Error: Failed to install dependencies"
         exit 1
@@ -30,13 +34,13 @@ fi
 echo
 echo "🚀 Starting FinSight AI Local Development Server..."
 echo "📍 Server URL: http://localhost:8000"
-echo "📋 Demo Page: frontend_demo.html"
+echo "📋 Demo Page: extra/frontend_demo.html"
 echo
 echo "Press Ctrl+C to stop the server"
 echo
 
 # Start the server
-python3 local_server.py
+python3 -m extra.local_server
 
 echo
 echo "Server stopped."
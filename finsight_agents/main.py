@@ -5,6 +5,7 @@ Supports both local development and cloud deployment
 
 import os
 import logging
+import time
 from typing import Any, Dict
 from dotenv import load_dotenv
 
@@ -15,14 +16,24 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cached at module scope so warm Cloud Functions instances reuse the agent
+# instead of re-importing it on every request
+_agent = None
+
 def create_app():
     """Create and configure the application"""
+    global _agent
+    if _agent is not None:
+        return _agent
     try:
-        # Import the delegator agent
+        # Import the delegator agent (deferred until the first request)
+        started = time.perf_counter()
         from delegator.agent import root_agent
+        logger.info(f"Agent {root_agent.name} loaded in {time.perf_counter() - started:.2f}s")
         
         # For cloud deployment, we need to return the agent
-        return root_agent
+        _agent = root_agent
+        return _agent
         
     except Exception as e:
         logger.error(f"Failed to create app: {e}")
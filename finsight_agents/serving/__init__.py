@@ -0,0 +1,7 @@
+"""
+Serving-layer helpers shared by the FinSight AI HTTP servers
+"""
+
+from .executor import AgentExecutor, ExecutorSaturated
+
+__all__ = ["AgentExecutor", "ExecutorSaturated"]
@@ -0,0 +1,72 @@
+"""
+Concurrent fan-out for the /chat/batch endpoints
+"""
+
+import asyncio
+import json
+import os
+import time
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+# Upper bound on the concurrency a client may ask for
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", 32))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 1000))
+# Seconds an item may spend waiting out rate limits before it fails
+BATCH_ITEM_DEADLINE = float(os.getenv("BATCH_ITEM_DEADLINE", 120))
+
+
+async def fan_out(items, worker, limit=BATCH_CONCURRENCY):
+    """
+    Run ``worker(item)`` for every item with at most ``limit`` in flight
+
+    Yields ``(index, result, error)`` tuples in completion order, so callers
+    can stream each answer as soon as it is ready. Pending work is cancelled
+    if the consumer stops early (e.g. the client disconnects).
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(index, item):
+        async with semaphore:
+            try:
+                return index, await worker(item), None
+            except Exception as e:
+                return index, None, e
+
+    tasks = [asyncio.ensure_future(run(i, item)) for i, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def retrying(call, retryable, deadline=BATCH_ITEM_DEADLINE):
+    """
+    Await ``call()``, sleeping each ``retryable`` error's ``retry_after`` and retrying
+
+    Gives up and re-raises the error once waiting would take the item past
+    ``deadline`` seconds, so one throttled user cannot hold a batch open.
+    """
+    give_up_at = time.monotonic() + deadline
+    while True:
+        try:
+            return await call()
+        except retryable as e:
+            if time.monotonic() + e.retry_after > give_up_at:
+                raise
+            await asyncio.sleep(e.retry_after)
+
+
+async def ndjson_results(results):
+    """Encode ``fan_out`` results as newline-delimited JSON lines"""
+    async for index, response, error in results:
+        if error is None:
+            line = {"index": index, "response": response, "status": "success"}
+        else:
+            line = {
+                "index": index,
+                "status": "error",
+                "detail": f"Error processing request: {str(error)}",
+            }
+        yield json.dumps(line, ensure_ascii=False) + "\n"
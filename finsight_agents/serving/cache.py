@@ -0,0 +1,164 @@
+"""
+Response cache for /chat
+
+Most traffic is a small set of repeated questions, so answers are cached
+under the normalized message plus the loaded agent's name and version.
+Entries expire after a per-intent TTL (scam alerts go stale faster than
+tax slabs) and the cache is a size-bounded LRU.
+"""
+
+import os
+import re
+import time
+from collections import OrderedDict
+
+from delegator.intents import IntentMatcher
+
+_NUMBER_SEPARATOR = re.compile(r"(?<=\d),(?=\d)")
+_PUNCTUATION = re.compile(r"[^\w\s₹$%.]|(?<!\d)\.|\.(?!\d)")
+_WHITESPACE = re.compile(r"\s+")
+
+DEFAULT_TTL = 3600
+
+# Seconds an answer stays fresh per intent
+DEFAULT_INTENT_TTLS = {
+    "scam": 600,
+    "investment": 1800,
+    "loan": 3600,
+    "credit_card": 3600,
+    "credit_score": 86400,
+    "tax": 86400,
+    "budget": 86400,
+    "government_scheme": 86400,
+    "greeting": 86400,
+}
+
+# Keywords that pick the TTL bucket of a message; earlier rows win ties, so
+# time-sensitive intents come first
+_INTENT_KEYWORDS = [
+    ("scam", ("scam", "fraud", "suspicious", "lottery", "prize", "otp")),
+    ("credit_score", ("credit score", "cibil", "credit report")),
+    ("credit_card", ("credit card", "cashback", "rewards")),
+    ("loan", ("loan", "mortgage", "borrow", "emi")),
+    ("tax", ("tax", "itr", "80c", "deduction")),
+    ("investment", ("invest", "mutual fund", "sip", "stock", "portfolio")),
+    ("government_scheme", ("scheme", "subsidy", "pmay", "mudra")),
+    ("budget", ("budget", "save", "savings", "expense")),
+    ("greeting", ("hello", "hi", "hey")),
+]
+
+
+def normalize_message(message):
+    """Fold case, punctuation and whitespace so equivalent questions share a key"""
+    text = _NUMBER_SEPARATOR.sub("", message.lower())
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+_INTENT_MATCHER = IntentMatcher(_INTENT_KEYWORDS)
+
+
+def keyword_intent(normalized):
+    """Best-effort intent of a normalized message, used to choose its TTL"""
+    return _INTENT_MATCHER.best(normalized)
+
+
+def _parse_ttls(spec):
+    """Parse ``intent=seconds,...`` overrides from the environment"""
+    ttls = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        intent, _, seconds = item.partition("=")
+        ttls[intent.strip()] = float(seconds)
+    return ttls
+
+
+class ResponseCache:
+    """Size-bounded LRU of chat answers with per-intent TTLs"""
+
+    def __init__(self, max_entries=2048, default_ttl=DEFAULT_TTL, intent_ttls=None,
+                 intent_of=keyword_intent):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.intent_ttls = dict(DEFAULT_INTENT_TTLS if intent_ttls is None else intent_ttls)
+        self.intent_of = intent_of
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._hits_by_intent = {}
+        self._misses_by_intent = {}
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        """Build a cache from RESPONSE_CACHE_* environment variables"""
+        intent_ttls = dict(DEFAULT_INTENT_TTLS)
+        intent_ttls.update(_parse_ttls(os.getenv("RESPONSE_CACHE_TTLS", "")))
+        return cls(
+            max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", 2048)),
+            default_ttl=float(os.getenv("RESPONSE_CACHE_TTL", DEFAULT_TTL)),
+            intent_ttls=intent_ttls,
+            **kwargs,
+        )
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def key(self, message, agent_name, agent_version):
+        """Cache key for ``message`` answered by the given agent build"""
+        return (agent_name, agent_version, normalize_message(message))
+
+    def get(self, key):
+        """Return the cached answer for ``key`` or None"""
+        intent = self.intent_of(key[-1])
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            self._misses_by_intent[intent] = self._misses_by_intent.get(intent, 0) + 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hits_by_intent[intent] = self._hits_by_intent.get(intent, 0) + 1
+        return entry[0]
+
+    def put(self, key, value):
+        """Store ``value`` for the TTL of the message's intent"""
+        if not self.enabled:
+            return
+        ttl = self.intent_ttls.get(self.intent_of(key[-1]), self.default_ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self):
+        """Hit-rate metrics for the stats endpoint"""
+        lookups = self.hits + self.misses
+        intents = set(self._hits_by_intent) | set(self._misses_by_intent)
+        by_intent = {}
+        for intent in sorted(intents):
+            hits = self._hits_by_intent.get(intent, 0)
+            total = hits + self._misses_by_intent.get(intent, 0)
+            by_intent[intent] = {"hits": hits, "lookups": total, "hit_rate": hits / total}
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "by_intent": by_intent,
+        }
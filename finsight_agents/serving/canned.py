@@ -0,0 +1,123 @@
+"""
+Pre-encoded bodies for canned (message independent) answers
+
+Agents that expose ``CANNED_RESPONSES`` and ``canned_key(message)`` have
+answers that never change for the life of the process. They are rendered
+once at startup into the exact /chat JSON body, gzip and (when the brotli
+package is installed) brotli encodings plus a content hash ETag, so serving
+one costs a dict lookup and a header comparison. Clients that revalidate
+with ``If-None-Match`` get an empty 304.
+"""
+
+import gzip
+import hashlib
+import json
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is always available
+    brotli = None
+
+from fastapi.responses import Response
+
+
+class CannedBody:
+    """One answer encoded as a ChatResponse body in every supported encoding"""
+
+    __slots__ = ("encodings", "etags")
+
+    def __init__(self, text):
+        body = json.dumps({"response": text, "status": "success"}, ensure_ascii=False).encode()
+        # mtime=0 keeps the gzip bytes identical across restarts and workers
+        self.encodings = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encodings["br"] = brotli.compress(body, quality=11)
+        # Strong ETags differ per content coding; all derive from the JSON body
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etags = {
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in self.encodings
+        }
+
+
+def _encoding_weights(header):
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    weights = {}
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            weights[coding.strip().lower()] = q
+    return weights
+
+
+def _accepts(weights, coding):
+    """Whether ``coding`` is acceptable; ``*`` covers codings not listed"""
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+def _etag_matches(header, etags):
+    """Weak comparison of an If-None-Match header against any of ``etags``"""
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") in etags:
+            return True
+    return False
+
+
+class CannedResponses:
+    """Canned answers of one agent, keyed like the agent's ``canned_key``"""
+
+    # Most compact first
+    PREFERENCE = ("br", "gzip")
+
+    def __init__(self, responses):
+        self.bodies = {key: CannedBody(text) for key, text in responses.items()}
+        self.served = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+    @classmethod
+    def for_agent(cls, agent):
+        """Pre-encode ``agent``'s canned answers, or None if it has none"""
+        responses = getattr(agent, "CANNED_RESPONSES", None)
+        if not responses or not hasattr(agent, "canned_key"):
+            return None
+        return cls(responses)
+
+    def respond(self, key, headers):
+        """The pre-encoded Response for ``key`` given the request ``headers``"""
+        canned = self.bodies[key]
+        weights = _encoding_weights(headers.get("accept-encoding"))
+        encoding = next(
+            (e for e in self.PREFERENCE if e in canned.encodings and _accepts(weights, e)), "identity"
+        )
+        response_headers = {"ETag": canned.etags[encoding], "Vary": "Accept-Encoding"}
+        # Any coding of the same body is still fresh for the client
+        if _etag_matches(headers.get("if-none-match"), canned.etags.values()):
+            self.not_modified += 1
+            return Response(status_code=304, headers=response_headers)
+
+        self.served += 1
+        body = canned.encodings[encoding]
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+            self.bytes_saved += len(canned.encodings["identity"]) - len(body)
+        return Response(body, media_type="application/json", headers=response_headers)
+
+    def snapshot(self):
+        """Counters for the stats endpoint"""
+        return {
+            "answers": len(self.bodies),
+            "encodings": sorted({e for body in self.bodies.values() for e in body.encodings}),
+            "served": self.served,
+            "not_modified": self.not_modified,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,262 @@
+"""
+Bounded worker pool for blocking agent calls
+
+The chat handlers are ``async def`` but the agents expose blocking ``run``
+methods. Calling them inline stalls every other connection on the uvicorn
+worker, so requests are admitted here, wait in a bounded queue for a free
+worker and run on a thread (or process) pool. When the queue is full the
+caller gets ``ExecutorSaturated`` and should answer 429 with Retry-After.
+
+Waiting requests are dispatched in weighted-fair order rather than FIFO:
+each request gets a virtual finish tag of ``max(now, user's last tag) +
+1 / weight`` and the smallest tag runs next, so one user flooding the
+queue only delays their own requests.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the admission queue is full"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Agent executor saturated, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AgentExecutor:
+    """Runs blocking agent calls on a pool behind a bounded admission queue"""
+
+    def __init__(self, kind="thread", workers=None, queue_size=None, retry_after=1):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        self.kind = kind
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.queue_size = self.workers * 4 if queue_size is None else queue_size
+        self.min_retry_after = retry_after
+
+        # The pool is created on first use so that a process which forks
+        # after import does not inherit dead threads.
+        self._pool = None
+        self._free = self.workers
+
+        # Weighted-fair queue: heap of (finish tag, seq, future); virtual
+        # time is the tag of the last request dispatched
+        self._queue = []
+        self._seq = itertools.count()
+        self._vtime = 0.0
+        self._last_finish = {}
+
+        self._running = 0
+        self._waiting = 0
+        self._admitted = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._recent_waits = deque(maxlen=1024)
+        self._service_ewma = None
+
+    @classmethod
+    def from_env(cls):
+        """Build an executor from AGENT_EXECUTOR_* environment variables"""
+        workers = os.getenv("AGENT_EXECUTOR_WORKERS")
+        queue_size = os.getenv("AGENT_EXECUTOR_QUEUE_SIZE")
+        return cls(
+            kind=os.getenv("AGENT_EXECUTOR_KIND", "thread"),
+            workers=int(workers) if workers else None,
+            queue_size=int(queue_size) if queue_size else None,
+            retry_after=int(os.getenv("AGENT_EXECUTOR_RETRY_AFTER", 1)),
+        )
+
+    def _ensure_started(self):
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="agent"
+                )
+            logger.info(
+                f"Agent executor started: {self.kind} x{self.workers}, queue {self.queue_size}"
+            )
+
+    def retry_after(self):
+        """Seconds a rejected client should wait before retrying"""
+        if not self._service_ewma:
+            return self.min_retry_after
+        backlog = (self._waiting + 1) / self.workers
+        return max(self.min_retry_after, math.ceil(self._service_ewma * backlog))
+
+    async def acquire(self, key=None, weight=1.0):
+        """
+        Wait for a free worker slot and return a token for ``release``
+
+        ``key`` identifies the tenant (user id) for fair queueing and
+        ``weight`` its share of the workers relative to other tenants.
+        Raises ``ExecutorSaturated`` when every worker is busy and the
+        admission queue is full.
+        """
+        self._ensure_started()
+        if self._running + self._waiting >= self.workers + self.queue_size:
+            self._rejected += 1
+            raise ExecutorSaturated(self.retry_after())
+
+        queued_at = time.perf_counter()
+        if self._free > 0 and not self._queue:
+            self._free -= 1
+        else:
+            start = max(self._vtime, self._last_finish.get(key, 0.0))
+            finish = start + 1.0 / max(weight, 1e-6)
+            self._last_finish[key] = finish
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (finish, next(self._seq), future))
+            self._waiting += 1
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over just as the waiter went away
+                    self._hand_over_slot()
+                raise
+            finally:
+                self._waiting -= 1
+        self._record_wait(time.perf_counter() - queued_at)
+        self._running += 1
+        return time.perf_counter()
+
+    def _hand_over_slot(self):
+        """Give a freed slot to the waiter with the smallest finish tag"""
+        while self._queue:
+            finish, _, future = heapq.heappop(self._queue)
+            if future.cancelled():
+                continue
+            self._vtime = finish
+            future.set_result(None)
+            break
+        else:
+            self._free += 1
+        if len(self._last_finish) > 4 * (self.workers + self.queue_size):
+            # Tags at or behind virtual time no longer affect ordering
+            self._last_finish = {
+                key: tag for key, tag in self._last_finish.items() if tag > self._vtime
+            }
+
+    async def submit(self, fn, *args, key=None, weight=1.0):
+        """
+        Run ``fn(*args)`` on the pool and return its result
+
+        With the process executor ``fn`` and its arguments must be picklable,
+        i.e. module-level functions and plain data.
+        """
+        started_at = await self.acquire(key=key, weight=weight)
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self.release(started_at, failed=True)
+            raise
+
+        # Release the slot when the work finishes, not when the awaiting
+        # request goes away, so cancelled requests still count against the
+        # pool until their worker is actually free.
+        future.add_done_callback(
+            lambda f: loop.call_soon_threadsafe(
+                self.release, started_at, f.cancelled() or f.exception() is not None
+            )
+        )
+        return await asyncio.wrap_future(future)
+
+    async def submit_async(self, coro_fn, *args, key=None, weight=1.0):
+        """
+        Await ``coro_fn(*args)`` on the event loop under the same admission
+        control, for agents that are already asynchronous (ADK runners)
+        """
+        started_at = await self.acquire(key=key, weight=weight)
+        failed = True
+        try:
+            result = await coro_fn(*args)
+            failed = False
+            return result
+        finally:
+            self.release(started_at, failed=failed)
+
+    def _record_wait(self, waited):
+        self._admitted += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._recent_waits.append(waited)
+
+    def release(self, started_at, failed=False):
+        """Free the slot taken by ``acquire``"""
+        elapsed = time.perf_counter() - started_at
+        if self._service_ewma is None:
+            self._service_ewma = elapsed
+        else:
+            self._service_ewma = 0.8 * self._service_ewma + 0.2 * elapsed
+        self._running -= 1
+        if failed:
+            self._failed += 1
+        else:
+            self._completed += 1
+        self._hand_over_slot()
+
+    def release_once(self, started_at):
+        """
+        ``release(failed=...)`` for the slot taken at ``started_at`` that only
+        frees it the first time it is called, for slots with several
+        possible owners (a stream and the response that sends it)
+        """
+        released = False
+
+        def release(failed=False):
+            nonlocal released
+            if not released:
+                released = True
+                self.release(started_at, failed=failed)
+
+        return release
+
+    def snapshot(self):
+        """Queue depth and wait-time metrics for the stats endpoint"""
+        waits = sorted(self._recent_waits)
+
+        def percentile(q):
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(q * len(waits)))]
+
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "running": self._running,
+            "queue_depth": self._waiting,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "completed": self._completed,
+            "failed": self._failed,
+            "wait_seconds": {
+                "mean": self._wait_total / self._admitted if self._admitted else 0.0,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "max": self._wait_max,
+            },
+            "service_seconds_ewma": self._service_ewma or 0.0,
+        }
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
@@ -0,0 +1,113 @@
+"""
+Measured, optionally lazy loading of the FinSight agent
+
+Importing ``delegator.agent`` pulls in google.adk and all eight sub-agent
+modules, which dominates cold start. ``AgentLoader`` tries the agents in
+order of preference (full delegator, simple ADK agent, rule-based
+fallback), caches the first one that loads for the life of the process
+and records how long each attempt took and how many modules it imported.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+from .canned import CannedResponses
+from .runner import AgentRunner, is_adk_agent
+
+logger = logging.getLogger(__name__)
+
+# (kind, module) in order of preference; each module exposes ``root_agent``
+AGENT_CANDIDATES = [
+    ("delegator", "delegator.agent"),
+    ("simple", "delegator.simple_agent"),
+    ("fallback", "delegator.fallback_agent"),
+]
+
+LOAD_MODES = ("eager", "lazy", "background")
+
+
+class AgentLoader:
+    """Loads the preferred agent once and keeps it at module scope"""
+
+    def __init__(self, candidates=AGENT_CANDIDATES, mode=None):
+        self.candidates = list(candidates)
+        self.mode = mode or os.getenv("AGENT_LOAD_MODE", "eager")
+        if self.mode not in LOAD_MODES:
+            raise ValueError(f"Unknown AGENT_LOAD_MODE: {self.mode}")
+
+        self.agent = None
+        self.kind = None
+        self.runner = None
+        self.canned = None
+        self.loaded = False
+        self.attempts = []
+        self.load_seconds = None
+        self._lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.agent.name if self.agent else None
+
+    def load(self):
+        """Import the first agent that works; later calls return the cached one"""
+        if self.loaded:
+            return self
+        with self._lock:
+            if self.loaded:
+                return self
+            started = time.perf_counter()
+            for kind, module_name in self.candidates:
+                if self._try_load(kind, module_name):
+                    break
+            else:
+                logger.error("Failed to load any agent")
+            self.load_seconds = time.perf_counter() - started
+            self.loaded = True
+        return self
+
+    def _try_load(self, kind, module_name):
+        modules_before = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            agent = importlib.import_module(module_name).root_agent
+            # ADK agents cannot be called directly; they are driven through a Runner
+            runner = AgentRunner(agent) if is_adk_agent(agent) else None
+            # Static answers are encoded here, once, before any worker forks
+            canned = CannedResponses.for_agent(agent)
+            error = None
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+        self.attempts.append({
+            "kind": kind,
+            "module": module_name,
+            "seconds": round(elapsed, 4),
+            "modules_imported": len(sys.modules) - modules_before,
+            "error": str(error) if error else None,
+        })
+        if error:
+            logger.warning(f"{kind.title()} agent failed to load from {module_name}: {error}")
+            return False
+
+        self.agent, self.kind, self.runner, self.canned = agent, kind, runner, canned
+        logger.info(f"{kind.title()} agent {agent.name} loaded in {elapsed:.2f}s")
+        return True
+
+    def start_background(self):
+        """Begin loading on a daemon thread so the server can bind first"""
+        threading.Thread(target=self.load, name="agent-loader", daemon=True).start()
+
+    def report(self):
+        """Startup timings for the stats endpoint"""
+        return {
+            "mode": self.mode,
+            "loaded": self.loaded,
+            "agent": self.name,
+            "kind": self.kind,
+            "load_seconds": round(self.load_seconds, 4) if self.load_seconds else None,
+            "attempts": list(self.attempts),
+        }
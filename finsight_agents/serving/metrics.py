@@ -0,0 +1,299 @@
+"""
+Prometheus metrics for the FinSight AI servers
+
+A small in-process registry rendering the Prometheus text exposition
+format, so the servers need no extra dependency. Metrics are per process:
+in pre-fork mode each worker exposes its own series, which Prometheus
+aggregates across scrape targets.
+"""
+
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans cache hits (milliseconds) to multi-agent LLM chains
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+    def render(self, name, labelnames, key):
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def render(self, name, labelnames, key):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            labels = _format_labels(labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, key, [("le", "+Inf")])
+        lines.append(f"{name}_bucket{labels} {self.count}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {self.count}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+
+class Registry:
+    """Holds metrics plus collectors that turn component snapshots into gauges"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+
+    def add_collector(self, collector):
+        """
+        Register ``collector()`` returning ``[(name, documentation, value)]``
+
+        Used for values that components already track (queue depth, cache
+        hits) so they are read at scrape time instead of double-counted.
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, documentation, value in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class ServerMetrics:
+    """The request and agent metrics every FinSight server exposes"""
+
+    def __init__(self, registry=None):
+        self.registry = registry or Registry()
+        self.requests = Counter(
+            "finsight_http_requests_total",
+            "HTTP requests by route, status code and loaded agent.",
+            ("route", "method", "status", "agent"),
+            self.registry,
+        )
+        self.errors = Counter(
+            "finsight_http_errors_total",
+            "HTTP requests that ended in a 5xx response.",
+            ("route", "agent"),
+            self.registry,
+        )
+        self.latency = Histogram(
+            "finsight_http_request_duration_seconds",
+            "HTTP request latency until the last body byte was sent.",
+            ("route", "agent"),
+            self.registry,
+        )
+        self.in_flight = Gauge(
+            "finsight_http_requests_in_flight",
+            "HTTP requests currently being served.",
+            ("route",),
+            self.registry,
+        )
+        self.agent_runs = Counter(
+            "finsight_agent_runs_total",
+            "Agent executions by loaded agent, detected intent, sub-agent and outcome.",
+            ("agent", "intent", "sub_agent", "outcome"),
+            self.registry,
+        )
+        self.agent_latency = Histogram(
+            "finsight_agent_run_duration_seconds",
+            "Agent execution latency by loaded agent, detected intent and sub-agent.",
+            ("agent", "intent", "sub_agent"),
+            self.registry,
+        )
+        self.agent_in_flight = Gauge(
+            "finsight_agent_runs_in_flight",
+            "Agent executions currently running.",
+            ("agent",),
+            self.registry,
+        )
+        self.websockets = Gauge(
+            "finsight_websocket_connections",
+            "WebSocket connections currently open.",
+            ("route",),
+            self.registry,
+        )
+
+    def observe_agent_run(self, agent, intent, sub_agent, seconds, outcome="ok"):
+        self.agent_runs.labels(agent=agent, intent=intent, sub_agent=sub_agent, outcome=outcome).inc()
+        self.agent_latency.labels(agent=agent, intent=intent, sub_agent=sub_agent).observe(seconds)
+
+    def render(self):
+        return self.registry.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording rate, errors, latency and in-flight requests
+
+    Latency runs until the final body chunk, so streamed responses
+    (/chat/stream, /chat/batch) are measured end to end. Paths that do not
+    match a registered route are folded into ``other`` to bound label
+    cardinality.
+    """
+
+    def __init__(self, app, metrics, agent_label):
+        self.app = app
+        self.metrics = metrics
+        self.agent_label = agent_label
+        self._routes = None
+
+    def _route(self, scope):
+        if self._routes is None:
+            router = scope.get("app")
+            routes = getattr(router, "routes", [])
+            self._routes = {getattr(route, "path", None) for route in routes}
+        path = scope.get("path", "")
+        return path if path in self._routes else "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route(scope)
+        status = {"code": 500}
+        started = time.perf_counter()
+        in_flight = self.metrics.in_flight.labels(route=route)
+        in_flight.inc()
+        finished = False
+
+        def record():
+            agent = self.agent_label()
+            elapsed = time.perf_counter() - started
+            self.metrics.requests.labels(
+                route=route, method=scope["method"], status=status["code"], agent=agent
+            ).inc()
+            if status["code"] >= 500:
+                self.metrics.errors.labels(route=route, agent=agent).inc()
+            self.metrics.latency.labels(route=route, agent=agent).observe(elapsed)
+            in_flight.dec()
+
+        async def send_wrapper(message):
+            nonlocal finished
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                if not finished:
+                    finished = True
+                    record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not finished:
+                finished = True
+                record()
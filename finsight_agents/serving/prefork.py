@@ -0,0 +1,307 @@
+"""
+Pre-fork multi-worker serving mode
+
+The master process imports the app (and with it the agent chain and every
+prompt) once, moves the loaded heap into the GC's permanent generation
+with ``gc.freeze()`` and then forks N uvicorn workers that share those
+pages copy-on-write. Freezing keeps the garbage collector from touching
+the inherited objects, so collections in a worker do not dirty (and
+unshare) the master's pages; plain refcount updates on objects a worker
+actually uses still copy the pages they live on.
+
+Usage::
+
+    python -m serving.prefork app:app --port 8080 --workers 4
+
+The master respawns workers that die, performs a rolling restart on
+SIGHUP (one worker at a time, new worker ready before the old one is
+stopped) and shuts everything down gracefully on SIGTERM/SIGINT.
+
+Each worker keeps its own session pool and response cache, so route a
+user's turns to the same worker (or accept per-worker session misses).
+"""
+
+import argparse
+import gc
+import importlib
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker gets to finish in-flight requests after SIGTERM
+GRACEFUL_TIMEOUT = float(os.getenv("SERVING_GRACEFUL_TIMEOUT", 30))
+# Seconds to wait for a new worker to report ready during a rolling restart
+READY_TIMEOUT = float(os.getenv("SERVING_READY_TIMEOUT", 60))
+
+
+def _cgroup_cpu_limit():
+    """CPU quota imposed by the container (cgroup v2 or v1), if any"""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return float(quota) / float(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = float(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = float(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _available_memory_mb():
+    """Memory available to this container or host in MB, if known"""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            return int(limit) / (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def auto_workers():
+    """
+    Worker count for this node
+
+    SERVING_WORKERS wins if set. Otherwise one worker per usable core
+    (CPU affinity, capped by any container CPU quota), further capped by
+    available memory when SERVING_WORKER_MEMORY_MB estimates the private
+    memory each worker needs after fork.
+    """
+    configured = os.getenv("SERVING_WORKERS")
+    if configured:
+        return max(1, int(configured))
+
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_limit()
+    if quota:
+        cpus = min(cpus, max(1, int(quota + 0.5)))
+    workers = cpus
+
+    per_worker_mb = os.getenv("SERVING_WORKER_MEMORY_MB")
+    available_mb = _available_memory_mb()
+    if per_worker_mb and available_mb:
+        workers = min(workers, int(available_mb // float(per_worker_mb)))
+    return max(1, workers)
+
+
+def _bind(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def freeze_heap():
+    """Move everything loaded so far into the GC's permanent generation"""
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} objects before forking workers")
+
+
+class PreforkServer:
+    """Forks uvicorn workers that share the master's loaded app"""
+
+    def __init__(self, app, host="0.0.0.0", port=8080, workers=None, log_level="info"):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or auto_workers()
+        self.log_level = log_level
+
+        self._sock = None
+        self._children = {}  # pid -> ready pipe read end
+        self._signals = []
+        self._stopping = False
+
+    def run(self):
+        """Bind, fork the workers and supervise them until shutdown"""
+        import uvicorn  # noqa: F401 - import before fork so workers share it
+
+        self._sock = _bind(self.host, self.port)
+        logger.info(
+            f"Pre-fork master {os.getpid()} listening on {self.host}:{self.port} "
+            f"with {self.workers} workers"
+        )
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(sig, lambda signum, frame: self._signals.append(signum))
+
+        for _ in range(self.workers):
+            self._spawn()
+
+        while not self._stopping:
+            time.sleep(0.2)
+            while self._signals:
+                self._handle(self._signals.pop(0))
+            self._reap(respawn=True)
+
+        self._shutdown()
+
+    def _handle(self, signum):
+        if signum in (signal.SIGTERM, signal.SIGINT):
+            self._stopping = True
+        elif signum == signal.SIGHUP:
+            self._rolling_restart()
+
+    def _spawn(self):
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            for sibling_r in self._children.values():
+                os.close(sibling_r)
+            self._run_worker(ready_w)
+            os._exit(0)
+        os.close(ready_w)
+        self._children[pid] = ready_r
+        logger.info(f"Spawned worker {pid}")
+        return pid
+
+    def _run_worker(self, ready_fd):
+        import uvicorn
+
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(sig, signal.SIG_DFL)
+        gc.enable()
+
+        class WorkerServer(uvicorn.Server):
+            async def startup(self, sockets=None):
+                await super().startup(sockets=sockets)
+                os.write(ready_fd, b"1")
+                os.close(ready_fd)
+
+        config = uvicorn.Config(
+            self.app,
+            log_level=self.log_level,
+            timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+        )
+        WorkerServer(config).run(sockets=[self._sock])
+
+    def _wait_ready(self, pid):
+        import select
+
+        ready_r = self._children.get(pid)
+        readable, _, _ = select.select([ready_r], [], [], READY_TIMEOUT)
+        return bool(readable) and os.read(ready_r, 1) == b"1"
+
+    def _stop(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 5
+        while time.monotonic() < deadline:
+            done, _ = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.1)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._forget(pid)
+
+    def _forget(self, pid):
+        ready_r = self._children.pop(pid, None)
+        if ready_r is not None:
+            os.close(ready_r)
+
+    def _rolling_restart(self):
+        logger.info("Rolling restart of all workers")
+        for old_pid in list(self._children):
+            new_pid = self._spawn()
+            if not self._wait_ready(new_pid):
+                logger.error(f"Worker {new_pid} did not become ready; keeping {old_pid}")
+                self._stop(new_pid)
+                continue
+            self._stop(old_pid)
+
+    def _reap(self, respawn):
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            if pid not in self._children:
+                continue
+            self._forget(pid)
+            if respawn and not self._stopping:
+                logger.warning(f"Worker {pid} died with status {status}; respawning")
+                self._spawn()
+            else:
+                logger.info(f"Worker {pid} exited with status {status}")
+
+    def _shutdown(self):
+        logger.info("Shutting down workers")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT + 5
+        while self._children and time.monotonic() < deadline:
+            self._reap(respawn=False)
+            time.sleep(0.1)
+        for pid in list(self._children):
+            os.kill(pid, signal.SIGKILL)
+            self._forget(pid)
+        self._sock.close()
+
+
+def serve(app, host="0.0.0.0", port=8080, workers=None):
+    """Freeze the already-loaded heap and serve ``app`` from forked workers"""
+    freeze_heap()
+    PreforkServer(app, host=host, port=port, workers=workers).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fork FinSight AI server")
+    parser.add_argument("app", nargs="?", default="app:app", help="module:attribute of the ASGI app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8080)))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    # Keep the collector off while the agent chain loads so nothing is
+    # traversed (and written) before the heap is frozen
+    gc.disable()
+    sys.path.insert(0, os.getcwd())
+    module_name, _, attr = args.app.partition(":")
+    module = importlib.import_module(module_name)
+    loader = getattr(module, "agent_loader", None)
+    if loader is not None:
+        # Lazy/background load modes would load per worker after the fork
+        loader.load()
+    app = getattr(module, attr or "app")
+    serve(app, host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-user token-bucket rate limiting keyed on ChatRequest.user_id
+
+Each user gets a bucket of ``burst`` tokens refilled at ``rate`` tokens per
+second; a request spends one token. Per-user quotas override the default
+and also set the user's weight in the executor's fair queue. Bucket state
+lives in a bounded LRU so a flood of distinct user ids cannot grow memory
+without limit (an evicted user simply starts again with a full bucket).
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class RateLimited(Exception):
+    """Raised when a user has exhausted their token bucket"""
+
+    def __init__(self, user_id, retry_after):
+        super().__init__(f"Rate limit exceeded for {user_id}, retry after {retry_after}s")
+        self.user_id = user_id
+        self.retry_after = retry_after
+
+
+def parse_quotas(spec):
+    """Parse ``user=rate:burst,...`` into ``{user: (rate, burst)}``"""
+    quotas = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        user_id, _, limits = item.partition("=")
+        rate, _, burst = limits.partition(":")
+        rate = float(rate)
+        quotas[user_id.strip()] = (rate, float(burst) if burst else max(1.0, rate))
+    return quotas
+
+
+class TokenBucketLimiter:
+    """Token buckets per user id with configurable quotas and bounded state"""
+
+    def __init__(self, rate=0.0, burst=None, quotas=None, max_users=10000):
+        # A rate of 0 disables limiting for users without an explicit quota
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate * 2)
+        self.quotas = dict(quotas or {})
+        self.max_users = max_users
+
+        self._buckets = OrderedDict()  # user_id -> [tokens, last_refill]
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    @classmethod
+    def from_env(cls):
+        """Build a limiter from RATE_LIMIT_* environment variables"""
+        burst = os.getenv("RATE_LIMIT_BURST")
+        return cls(
+            rate=float(os.getenv("RATE_LIMIT_RPS", 0)),
+            burst=float(burst) if burst else None,
+            quotas=parse_quotas(os.getenv("RATE_LIMIT_QUOTAS", "")),
+            max_users=int(os.getenv("RATE_LIMIT_MAX_USERS", 10000)),
+        )
+
+    def quota(self, user_id):
+        """(rate, burst) applying to ``user_id``"""
+        return self.quotas.get(user_id, (self.rate, self.burst))
+
+    def weight(self, user_id):
+        """Fair-queue weight: a user's quota relative to the default quota"""
+        rate, _ = self.quota(user_id)
+        if not rate or not self.rate:
+            return 1.0
+        return rate / self.rate
+
+    def check(self, user_id):
+        """Spend one token for ``user_id`` or raise ``RateLimited``"""
+        rate, burst = self.quota(user_id)
+        if rate <= 0:
+            self.allowed += 1
+            return
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(user_id)
+            if bucket is None:
+                bucket = self._buckets[user_id] = [burst, now]
+                while len(self._buckets) > self.max_users:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(user_id)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return
+            self.limited += 1
+            retry_after = max(1, math.ceil((1 - bucket[0]) / rate))
+        raise RateLimited(user_id, retry_after)
+
+    def snapshot(self):
+        """Limiter counters for the stats endpoint"""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "quotas": len(self.quotas),
+            "tracked_users": len(self._buckets),
+            "max_users": self.max_users,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
@@ -0,0 +1,105 @@
+"""
+ADK Runner wrapper used by the HTTP servers to drive the delegator agent
+"""
+
+import logging
+
+from .sessions import SessionPool
+
+logger = logging.getLogger(__name__)
+
+
+def is_adk_agent(agent):
+    """True if ``agent`` is an ADK agent that must be driven by a Runner"""
+    try:
+        from google.adk.agents import BaseAgent
+    except ImportError:
+        return False
+    return isinstance(agent, BaseAgent)
+
+
+def _event_text(event):
+    """Concatenate the visible text parts of an ADK event"""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(
+        part.text
+        for part in event.content.parts
+        if part.text and not getattr(part, "thought", False)
+    )
+
+
+class AgentRunner:
+    """
+    Runs an ADK agent through ``Runner.run_async`` and yields its text
+
+    One Runner and session service live for the whole process; each user id
+    keeps its ADK session in a ``SessionPool`` so follow-up turns reuse the
+    conversation state instead of starting from scratch.
+    """
+
+    def __init__(self, agent, app_name="finsight"):
+        from google.adk.runners import Runner
+        from google.adk.sessions import InMemorySessionService
+
+        self.agent = agent
+        self.app_name = app_name
+        self.session_service = InMemorySessionService()
+        self.runner = Runner(
+            app_name=app_name,
+            agent=agent,
+            session_service=self.session_service,
+        )
+        self.sessions = SessionPool.from_env(self.session_service, app_name)
+
+    async def stream(self, message, user_id="default", tool_calls=None):
+        """
+        Yield response text as the agent produces it
+
+        With SSE streaming the model emits partial events carrying text deltas
+        followed by one aggregated event repeating the full text; only the
+        deltas are forwarded in that case. Names of the tools the agent calls
+        (for the delegator: the sub-agents), or of the sub-agent a pre-routed
+        turn went to, are appended to ``tool_calls``.
+        """
+        from google.adk.agents.run_config import RunConfig, StreamingMode
+        from google.genai import types
+
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        # Sub-agents a pre-routing root agent may hand the turn to directly
+        specialists = getattr(self.agent, "specialists", {})
+
+        async with self.sessions.checkout(user_id) as lease:
+            lease.add_text(message)
+            streamed_partial = False
+            async for event in self.runner.run_async(
+                user_id=user_id,
+                session_id=lease.session_id,
+                new_message=content,
+                run_config=run_config,
+            ):
+                if tool_calls is not None and not event.partial:
+                    tool_calls.extend(call.name for call in event.get_function_calls())
+                    # A pre-routed turn is answered by the sub-agent itself
+                    if event.author in specialists and event.author not in tool_calls:
+                        tool_calls.append(event.author)
+                text = _event_text(event)
+                if event.partial:
+                    streamed_partial = True
+                    if text:
+                        yield text
+                    continue
+                if text:
+                    # Only aggregated events are kept in the session history
+                    lease.add_text(text)
+                    if not streamed_partial:
+                        yield text
+                streamed_partial = False
+
+    async def run(self, message, user_id="default", tool_calls=None):
+        """Run the agent to completion and return the full response text"""
+        chunks = []
+        async for chunk in self.stream(message, user_id=user_id, tool_calls=tool_calls):
+            chunks.append(chunk)
+        return "".join(chunks)
@@ -0,0 +1,185 @@
+"""
+Long-lived ADK session pool keyed by ChatRequest.user_id
+
+Each user keeps one ADK session across turns so the agent sees the earlier
+conversation without the client re-sending it. Sessions are evicted LRU
+when the pool is full, after an idle TTL, and whenever the estimated
+memory held by all sessions exceeds a hard cap.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+# Requests without a real user id share this value; they never get a pooled
+# session, otherwise anonymous users would see each other's history.
+ANONYMOUS_USER = "default"
+
+
+class _Entry:
+    __slots__ = ("session_id", "last_used", "nbytes", "lock", "users")
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.last_used = time.monotonic()
+        self.nbytes = 0
+        self.lock = asyncio.Lock()
+        # Turns holding or waiting for the lock; such entries are never evicted
+        self.users = 0
+
+
+class SessionLease:
+    """A session checked out for one conversation turn"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.nbytes = 0
+
+    def add_text(self, text):
+        """Account for text the turn adds to the session history"""
+        self.nbytes += len(text.encode("utf-8"))
+
+
+class SessionPool:
+    """Maps user ids to ADK sessions with LRU, idle-TTL and memory eviction"""
+
+    def __init__(self, session_service, app_name, max_sessions=1000,
+                 idle_ttl=1800, max_bytes=64 * 1024 * 1024):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0, "memory": 0}
+
+    @classmethod
+    def from_env(cls, session_service, app_name):
+        """Build a pool from SESSION_POOL_* environment variables"""
+        return cls(
+            session_service,
+            app_name,
+            max_sessions=int(os.getenv("SESSION_POOL_MAX_SESSIONS", 1000)),
+            idle_ttl=float(os.getenv("SESSION_POOL_IDLE_TTL", 1800)),
+            max_bytes=int(os.getenv("SESSION_POOL_MAX_MB", 64)) * 1024 * 1024,
+        )
+
+    def has_session(self, user_id):
+        """True if ``user_id`` has live conversation history in the pool"""
+        entry = self._entries.get(user_id)
+        return entry is not None and not self._expired(entry, time.monotonic())
+
+    @asynccontextmanager
+    async def checkout(self, user_id):
+        """
+        Yield a ``SessionLease`` for one turn of ``user_id``'s conversation
+
+        Turns of the same user are serialized so concurrent requests do not
+        interleave events in one session. Anonymous users get a throwaway
+        session that is deleted after the turn.
+        """
+        if user_id == ANONYMOUS_USER:
+            session = await self.session_service.create_session(
+                app_name=self.app_name, user_id=user_id
+            )
+            try:
+                yield SessionLease(session.id)
+            finally:
+                await self._delete(user_id, session.id)
+            return
+
+        await self._evict_expired()
+        entry = self._entries.get(user_id)
+        duplicate = None
+        if entry is None:
+            self.misses += 1
+            await self._evict_over_capacity(reserve=1)
+            session = await self.session_service.create_session(
+                app_name=self.app_name, user_id=user_id
+            )
+            entry = self._entries.setdefault(user_id, _Entry(session.id))
+            if entry.session_id != session.id:
+                # Another turn for this user created a session concurrently
+                duplicate = session.id
+        else:
+            self.hits += 1
+        self._entries.move_to_end(user_id)
+
+        entry.users += 1
+        try:
+            if duplicate:
+                await self._delete(user_id, duplicate)
+            async with entry.lock:
+                lease = SessionLease(entry.session_id)
+                try:
+                    yield lease
+                finally:
+                    entry.last_used = time.monotonic()
+                    entry.nbytes += lease.nbytes
+                    self._bytes += lease.nbytes
+        finally:
+            entry.users -= 1
+        await self._evict_over_capacity()
+
+    def _expired(self, entry, now):
+        return now - entry.last_used > self.idle_ttl
+
+    async def _evict_expired(self):
+        now = time.monotonic()
+        # Entries are kept in last-use order, so expired ones sit at the front
+        while self._entries:
+            user_id, entry = next(iter(self._entries.items()))
+            if not self._expired(entry, now) or entry.users:
+                break
+            await self._evict(user_id, "ttl")
+
+    async def _evict_over_capacity(self, reserve=0):
+        for reason, over in (
+            ("lru", lambda: len(self._entries) + reserve > self.max_sessions),
+            ("memory", lambda: self._bytes > self.max_bytes),
+        ):
+            for user_id in list(self._entries):
+                if not over():
+                    break
+                entry = self._entries.get(user_id)
+                if entry is not None and not entry.users:
+                    await self._evict(user_id, reason)
+
+    async def _evict(self, user_id, reason):
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        self._bytes -= entry.nbytes
+        self.evictions[reason] += 1
+        await self._delete(user_id, entry.session_id)
+
+    async def _delete(self, user_id, session_id):
+        try:
+            await self.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to delete session {session_id}: {e}")
+
+    def snapshot(self):
+        """Hit/miss and eviction counters for the stats endpoint"""
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "max_sessions": self.max_sessions,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": dict(self.evictions),
+        }
@@ -0,0 +1,50 @@
+"""
+Single-flight coalescing of identical in-flight requests
+
+When a topic trends, many identical questions arrive together. The first
+one (the leader) starts the agent run; every request with the same key
+that arrives while it is in flight awaits the same result instead of
+starting its own delegator -> sub-agent chain.
+"""
+
+import asyncio
+
+
+class SingleFlight:
+    """Shares one in-flight execution between concurrent callers of a key"""
+
+    def __init__(self):
+        self._calls = {}
+        self.leaders = 0
+        self.followers = 0
+
+    async def do(self, key, coro_fn, *args):
+        """Await ``coro_fn(*args)``, or the identical call already in flight"""
+        task = self._calls.get(key)
+        if task is not None:
+            self.followers += 1
+        else:
+            self.leaders += 1
+            # Run as its own task so a disconnecting leader does not cancel
+            # the work its followers are waiting on
+            task = asyncio.ensure_future(coro_fn(*args))
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+
+    def snapshot(self):
+        """Coalescing counters for the stats endpoint"""
+        total = self.leaders + self.followers
+        return {
+            "in_flight": len(self._calls),
+            "executions": self.leaders,
+            "coalesced": self.followers,
+            "coalescing_ratio": self.followers / total if total else 0.0,
+        }
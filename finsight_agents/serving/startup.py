@@ -0,0 +1,106 @@
+"""
+Cold-start report: per-module import cost of each agent candidate
+
+Runs every candidate import in a fresh interpreter under
+``python -X importtime`` and summarizes the most expensive modules, so
+cold-start regressions show up in review or CI::
+
+    python -m serving.startup                  # table for all candidates
+    python -m serving.startup --json           # machine readable
+    python -m serving.startup --budget-ms 4000 # exit 1 if any import is slower
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from .loader import AGENT_CANDIDATES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|")
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+def _importtime(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+
+def measure(module_name, top=15, baseline=None):
+    """
+    Import ``module_name`` in a fresh interpreter and report its cost
+
+    Modules named in ``baseline`` (those any interpreter imports at
+    startup) are left out of the per-module rows.
+    """
+    result = _importtime(f"import {module_name}")
+    rows = [row for row in parse_importtime(result.stderr) if row[0] not in (baseline or ())]
+    total_us = next((cum for name, _, cum in rows if name == module_name), None)
+    if total_us is None:
+        total_us = sum(self_us for _, self_us, _ in rows)
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "module": module_name,
+        "ok": result.returncode == 0,
+        "total_ms": round(total_us / 1000, 1),
+        "modules_imported": len(rows),
+        "heaviest": [
+            {"module": name, "self_ms": round(s / 1000, 1), "cumulative_ms": round(c / 1000, 1)}
+            for name, s, c in heaviest
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: agent candidates)")
+    parser.add_argument("--top", type=int, default=15, help="heaviest modules to list")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if any measured import exceeds this many ms")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or [module for _, module in AGENT_CANDIDATES]
+    baseline = {name for name, _, _ in parse_importtime(_importtime("pass").stderr)}
+    reports = [measure(module, top=args.top, baseline=baseline) for module in modules]
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            status = "ok" if report["ok"] else "FAILED"
+            print(f"\n{report['module']}: {report['total_ms']:.1f} ms, "
+                  f"{report['modules_imported']} modules ({status})")
+            print(f"  {'self ms':>9} {'cum ms':>9}  module")
+            for row in report["heaviest"]:
+                print(f"  {row['self_ms']:>9.1f} {row['cumulative_ms']:>9.1f}  {row['module']}")
+
+    if args.budget_ms is not None:
+        over = [r for r in reports if r["total_ms"] > args.budget_ms]
+        if over:
+            names = ", ".join(r["module"] for r in over)
+            print(f"\nImport budget of {args.budget_ms} ms exceeded by: {names}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Server-Sent-Events helpers for streaming chat responses
+"""
+
+import json
+import logging
+import time
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Stop reverse proxies (nginx, Cloud Run front ends) buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+def sse_event(event, data):
+    """Encode one SSE frame with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def sse_stream(chunks, started=None, route="/chat/stream"):
+    """
+    Wrap an async iterator of text chunks as SSE frames
+
+    The closing ``done`` frame reports time-to-first-byte separately from
+    total latency, both measured from ``started`` (a ``time.perf_counter``
+    value taken when the request arrived) or from when the stream starts.
+    """
+    started = started or time.perf_counter()
+    first_chunk_at = None
+    size = 0
+    try:
+        async for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+            size += len(chunk)
+            yield sse_event("chunk", {"text": chunk})
+    except Exception as e:
+        logger.error(f"Error while streaming response: {e}")
+        yield sse_event("error", {"detail": f"Error processing request: {str(e)}"})
+        return
+
+    finished = time.perf_counter()
+    ttfb_ms = ((first_chunk_at or finished) - started) * 1000
+    total_ms = (finished - started) * 1000
+    logger.info(f"{route} ttfb={ttfb_ms:.1f}ms total={total_ms:.1f}ms chars={size}")
+    yield sse_event(
+        "done",
+        {"ttfb_ms": round(ttfb_ms, 1), "total_ms": round(total_ms, 1), "chars": size},
+    )
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """
+    ``StreamingResponse`` that calls ``on_close()`` however it ends
+
+    A generator's ``finally`` only runs once the server starts iterating
+    it, so cleanup there is skipped when the client disconnects before the
+    first byte or the send fails; ``on_close`` runs in every case.
+    """
+
+    def __init__(self, content, on_close, **kwargs):
+        super().__init__(content, **kwargs)
+        self.on_close = on_close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.on_close()
@@ -0,0 +1,83 @@
+"""
+WebSocket chat transport for the /ws/chat endpoints
+
+One socket carries a whole conversation, so a browser frontend pays for
+the connection and CORS checks once instead of on every turn. Clients send
+either plain text or ``{"message": ..., "id": ...}`` frames; every message
+is answered with ``{"type": "response", "id": ..., "response": ...}`` or
+``{"type": "error", "id": ..., "detail": ...}``. Turns on one socket are
+answered in order, while each open socket is just a coroutine on the
+event loop, so a worker holds many of them concurrently.
+"""
+
+import json
+import logging
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+logger = logging.getLogger(__name__)
+
+# Longest message accepted over a socket, in characters
+MAX_MESSAGE_CHARS = 8192
+
+
+def parse_frame(text):
+    """Return ``(id, message)`` from a text frame, or raise ``ValueError``"""
+    message_id = None
+    if text.lstrip().startswith("{"):
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e.msg}") from None
+        message_id = payload.get("id")
+        text = payload.get("message")
+        if not isinstance(text, str):
+            raise ValueError("Frame must contain a 'message' string")
+    text = text.strip()
+    if not text:
+        raise ValueError("Empty message")
+    if len(text) > MAX_MESSAGE_CHARS:
+        raise ValueError(f"Message too long: {len(text)} > {MAX_MESSAGE_CHARS} characters")
+    return message_id, text
+
+
+async def serve_chat_socket(websocket: WebSocket, answer, metrics=None):
+    """
+    Answer every message received on ``websocket`` with ``await answer(message)``
+
+    Runs until the client disconnects. Errors are reported on the socket
+    and the conversation carries on.
+    """
+    await websocket.accept()
+    connections = metrics.websockets.labels(route="/ws/chat") if metrics else None
+    if connections:
+        connections.inc()
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message_id, message = parse_frame(text)
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "id": None, "detail": str(e)})
+                continue
+            try:
+                response = await answer(message)
+            except Exception as e:
+                logger.error(f"Error processing websocket message: {e}")
+                await websocket.send_json({
+                    "type": "error",
+                    "id": message_id,
+                    "detail": f"Error processing request: {str(e)}",
+                })
+                continue
+            await websocket.send_json({
+                "type": "response",
+                "id": message_id,
+                "response": response,
+                "status": "success",
+            })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if connections:
+            connections.dec()
@@ -0,0 +1,495 @@
+"""Test cases for the delegator's rule-based helpers"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai.types import Content, Part
+from delegator.entities import Entities, annual_income, extract_entities, monthly_income
+from delegator.fallback_agent import root_agent
+from delegator.fanout import FanOut, merge
+from delegator.intents import IntentMatcher
+from delegator.router import PreRouter, evaluate, load_cases
+from delegator.templates import Template, TemplateSet
+from delegator.tools.cashflow import cashflow_table, project_cashflow
+from delegator.tools.debt import plan_debt_repayment, simulate_repayment
+from delegator.tools.goals import plan_goals, required_sip, sip_future_value
+from delegator.tools.loan import affordability_grid, amortization, emi, emi_grid, max_principal
+from delegator.tools.projection import CHUNK_PATHS, project
+from delegator.tools.tax import breakeven_deductions, compare_regimes, income_tax, max_deductions
+from serving.runner import AgentRunner
+
+TABLE = [
+    ("greeting", ["hello", "hi"]),
+    ("tax", ["tax", "80c", "income tax"]),
+    ("investment", ["invest", "mutual fund", "sip"]),
+    ("credit_card", ["credit card", "card"]),
+]
+
+
+def test_intent_matcher_respects_word_boundaries():
+    """Keywords match whole words, plurals of short words and stems of long ones."""
+    matcher = IntentMatcher(TABLE)
+    assert matcher.scan("is this it?") == {}
+    assert matcher.scan("Hi!") == {"greeting": 1}
+    assert matcher.scan("taxes and SIPs") == {"tax": 1, "investment": 1}
+    assert matcher.scan("taxation") == {}
+    assert matcher.scan("investing in mutual funds") == {"investment": 3}
+
+
+def test_intent_matcher_scores_every_intent():
+    """All matched intents are returned best first; ties keep table order."""
+    matcher = IntentMatcher(TABLE)
+    assert matcher.match("hi, how do I invest in a mutual fund via sip?") == [
+        ("investment", 4),
+        ("greeting", 1),
+    ]
+    assert matcher.match("hello, income tax on my card") == [
+        ("tax", 2),
+        ("greeting", 1),
+        ("credit_card", 1),
+    ]
+    assert matcher.best("nothing relevant") == "general"
+
+
+def test_fallback_agent_routes_with_matcher():
+    """The rule-based agent no longer greets messages that merely contain 'hi'."""
+    assert root_agent.intent("Is this lottery prize a scam?") == "scam"
+    assert root_agent.canned_key("hello there") == "greeting"
+    assert root_agent.run("what is this") == root_agent.CANNED_RESPONSES["general"]
+
+
+@pytest.mark.parametrize("module", ["extra.local_server", "extra.standalone_app"])
+def test_server_intents_ignore_filler_phrases(module):
+    """Phrases like 'help me' or 'looking for' no longer outweigh the actual topic."""
+    import importlib
+
+    agent = importlib.import_module(module).FinSightAIAgent()
+    assert agent.intent("I am looking for a home loan of $300,000") == "loan"
+    assert agent.intent("Help me improve my 620 credit score") == "credit_score"
+    assert agent.intent("I want to start a SIP") == "investment"
+    assert agent.intent("hello there") == "greeting"
+
+
+def test_extract_entities_in_one_pass():
+    """Amounts with units, age, income and credit score come out typed."""
+    assert extract_entities("I'm 30, earn 80k and need a loan of 5 lakh") == Entities(
+        amount=500000.0, age=30, income=80000.0
+    )
+    assert extract_entities("Help me improve my 620 credit score") == Entities(credit_score=620)
+    assert extract_entities("Budget for $6,000 monthly income") == Entities(income=6000.0, income_period="month")
+    assert extract_entities("Loan at 8.5% for 20 years on Rs. 25,00,000").amount == 2500000.0
+    assert extract_entities("2 crore corpus").amount == 2e7
+    assert extract_entities("Invest 5 lakh for 15 years") == Entities(amount=500000.0, years=15)
+
+
+def test_bare_small_numbers_are_not_money():
+    """Counts and unit-less figures are not amounts, and only incomes are annualized."""
+    assert extract_entities("I make 5 m") == Entities()
+    assert extract_entities("I have 3 credit cards") == Entities()
+    assert extract_entities("earn $500") == Entities(income=500.0)
+    assert extract_entities("How much tax will I pay on 12 lpa?") == Entities(income=1200000.0, income_period="year")
+    assert annual_income("tax on my salary, I invest 5000 per month") is None
+    assert annual_income("monthly salary of 50,000, how much tax?") == 600000.0
+
+
+def test_income_period_comes_from_next_to_the_income():
+    """Other amounts' "per month" or "yearly" does not rescale the income."""
+    tax = "my salary is 12 lakh and I invest 5000 per month in SIP, how much tax?"
+    budget = "I earn 80000 a month and pay 20000 yearly insurance, plan my budget"
+    assert annual_income(tax) == 1200000.0
+    assert monthly_income(budget) == 80000.0
+    assert annual_income(budget) == 960000.0
+    assert monthly_income("earn 12 lakh per annum") == 100000.0
+    assert root_agent.intent(tax) == "tax" and "Income Tax Estimate" in root_agent.run(tax)
+    assert "₹80,000" in root_agent.run(budget)
+
+
+def test_extract_entities_bounded_on_long_input():
+    """Inputs that made 'score.*?(\\d{3})' backtrack are scanned in linear time."""
+    started = time.perf_counter()
+    assert extract_entities("score " + "x " * 200000) == Entities()
+    assert time.perf_counter() - started < 0.5
+
+
+def test_emi_grid_matches_scalar_formula():
+    """The vectorized grid agrees with the textbook EMI formula cell by cell."""
+    grid = emi_grid([100000, 500000], [0, 9, 12], [1, 5])
+    assert grid["emi"].shape == (2, 3, 2)
+    r, n = 9 / 1200, 60
+    expected = 500000 * r * (1 + r) ** n / ((1 + r) ** n - 1)
+    assert np.isclose(grid["emi"][1, 1, 1], expected)
+    assert np.isclose(grid["emi"][0, 0, 0], 100000 / 12)
+    assert np.isclose(grid["total_interest"][0, 0, 0], 0)
+
+
+def test_amortization_schedule_pays_off_each_loan():
+    """Schedules for loans of different tenures share one padded array."""
+    schedule = amortization([300000, 100000], [8.5, 0], [20, 1])
+    assert schedule["payment"].shape == (2, 240)
+    assert np.allclose(schedule["principal"].sum(axis=-1), [300000, 100000])
+    assert np.allclose(schedule["balance"][:, -1], 0)
+    assert np.isclose(schedule["payment"][0, 0], emi(300000, 8.5, 20))
+    assert not schedule["payment"][1, 12:].any()
+
+
+def test_max_principal_inverts_the_emi_cap():
+    """The largest loan uses exactly the EMI room left under the cap."""
+    limit = max_principal(100000, 8.5, 20, existing_emi=10000, dti_cap=50)
+    assert np.isclose(emi(limit, 8.5, 20), 40000)
+    assert max_principal(1000, 0, 1) == 4800
+    grid = affordability_grid([100000, 50000], [8.5, 9.5], [10, 20, 30], existing_emi=[0, 30000])
+    assert grid["max_principal"].shape == (2, 2, 3)
+    # Existing EMIs above the cap leave no room at all
+    assert not grid["max_principal"][1].any()
+    assert np.all(np.diff(grid["max_principal"][0], axis=-1) > 0)
+
+
+def test_income_and_existing_emi_for_affordability():
+    """Monthly income is normalized and existing EMIs are told apart from the loan."""
+    message = "I earn 80k monthly, existing EMI of 15k, need a home loan of 40 lakh"
+    entities = extract_entities(message)
+    assert (entities.amount, entities.income, entities.existing_emi) == (4e6, 80000.0, 15000.0)
+    assert monthly_income(message) == 80000.0
+    assert monthly_income("my salary is 18 lpa") == 150000.0
+    assert extract_entities("What is the EMI for 50 lakh?") == Entities(amount=5e6)
+
+
+def test_projection_percentiles_within_budget():
+    """Percentiles are ordered, reproducible, and the budget caps the path count."""
+    projection = project(50000, 15, 0.8, paths=4000, budget_ms=1e6)
+    assert projection.paths == 4000
+    assert projection.p10 < projection.p50 < projection.p90
+    assert project(50000, 15, 0.8, paths=4000, budget_ms=1e6).p50 == projection.p50
+    assert project(50000, 15, 0.8, paths=4000, budget_ms=0).paths == CHUNK_PATHS
+    # All-debt portfolios barely move around their mean growth
+    safe = project(100000, 1, 0.0, paths=2000, budget_ms=1e6)
+    assert 100000 < safe.p50 < 110000 and safe.p90 - safe.p10 < 15000
+
+
+def test_income_tax_matches_worked_examples():
+    """Rebate, marginal relief, deduction caps and senior slabs per assessment year."""
+    assert income_tax(1275000)["total"] == 0
+    # Rs 12.25L taxable: tax capped at the Rs 25,000 above the rebate limit, plus cess
+    assert income_tax(1300000)["total"] == 26000
+    assert income_tax(800000, year="AY2025-26")["total"] == 23400
+    old = income_tax(1000000, "old", deductions={"80c": 200000, "80ccd_1b": 50000})
+    assert old["taxable_income"] == 750000 and old["total"] == 65000
+    assert income_tax(600000, "old", age=65)["total"] == 20800
+    # Just past Rs 50L the surcharge is limited to the income above the threshold
+    assert np.isclose(income_tax(5085000)["total"], (1080000 + 10000) * 1.04)
+    with pytest.raises(ValueError):
+        income_tax(1000000, year="AY2019-20")
+
+
+def test_compare_regimes_over_a_payroll():
+    """A whole array of salaries is evaluated in one vectorized call."""
+    salaries = np.linspace(300000, 30000000, 100000)
+    result = compare_regimes(salaries, deductions={"80c": 150000, "24b": 200000})
+    assert result["old"].shape == result["new"].shape == (100000,)
+    assert np.all(result["saving"] >= 0)
+    assert set(np.unique(result["better"])) <= {"old", "new"}
+    breakeven = breakeven_deductions([1000000, 1500000, 5000000])
+    assert breakeven[0] == 450000 and np.isnan(breakeven[1:]).all()
+    # Beyond the caps a taxpayer can claim there is no break-even, even at the senior limits
+    assert max_deductions(65, parents_senior=True) == 500000
+    assert np.isnan(breakeven_deductions(1500000, age=65, parents_senior=True))
+
+
+def test_fallback_agent_computes_tax_for_a_salary():
+    """Tax questions with a salary skip the canned answer."""
+    assert root_agent.canned_key("income tax on 15 lakh salary") is None
+    assert "₹97,500" in root_agent.run("income tax on 15 lakh salary")
+    assert root_agent.canned_key("how do I file my ITR") == "tax"
+
+
+def test_step_up_sip_matches_month_by_month_simulation():
+    """The closed form agrees with investing at the start of every month."""
+    value = 0.0
+    for year in range(20):
+        for _ in range(12):
+            value = (value + 5000 * 1.1 ** year) * 1.01
+    assert np.isclose(sip_future_value(5000, 12, 20, 10), value)
+    assert np.isclose(sip_future_value(5000, 0, 5), 300000)
+    # Solving for the SIP inverts the future value, net of savings already invested
+    sip = required_sip(1e7, 12, 15, 10, current_savings=200000)
+    assert np.isclose(sip_future_value(sip, 12, 15, 10) + 200000 * 1.01 ** 180, 1e7)
+    assert required_sip(1e5, 12, 10, current_savings=1e5) == 0
+
+
+def test_plan_goals_solves_many_goals_at_once():
+    """Each goal is inflated over its own horizon and solved in one call."""
+    plan = plan_goals([2e6, 5e6, 1e6], [5, 15, 3], inflation=6)
+    assert plan["monthly_sip"].shape == (3,)
+    assert np.isclose(plan["future_cost"][1], 5e6 * 1.06 ** 15)
+    assert np.isclose(plan["total_monthly_sip"], plan["monthly_sip"].sum())
+    assert root_agent.canned_key("invest to reach 1 crore in 15 years") is None
+    assert "Goal Plan" in root_agent.run("invest to reach 1 crore in 15 years")
+
+
+def test_template_set_renders_sections_in_one_pass():
+    """Sections fill their slots with format specs and join in order."""
+    templates = TemplateSet({
+        "header": "Loan of ${amount:,}\n",
+        "emi": "EMI: ${emi:,.2f} ({{approx}})\n",
+    })
+    assert templates["emi"].slots == ("emi",)
+    values = {"amount": 300000, "emi": 2603.4}
+    assert templates.render(["header", "emi"], values) == "Loan of $300,000\nEMI: $2,603.40 ({approx})\n"
+    assert templates.render(("header",), values) == "Loan of $300,000\n"
+    with pytest.raises(ValueError):
+        Template("{amount * 2}")
+
+
+def _brute_force_interest(balances, rates, minimums, budget, order):
+    balances = list(map(float, balances))
+    interest = 0.0
+    for _ in range(360):
+        if max(balances) <= 0.005:
+            break
+        left = budget
+        for i, rate in enumerate(rates):
+            accrued = balances[i] * rate / 1200
+            interest += accrued
+            balances[i] += accrued
+            paid = min(minimums[i], balances[i])
+            balances[i] -= paid
+            left -= paid
+        for i in order:
+            paid = min(left, balances[i])
+            balances[i] -= paid
+            left -= paid
+    return interest
+
+
+def test_debt_strategies_match_month_by_month_loop():
+    """The vectorized waterfall pays the same interest as a plain loop."""
+    balances, rates, minimums = [150000, 400000, 200000, 50000], [40, 9.5, 14, 24], [7500, 8500, 5000, 2000]
+    result = simulate_repayment(balances, rates, minimums, 35000, custom_order=[2, 0, 1, 3])
+    assert result["strategies"] == ["minimum", "avalanche", "snowball", "custom"]
+    for name, order in (("avalanche", [0, 3, 2, 1]), ("snowball", [3, 0, 2, 1]), ("custom", [2, 0, 1, 3])):
+        i = result["strategies"].index(name)
+        assert np.isclose(result["total_interest"][i], _brute_force_interest(balances, rates, minimums, 35000, order))
+    avalanche, snowball = result["total_interest"][1:3]
+    assert avalanche <= snowball < result["total_interest"][0]
+    assert np.nanmax(result["payoff_month"][1]) == result["debt_free_month"][1]
+    # Extra money every month pays debts off sooner
+    faster = simulate_repayment(balances, rates, minimums, 35000, prepayments=10000)
+    assert faster["debt_free_month"][1] < result["debt_free_month"][1]
+    with pytest.raises(ValueError):
+        simulate_repayment(balances, rates, minimums, 10000)
+    assert plan_debt_repayment(["card"], [1000], [10], [100], 50)["status"] == "error"
+    assert plan_debt_repayment(["card"], [1000, 2000], [10, 12], [100, 100], 500)["status"] == "error"
+
+
+def test_debt_plan_flags_minimums_below_interest():
+    """A minimum that never covers the interest gives a warning, not a saving."""
+    args = (["card", "car"], [100000, 300000], [40, 9], [2000, 8000], 15000)
+    stuck = plan_debt_repayment(*args)
+    assert stuck["status"] == "success" and "card" in stuck["warning"]
+    assert stuck["strategies"]["minimum"]["total_interest"] is None
+    assert stuck["strategies"]["avalanche"]["interest_saved"] is None
+    assert stuck["strategies"]["avalanche"]["debt_free_by"] != "not within horizon"
+    # A 5% card minimum does amortize, so the saving is real
+    paying = plan_debt_repayment(*args, minimum_percent=[5, 0])
+    assert "warning" not in paying
+    assert 0 < paying["strategies"]["avalanche"]["interest_saved"] < paying["strategies"]["minimum"]["total_interest"]
+
+
+def test_debt_simulation_scales_to_hundreds_of_debts():
+    """Hundreds of debts over 30 years stay well under a second."""
+    rng = np.random.default_rng(0)
+    balances = rng.uniform(1e4, 5e5, 300)
+    started = time.perf_counter()
+    result = simulate_repayment(balances, rng.uniform(8, 42, 300), balances * 0.01, balances.sum() * 0.05,
+                                minimum_percent=4)
+    assert time.perf_counter() - started < 1.0
+    assert result["payoff_month"].shape == (3, 300)
+    assert result["interest_saved"][1] > 0
+
+
+def test_cashflow_projection_matches_month_by_month_loop():
+    """Raises, inflation, EMIs ending, step-up SIPs and goals line up month by month."""
+    timeline = project_cashflow(100000, 45000, [15000, 5000], [120, 24], 20000, [500000], [36],
+                                sip_step_up=10, cash=50000, investments=100000)
+    cash, invested = 50000.0, 100000.0
+    for m in range(360):
+        year = m // 12
+        goal = 500000 * 1.06 ** (35 / 12) if m == 35 else 0
+        invested = (invested + 20000 * 1.1 ** year - goal) * 1.01
+        cash += 100000 * 1.05 ** year - 45000 * 1.06 ** year - 20000 * 1.1 ** year
+        cash -= (15000 if m < 120 else 0) + (5000 if m < 24 else 0)
+        assert np.isclose(timeline.investments[m], invested)
+        assert np.isclose(timeline.cash[m], cash)
+    assert timeline.first_goal_shortfall_month is None
+    assert timeline.first_deficit_month == int(np.argmax(timeline.cash < 0)) + 1
+    started = time.perf_counter()
+    for _ in range(100):
+        project_cashflow(100000, 45000, [15000], [120], 20000, [500000], [36])
+    # Under a millisecond each, with room for slow CI machines
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+
+def test_cashflow_table_prints_no_negative_zero():
+    """Values that round to zero print as ₹0 whatever their sign."""
+    month = [np.array([v] * 12) for v in (100000.4, -1e-12, -0.4, -1500.6, 2e7)]
+    timeline = SimpleNamespace(months=12, income=month[0], surplus=month[1], cash=month[2],
+                               investments=month[3], net_worth=month[4])
+    assert cashflow_table(timeline, years=(1,)).splitlines()[-1] == (
+        "| 1 | ₹100,000 | ₹0 | ₹0 | -₹1,501 | ₹20,000,000 |"
+    )
+
+
+def test_fallback_agent_projects_a_budget_for_an_income():
+    """Budget questions with a monthly income get a computed projection."""
+    message = "Make a budget for my salary of 60000 per month"
+    assert root_agent.canned_key(message) is None
+    assert "Where this budget takes you" in root_agent.run(message)
+    assert root_agent.canned_key("help me budget") == "budget"
+
+
+def test_pre_router_on_labeled_set():
+    """Confident routes all reach the labeled sub-agent; the rest go to the delegator."""
+    router = PreRouter(min_confidence=0.6)
+    report = evaluate(router, load_cases())
+    assert report["misrouted"] == []
+    assert report["bypass_rate"] >= 0.6
+    assert router.route("I need a home loan for 40 lakhs") == "loan_helper"
+    assert router.route("Hello!") is None
+    # Questions spanning two sub-agents are left to the delegator
+    route = router.classify("Can I use a personal loan to pay my income tax?")
+    assert route.agent is None and route.confidence < 0.6
+
+
+def test_tool_pruner_keeps_the_relevant_sub_agents():
+    """Pruned requests offer only the matched sub-agents and their instruction lines."""
+    from google.adk.models.llm_request import LlmRequest
+
+    from delegator.agent import SERVICE_LINES, delegator
+    from delegator.pruning import ToolPruner
+
+    pruner = ToolPruner(SERVICE_LINES, top_k=3)
+    keep = pruner.select("Can I use a personal loan to pay my income tax?")
+    assert sorted(keep) == ["loan_helper", "tax_filing_helper"]
+    assert pruner.select("What is inflation?") is None
+    assert ToolPruner(SERVICE_LINES, top_k=0).select("home loan") is None
+
+    request = LlmRequest()
+    request.append_instructions([delegator.instruction])
+    request.append_tools(delegator.tools)
+    pruner.prune(request, keep)
+    assert sorted(request.tools_dict) == sorted(keep)
+    assert [d.name for d in request.config.tools[0].function_declarations] == ["loan_helper", "tax_filing_helper"]
+    assert SERVICE_LINES["loan_helper"] in request.config.system_instruction
+    assert SERVICE_LINES["scam_detector"] not in request.config.system_instruction
+
+
+def test_fanout_splits_compound_questions_and_drops_stragglers():
+    """Sub-agents run concurrently; late ones are dropped and answers merge in question order."""
+    fanout = FanOut(max_agents=3, deadline=0.2)
+    questions = fanout.plan("I want a home loan, and will it hurt my credit score and my tax?")
+    assert [q.agent for q in questions] == ["loan_helper", "credit_score_improver", "tax_filing_helper"]
+    assert questions[1].text.startswith("will it hurt my credit score")
+    assert fanout.plan("I need a home loan for 40 lakhs") == []
+    assert fanout.plan("Should I pay off my credit card or invest in a SIP?") == []
+
+    delays = {"loan_helper": 0.1, "credit_score_improver": 0.05, "tax_filing_helper": 5}
+
+    async def ask(agent, text):
+        await asyncio.sleep(delays[agent])
+        return f"{agent} says hi"
+
+    result = asyncio.run(fanout.run(questions, ask))
+    # Concurrent: bounded by the deadline, not the sum of the delays
+    assert result.elapsed < 1
+    assert result.timed_out == ["tax_filing_helper"]
+    merged = merge(result)
+    assert merged.index("**Loan**") < merged.index("**Credit Score**") < merged.index("**Tax**")
+    assert "loan_helper says hi" in merged and "took too long" in merged
+
+
+def test_fanout_cancels_sub_agents_when_the_turn_is_cancelled():
+    """A cancelled turn stops its sub-agents instead of leaving them running."""
+    fanout = FanOut(max_agents=3, deadline=10)
+    questions = fanout.plan("I want a home loan, and will it hurt my credit score?")
+    cancelled = []
+
+    async def ask(agent, text):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(agent)
+            raise
+
+    async def turn():
+        task = asyncio.ensure_future(fanout.run(questions, ask))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(turn())
+    assert sorted(cancelled) == ["credit_score_improver", "loan_helper"]
+
+
+class EchoAgent(BaseAgent):
+    """Answers every message with its own name and the message."""
+
+    async def _run_async_impl(self, ctx):
+        text = f"you said {ctx.user_content.parts[0].text}"
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=Content(role="model", parts=[Part(text=text)]),
+        )
+
+
+def test_pre_routed_agent_skips_the_delegator():
+    """Confident questions go straight to their sub-agent, compound ones fan out; each turn is routed afresh."""
+    from delegator.agent import PreRoutedAgent
+
+    router = PreRouter(min_confidence=0.6)
+    agent = PreRoutedAgent(
+        name="finsight",
+        delegator=EchoAgent(name="delegator"),
+        specialists={name: EchoAgent(name=name) for name in ("loan_helper", "tax_filing_helper")},
+        router=router,
+        fanout=FanOut(router=router, max_agents=3, deadline=5),
+    )
+    runner = AgentRunner(agent)
+
+    async def conversation():
+        session_id = (await runner.session_service.create_session(app_name=runner.app_name, user_id="u")).id
+        authors = []
+        for message in ["What EMI for a 10 lakh car loan?", "hello", "home loan rates"]:
+            async for event in runner.runner.run_async(
+                user_id="u", session_id=session_id, new_message=Content(role="user", parts=[Part(text=message)]),
+            ):
+                authors.append(event.author)
+        tool_calls = []
+        await runner.run("prepay my home loan?", tool_calls=tool_calls)
+        # A compound question is answered by both sub-agents in one merged response
+        compound = await runner.run("I want a home loan, and what about my income tax?")
+        return authors, tool_calls, compound
+
+    authors, tool_calls, compound = asyncio.run(conversation())
+    assert authors == ["loan_helper", "delegator", "loan_helper"]
+    assert agent.find_agent("loan_helper") is agent
+    assert tool_calls == ["loan_helper"]
+    assert compound.startswith("**Loan**\n\nyou said I want a home loan")
+    assert "**Tax**\n\nyou said what about my income tax" in compound
+
+
+def test_sub_agents_keep_built_in_search_on_its_own():
+    from google.adk.tools.google_search_tool import GoogleSearchTool
+
+    from delegator.agent import sub_agents
+
+    assert len(sub_agents) == 8
+    for agent in sub_agents:
+        if any(isinstance(tool, GoogleSearchTool) for tool in agent.tools):
+            assert len(agent.tools) == 1, agent.name
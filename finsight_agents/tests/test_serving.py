@@ -0,0 +1,371 @@
+"""Test cases for the serving layer helpers"""
+
+import asyncio
+import gzip
+import json
+import threading
+import time
+
+import pytest
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai.types import Content, Part
+from serving import AgentExecutor, ExecutorSaturated
+from serving.batch import fan_out, ndjson_results, retrying
+from serving.cache import ResponseCache, normalize_message
+from serving.canned import CannedResponses
+from serving.loader import AgentLoader
+from serving.metrics import ServerMetrics
+from serving.ratelimit import RateLimited, TokenBucketLimiter
+from serving.runner import AgentRunner
+from serving.singleflight import SingleFlight
+from serving.sessions import SessionPool
+from serving.streaming import ClosingStreamingResponse
+from serving.websocket import parse_frame
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class EchoAgent(BaseAgent):
+    """Streams the user message back as partial events, then in full."""
+
+    async def _run_async_impl(self, ctx):
+        words = ["you ", "said ", ctx.user_content.parts[0].text]
+        for word in words:
+            yield Event(
+                author=self.name,
+                invocation_id=ctx.invocation_id,
+                partial=True,
+                content=Content(role="model", parts=[Part(text=word)]),
+            )
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=Content(role="model", parts=[Part(text="".join(words))]),
+        )
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_event_loop():
+    """Blocking calls run on worker threads, not on the event loop thread."""
+    executor = AgentExecutor(workers=2, queue_size=2)
+    loop_thread = threading.get_ident()
+    worker_thread = await executor.submit(threading.get_ident)
+    assert worker_thread != loop_thread
+    assert executor.snapshot()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_rejects_when_queue_full():
+    """Requests beyond workers + queue size are rejected with a retry hint."""
+    executor = AgentExecutor(workers=1, queue_size=1, retry_after=2)
+    release = threading.Event()
+    running = [asyncio.create_task(executor.submit(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    snapshot = executor.snapshot()
+    assert snapshot["running"] == 1
+    assert snapshot["queue_depth"] == 1
+    with pytest.raises(ExecutorSaturated) as excinfo:
+        await executor.submit(time.sleep, 0)
+    assert excinfo.value.retry_after >= 2
+
+    release.set()
+    await asyncio.gather(*running)
+    snapshot = executor.snapshot()
+    assert snapshot["rejected"] == 1
+    assert snapshot["completed"] == 2
+    assert snapshot["wait_seconds"]["max"] > 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stream_frees_its_slot_when_the_client_leaves_first():
+    """A stream that never starts still frees its executor slot, once."""
+    executor = AgentExecutor(workers=1, queue_size=0)
+    release = executor.release_once(await executor.acquire())
+
+    async def chunks():
+        try:
+            yield "never sent"
+        finally:
+            release(failed=False)
+
+    async def gone(message):
+        raise OSError("client disconnected")
+
+    response = ClosingStreamingResponse(chunks(), on_close=lambda: release(failed=True))
+    with pytest.raises(Exception):
+        await response({"type": "http", "asgi": {"spec_version": "2.4"}}, None, gone)
+    release(failed=False)
+    snapshot = executor.snapshot()
+    assert snapshot["running"] == 0
+    assert snapshot["failed"] == 1 and snapshot["completed"] == 0
+    await executor.acquire()
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_serves_users_fairly():
+    """A user flooding the queue does not delay another user's request."""
+    executor = AgentExecutor(workers=1, queue_size=10)
+    release = threading.Event()
+    order = []
+
+    async def call(user_id):
+        await executor.submit(release.wait, key=user_id)
+        order.append(user_id)
+
+    tasks = [asyncio.create_task(call("heavy")) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    tasks.append(asyncio.create_task(call("light")))
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    # One heavy call was already running and one more is ahead in virtual time
+    assert order.index("light") <= 2
+    executor.shutdown()
+
+
+def test_rate_limiter_enforces_bucket_and_quotas():
+    """Users spend burst tokens, then get a retry hint; quotas override defaults."""
+    limiter = TokenBucketLimiter(rate=0.5, burst=2, quotas={"premium": (5.0, 5)})
+    limiter.check("alice")
+    limiter.check("alice")
+    with pytest.raises(RateLimited) as excinfo:
+        limiter.check("alice")
+    assert excinfo.value.retry_after == 2
+
+    limiter.check("bob")
+    for _ in range(5):
+        limiter.check("premium")
+    assert limiter.weight("premium") == 10.0
+    assert limiter.snapshot()["limited"] == 1
+    assert TokenBucketLimiter(rate=0).weight("anyone") == 1.0
+
+
+@pytest.mark.asyncio
+async def test_runner_streams_partial_text_once():
+    """Partial deltas are forwarded and the aggregated event is not repeated."""
+    runner = AgentRunner(EchoAgent(name="echo"))
+    chunks = [chunk async for chunk in runner.stream("hello", user_id="u1")]
+    assert chunks == ["you ", "said ", "hello"]
+
+
+@pytest.mark.asyncio
+async def test_session_pool_reuses_and_evicts():
+    """Users keep their session across turns; the oldest is evicted when full."""
+    service = InMemorySessionService()
+    pool = SessionPool(service, "test", max_sessions=2)
+
+    async with pool.checkout("alice") as first:
+        first.add_text("hello")
+    async with pool.checkout("alice") as second:
+        assert second.session_id == first.session_id
+    async with pool.checkout("bob"):
+        pass
+    async with pool.checkout("carol"):
+        pass
+
+    snapshot = pool.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["misses"] == 3
+    assert snapshot["evictions"]["lru"] == 1
+    assert not pool.has_session("alice")
+    assert await service.get_session(
+        app_name="test", user_id="alice", session_id=first.session_id
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_session_pool_memory_cap_and_anonymous_users():
+    """Sessions over the byte cap are dropped; anonymous users are never pooled."""
+    pool = SessionPool(InMemorySessionService(), "test", max_bytes=10)
+
+    async with pool.checkout("default"):
+        pass
+    assert pool.snapshot()["sessions"] == 0
+
+    async with pool.checkout("alice") as lease:
+        lease.add_text("a" * 20)
+    snapshot = pool.snapshot()
+    assert snapshot["sessions"] == 0
+    assert snapshot["evictions"]["memory"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fan_out_limits_concurrency_and_reports_errors():
+    """Batch items run concurrently under the limit and fail independently."""
+    in_flight = 0
+    peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item == "bad":
+            raise ValueError("bad item")
+        return item.upper()
+
+    items = ["a", "b", "bad", "c", "d"]
+    results = {index: (result, error) async for index, result, error in fan_out(items, worker, limit=2)}
+
+    assert peak == 2
+    assert results[0] == ("A", None)
+    assert isinstance(results[2][1], ValueError)
+    assert len(results) == len(items)
+
+
+@pytest.mark.asyncio
+async def test_batch_retries_give_up_at_the_item_deadline():
+    """A throttled item is retried until its deadline, then fails on its own line."""
+    calls = []
+
+    async def throttled():
+        calls.append(time.monotonic())
+        raise RateLimited("u1", retry_after=0.02)
+
+    async def answer(item):
+        if item == "throttled":
+            return await retrying(throttled, RateLimited, deadline=0.1)
+        return item.upper()
+
+    lines = [json.loads(line) async for line in ndjson_results(fan_out(["a", "throttled"], answer))]
+    by_index = {line["index"]: line for line in lines}
+
+    assert by_index[0]["status"] == "success"
+    assert by_index[1]["status"] == "error"
+    assert "Rate limit exceeded for u1" in by_index[1]["detail"]
+    assert 2 <= len(calls) <= 6
+
+
+def test_cache_normalizes_and_evicts_lru():
+    """Case, punctuation and whitespace variants share an entry; LRU bounds size."""
+    assert normalize_message("  How to IMPROVE my Credit-Score?? ") == "how to improve my credit score"
+    assert normalize_message("Loan of ₹3,00,000 at 8.5%") == "loan of ₹300000 at 8.5%"
+
+    cache = ResponseCache(max_entries=2)
+    first = cache.key("Best credit card for beginners!", "delegator", "1.0")
+    cache.put(first, "answer")
+    assert cache.get(cache.key("best credit card  for beginners", "delegator", "1.0")) == "answer"
+    assert cache.get(cache.key("best credit card for beginners", "fallback", "1.0")) is None
+
+    cache.put(cache.key("tax slabs", "delegator", "1.0"), "tax")
+    cache.put(cache.key("budget tips", "delegator", "1.0"), "budget")
+    snapshot = cache.snapshot()
+    assert snapshot["entries"] == 2
+    assert snapshot["evictions"] == 1
+    assert snapshot["hits"] == 1
+    assert snapshot["by_intent"]["credit_card"]["hit_rate"] == 0.5
+
+
+def test_cache_expires_per_intent():
+    """Intents with a zero TTL are never cached."""
+    cache = ResponseCache(intent_ttls={"scam": 0}, default_ttl=60)
+    cache.put(cache.key("is this a scam", "a", "1"), "careful")
+    cache.put(cache.key("tax slabs", "a", "1"), "slabs")
+    assert cache.get(cache.key("is this a scam", "a", "1")) is None
+    assert cache.get(cache.key("tax slabs", "a", "1")) == "slabs"
+
+
+def test_canned_responses_negotiate_encoding_and_etag():
+    """Canned bodies are served compressed on request and revalidate with 304."""
+    canned = CannedResponses({"greeting": "Hello! " * 100})
+    plain = canned.respond("greeting", {})
+    assert plain.headers.get("content-encoding") is None
+    assert json.loads(plain.body) == {"response": "Hello! " * 100, "status": "success"}
+
+    zipped = canned.respond("greeting", {"accept-encoding": "gzip;q=1, br;q=0"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == plain.body
+    assert zipped.headers["etag"] != plain.headers["etag"]
+
+    revalidated = canned.respond("greeting", {"if-none-match": f'W/{zipped.headers["etag"]}'})
+    assert revalidated.status_code == 304
+    assert canned.snapshot()["not_modified"] == 1
+    # A 304 sends no body, so it is not counted as served
+    assert canned.snapshot()["served"] == 2
+
+    # "*" accepts the preferred coding unless that coding is refused by name
+    preferred = "br" if "br" in canned.bodies["greeting"].encodings else "gzip"
+    assert canned.respond("greeting", {"accept-encoding": "*"}).headers["content-encoding"] == preferred
+    refused = canned.respond("greeting", {"accept-encoding": f"{preferred};q=0, *"})
+    assert refused.headers.get("content-encoding") != preferred
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_identical_requests():
+    """Concurrent callers of one key share a single execution."""
+    flight = SingleFlight()
+    calls = 0
+
+    async def slow_answer(message):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return message.upper()
+
+    results = await asyncio.gather(
+        *(flight.do("upi scam", slow_answer, "upi scam") for _ in range(5)),
+        flight.do("tax", slow_answer, "tax"),
+    )
+
+    assert results == ["UPI SCAM"] * 5 + ["TAX"]
+    assert calls == 2
+    snapshot = flight.snapshot()
+    assert snapshot["coalesced"] == 4
+    assert snapshot["in_flight"] == 0
+
+
+def test_loader_falls_back_and_records_attempts():
+    """A failing candidate is skipped and its cost recorded; the result is cached."""
+    loader = AgentLoader(
+        candidates=[("broken", "delegator.does_not_exist"), ("fallback", "delegator.fallback_agent")],
+        mode="lazy",
+    )
+    assert loader.agent is None
+
+    loaded = loader.load()
+    assert loaded.kind == "fallback"
+    assert loaded.runner is None
+    assert loader.load().agent is loaded.agent
+
+    attempts = loader.report()["attempts"]
+    assert [a["kind"] for a in attempts] == ["broken", "fallback"]
+    assert attempts[0]["error"]
+
+
+def test_loader_serves_the_delegator_not_the_fallback():
+    """delegator.agent imports, so the app does not quietly fall back to keyword answers."""
+    loader = AgentLoader(mode="lazy").load()
+    assert loader.report()["attempts"][0]["error"] is None
+    assert loader.kind == "delegator"
+    assert loader.runner is not None
+
+
+def test_metrics_render_prometheus_text():
+    """Histograms are cumulative and labels are rendered per series."""
+    metrics = ServerMetrics()
+    metrics.observe_agent_run("delegator", "loan", "loan_helper", 0.3)
+    metrics.observe_agent_run("delegator", "loan", "loan_helper", 3.0)
+    text = metrics.render()
+
+    labels = 'agent="delegator",intent="loan",sub_agent="loan_helper"'
+    assert f"finsight_agent_runs_total{{{labels},outcome=\"ok\"}} 2" in text
+    assert f'finsight_agent_run_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+    assert f'finsight_agent_run_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"finsight_agent_run_duration_seconds_count{{{labels}}} 2" in text
+
+
+def test_websocket_frames_accept_text_and_json():
+    """Plain text and JSON frames parse; malformed frames raise ValueError."""
+    assert parse_frame("  what is SIP? ") == (None, "what is SIP?")
+    assert parse_frame('{"id": 3, "message": "EMI on 5 lakh"}') == (3, "EMI on 5 lakh")
+    for bad in ("{not json", '{"id": 1}', "   "):
+        with pytest.raises(ValueError):
+            parse_frame(bad)